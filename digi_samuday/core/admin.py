@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import Resident, Visitor, Complaint, Payment, Facility, FacilityBooking, Notice, SecurityLog
+from .models import Resident, Visitor, Complaint, Payment, Facility, FacilityBooking, Notice, SecurityLog, ReportJob
 
 class ResidentAdmin(UserAdmin):
     """
@@ -22,6 +22,7 @@ admin.site.register(Payment)
 admin.site.register(Facility)
 admin.site.register(Notice)
 admin.site.register(SecurityLog)
+admin.site.register(ReportJob)
 
 class FacilityBookingAdmin(admin.ModelAdmin):
     """
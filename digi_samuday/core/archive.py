@@ -0,0 +1,189 @@
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import SecurityLog, Visitor
+
+
+class Archive:
+    """
+    Monthly gzip JSONL partitions of one model's rows, stored under `ARCHIVE_DIR/<name>/YYYY-MM/`.
+
+    - `fields` are `values()` paths; related names (e.g. `resident__username`) are
+      copied in, so archived rows read back without the rows they pointed to.
+    - Each archiving run adds its own part file to a month, so a partition is never
+      rewritten; readers drop duplicate ids left by an interrupted run.
+    """
+    def __init__(self, name, model, date_field, fields):
+        self.name = name
+        self.model = model
+        self.date_field = date_field
+        self.fields = fields
+
+    @property
+    def root(self):
+        return Path(getattr(settings, "ARCHIVE_DIR", settings.BASE_DIR / "archive")) / self.name
+
+    def partitions(self, date_from=None, date_to=None):
+        """
+        Return the month directories that can hold rows in `[date_from, date_to)`, oldest first.
+        """
+        if not self.root.is_dir():
+            return []
+        first = month_key(date_from) if date_from is not None else None
+        last = month_key(date_to - timedelta(microseconds=1)) if date_to is not None else None
+        return [
+            path for path in sorted(self.root.iterdir())
+            if path.is_dir() and (first is None or path.name >= first) and (last is None or path.name <= last)
+        ]
+
+    def write(self, rows):
+        """
+        Append `rows` (dicts of `fields`) to their month partitions; return the files written.
+
+        - Files are written under a temporary name and renamed once complete.
+        """
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(month_key(row[self.date_field]), []).append(row)
+
+        written = []
+        for month, month_rows in sorted(by_month.items()):
+            directory = self.root / month
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"part-{timezone.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+            temporary = path.with_name(path.name + ".tmp")
+            with gzip.open(temporary, "wt", encoding="utf-8") as handle:
+                for row in month_rows:
+                    handle.write(json.dumps(row, default=encode_value, separators=(",", ":")) + "\n")
+            os.replace(temporary, path)
+            written.append(path)
+        return written
+
+    def read(self, date_from=None, date_to=None):
+        """
+        Yield archived rows whose date falls in `[date_from, date_to)`, opening only the
+        partitions that range covers.
+
+        - Dates come back as aware datetimes; rows are ordered by id within each month.
+        """
+        for directory in self.partitions(date_from, date_to):
+            rows = {}
+            for path in sorted(directory.glob("part-*.jsonl.gz")):
+                with gzip.open(path, "rt", encoding="utf-8") as handle:
+                    for line in handle:
+                        row = json.loads(line)
+                        rows[row["id"]] = row
+            for row_id in sorted(rows):
+                row = self.decode(rows[row_id])
+                moment = row[self.date_field]
+                if (date_from is None or moment >= date_from) and (date_to is None or moment < date_to):
+                    yield row
+
+    def decode(self, row):
+        for field in self.datetime_fields:
+            if row.get(field):
+                row[field] = datetime.fromisoformat(row[field])
+        return row
+
+    @property
+    def datetime_fields(self):
+        return [field.name for field in self.model._meta.concrete_fields if field.get_internal_type() == "DateTimeField"]
+
+
+def encode_value(value):
+    # Full-precision ISO datetimes, so archived rows read back exactly as they were stored
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot archive {type(value).__name__} values")
+
+
+def month_key(moment):
+    return timezone.localtime(moment).strftime("%Y-%m") if timezone.is_aware(moment) else moment.strftime("%Y-%m")
+
+
+ARCHIVES = {
+    "visitors": Archive(
+        "visitors", Visitor, "check_in",
+        ["id", "name", "phone_number", "vehicle_number", "check_in", "check_out", "resident_id", "resident__username"],
+    ),
+    "security_logs": Archive(
+        "security_logs", SecurityLog, "entry_time",
+        ["id", "visitor_id", "visitor__name", "visitor__resident__username", "entry_time", "exit_time", "guard_name"],
+    ),
+}
+
+
+def archivable_visitors(cutoff):
+    """
+    Visitors who checked in before `cutoff` and whose every log is closed and older
+    than `cutoff`; a visitor and their logs are always archived together.
+    """
+    open_or_recent = SecurityLog.objects.filter(
+        Q(exit_time__isnull=True) | Q(entry_time__gte=cutoff), visitor=OuterRef("pk"),
+    )
+    return Visitor.objects.filter(check_in__lt=cutoff).exclude(Exists(open_or_recent))
+
+
+def archive_visits(retention_days=None, batch_size=5000, dry_run=False):
+    """
+    Move visitors and their security logs older than the retention window into the archive.
+
+    - Works oldest first in batches: rows are written to new part files, then deleted
+      from the hot tables in one transaction; if the delete fails the files are removed.
+    - Deletes skip the ORM collector (no signals fire): archived logs are closed, so
+      nothing cached about who is inside can change.
+    - Returns `{"visitors": n, "security_logs": n, "cutoff": ...}`.
+    """
+    if retention_days is None:
+        retention_days = getattr(settings, "ARCHIVE_RETENTION_DAYS", 180)
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    counts = {"visitors": 0, "security_logs": 0, "cutoff": cutoff.isoformat()}
+    visitors, logs = ARCHIVES["visitors"], ARCHIVES["security_logs"]
+
+    if dry_run:
+        eligible = archivable_visitors(cutoff)
+        counts["visitors"] = eligible.count()
+        counts["security_logs"] = SecurityLog.objects.filter(visitor__in=eligible).count()
+        return counts
+
+    while True:
+        ids = list(archivable_visitors(cutoff).order_by("check_in", "pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return counts
+        visitor_rows = list(Visitor.objects.filter(pk__in=ids).order_by("pk").values(*visitors.fields))
+        log_rows = list(SecurityLog.objects.filter(visitor_id__in=ids).order_by("pk").values(*logs.fields))
+
+        written = visitors.write(visitor_rows) + logs.write(log_rows)
+        try:
+            with transaction.atomic():
+                SecurityLog.objects.filter(visitor_id__in=ids)._raw_delete(connection.alias)
+                Visitor.objects.filter(pk__in=ids)._raw_delete(connection.alias)
+        except Exception:
+            for path in written:
+                path.unlink(missing_ok=True)
+            raise
+        counts["visitors"] += len(visitor_rows)
+        counts["security_logs"] += len(log_rows)
+
+
+def optimize_tables():
+    """
+    Rebuild the hot tables after a large archive run so MySQL returns the freed pages
+    and the working set stays in the buffer pool. A no-op on other databases.
+    """
+    if connection.vendor != "mysql":
+        return False
+    with connection.cursor() as cursor:
+        for model in (SecurityLog, Visitor):
+            cursor.execute(f"OPTIMIZE TABLE {connection.ops.quote_name(model._meta.db_table)}")
+            cursor.fetchall()
+    return True
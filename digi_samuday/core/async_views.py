@@ -0,0 +1,140 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .authentication import CachedTokenAuthentication
+from .conditional import aconditional_response, alist_validators
+from .filters import is_count_only
+from .pagination import apaginated_data
+from .serializers import ComplaintSerializer, FacilitySerializer, NoticeSerializer, SecurityLogSerializer
+from .views import ComplaintViewSet, FacilityViewSet, NoticeViewSet, SecurityLogViewSet, profile_data
+
+
+def render(data, status_code=status.HTTP_200_OK, headers=None):
+    """
+    Render `data` with DRF's JSON renderer, so output matches the sync views byte for byte.
+    """
+    return HttpResponse(JSONRenderer().render(data), content_type="application/json", status=status_code, headers=headers)
+
+
+def render_exception(exc):
+    """
+    Render an `APIException` the way DRF's default exception handler does.
+    """
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    return render(data, exc.status_code)
+
+
+def unauthorized(detail):
+    return render({"detail": str(detail)}, status.HTTP_401_UNAUTHORIZED, headers={"WWW-Authenticate": "Token"})
+
+
+async def authenticate(request):
+    """
+    Resolve the user from an `Authorization: Token ...` header or the session.
+
+    - Cached and signed tokens resolve without leaving the event loop.
+    """
+    parts = request.headers.get("Authorization", "").split()
+    if parts and parts[0] == "Token":
+        if len(parts) != 2:
+            raise AuthenticationFailed("Invalid token header.")
+        user, _ = await CachedTokenAuthentication().aauthenticate_credentials(parts[1])
+        return user
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def async_read_view(*permission_classes, fallback=None):
+    """
+    Turn an async GET handler into an API endpoint.
+
+    - Authenticates like the sync API, then checks `IsAuthenticated` plus `permission_classes`
+      (role checks on the user, so no database access).
+    - The handler receives a DRF `Request` (for `query_params`) with `user` set.
+    - Other methods are passed to `fallback`, the sync view normally routed at the same
+      URL, in a worker thread; it runs its own authentication and CSRF checks.
+    """
+    def decorator(handler):
+        @csrf_exempt
+        @wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                if fallback is None:
+                    return render({"detail": f'Method "{request.method}" not allowed.'}, status.HTTP_405_METHOD_NOT_ALLOWED)
+                return await sync_to_async(fallback)(request, *args, **kwargs)
+
+            try:
+                user = await authenticate(request)
+            except AuthenticationFailed as e:
+                return unauthorized(e.detail)
+            if user is None:
+                return unauthorized("Authentication credentials were not provided.")
+
+            request.user = user
+            for permission_class in (IsAuthenticated, *permission_classes):
+                if not permission_class().has_permission(request, None):
+                    return render({"detail": "You do not have permission to perform this action."}, status.HTTP_403_FORBIDDEN)
+
+            api_request = Request(request)
+            api_request.user = user
+            return await handler(api_request, *args, **kwargs)
+        return view
+    return decorator
+
+
+def list_endpoint(viewset, serializer_class, conditional=True):
+    """
+    Build the async GET handler mirroring `viewset.list` (filters, `?count_only=`, keyset
+    pagination and, when the ViewSet uses `ConditionalGetMixin`, ETag validation).
+    """
+    async def handler(request):
+        queryset = viewset.queryset.all()
+        try:
+            for backend in viewset.filter_backends:
+                queryset = backend().filter_queryset(request, queryset, viewset)
+        except APIException as e:  # A bad filter value or `?ordering=`
+            return render_exception(e)
+
+        async def compute():
+            if is_count_only(request):
+                return render({"count": await queryset.acount()})
+            keyset_field = getattr(viewset, "keyset_field", None)
+            try:
+                return render(await apaginated_data(request, queryset, serializer_class, keyset_field, viewset))
+            except APIException as e:  # An unknown `?fields=` name (400), a malformed `?cursor=` (404)
+                return render_exception(e)
+
+        if not conditional:
+            return await compute()
+        validators = lambda: alist_validators(request, queryset, namespaces=viewset.etag_namespaces)
+        return await aconditional_response(request, validators, compute)
+
+    handler.__name__ = f"{serializer_class.Meta.model.__name__.lower()}_list"
+    fallback = viewset.as_view({"get": "list", "post": "create"})
+    return async_read_view(fallback=fallback)(handler)
+
+
+@async_read_view()
+async def user_profile(request):
+    """
+    Async version of `views.user_profile`.
+    """
+    user = request.user
+    deferred = user.get_deferred_fields() & {"first_name", "last_name", "email", "phone_number"}
+    if deferred:  # Users rebuilt from signed tokens only carry a few columns
+        await user.arefresh_from_db(fields=sorted(deferred))
+    return render(profile_data(user))
+
+
+complaint_list = list_endpoint(ComplaintViewSet, ComplaintSerializer)
+notice_list = list_endpoint(NoticeViewSet, NoticeSerializer)
+facility_list = list_endpoint(FacilityViewSet, FacilitySerializer)
+security_log_list = list_endpoint(SecurityLogViewSet, SecurityLogSerializer, conditional=False)
@@ -0,0 +1,182 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from .cache import get_cache
+from .models import Resident
+
+
+class TokenCache:
+    """
+    Thread-safe LRU cache with TTL mapping token keys to `(user, token)`.
+
+    - Bounded to `maxsize` entries; the least recently used entry is evicted first.
+    - Entries expire after `ttl` seconds, which bounds how long a change made by
+      another worker process can go unnoticed.
+    """
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user, token = entry
+            if expires_at < time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return user, token
+
+    def set(self, key, user, token):
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, user, token)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_key(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get(entry[1].pk)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[entry[1].pk]
+
+
+token_cache = TokenCache(
+    maxsize=getattr(settings, "AUTH_TOKEN_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "AUTH_TOKEN_CACHE_TTL", 60),
+)
+
+
+# Fields carried inside a signed token; everything else on the user stays deferred
+SIGNED_TOKEN_FIELDS = ["id", "username", "role", "apartment_no", "is_active", "is_staff"]
+SIGNED_TOKEN_SALT = "core.signed-token"
+
+
+def signed_token_max_age():
+    return getattr(settings, "SIGNED_TOKEN_MAX_AGE", 3600)
+
+
+def _revoked_key(user_id):
+    return f"auth:signed-revoked:{user_id}"
+
+
+def revoke_signed_tokens(user_id):
+    """
+    Reject every signed token issued to a user so far (logout, deactivation, role change).
+
+    - Records the revocation time in the API cache until those tokens would have expired
+      anyway. A per-process cache (LocMem) only tells its own worker, so multi-worker
+      deployments need a shared cache for revocation to apply everywhere.
+    """
+    get_cache().set(_revoked_key(user_id), time.time(), timeout=signed_token_max_age())
+
+
+def make_signed_token(user):
+    """
+    Issue a stateless token that authenticates without any database read.
+
+    - Signed with `SECRET_KEY` and valid for `SIGNED_TOKEN_MAX_AGE` seconds, unless
+      `revoke_signed_tokens` is called for the user before then.
+    """
+    payload = {field: getattr(user, field) for field in SIGNED_TOKEN_FIELDS}
+    payload["iat"] = time.time()
+    return signing.dumps(payload, salt=SIGNED_TOKEN_SALT, compress=True)
+
+
+def load_signed_token(key):
+    """
+    Verify a signed token and rebuild its user without querying the database.
+
+    - Tokens issued before the user's last revocation are refused; that check is
+      one cache read.
+    - The user is built with `from_db`, so fields not carried in the token are
+      deferred and load on first access, and `save()` only writes loaded fields.
+    """
+    try:
+        payload = signing.loads(key, salt=SIGNED_TOKEN_SALT, max_age=signed_token_max_age())
+    except signing.SignatureExpired:
+        raise AuthenticationFailed("Token has expired.")
+    except signing.BadSignature:
+        raise AuthenticationFailed("Invalid token.")
+    if not isinstance(payload, dict) or set(payload) != {*SIGNED_TOKEN_FIELDS, "iat"}:
+        raise AuthenticationFailed("Invalid token.")
+    revoked_at = get_cache().get(_revoked_key(payload["id"]))
+    if revoked_at is not None and payload["iat"] <= revoked_at:
+        raise AuthenticationFailed("Token has been revoked.")
+    # `from_db` expects values in model field order
+    field_names = [field.attname for field in Resident._meta.concrete_fields if field.attname in payload]
+    return Resident.from_db("default", field_names, [payload[name] for name in field_names])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that skips the `authtoken_token` JOIN on repeat requests.
+
+    - Database tokens are looked up once and then served from `token_cache`; the
+      cache is cleared for a token when it is deleted (logout) and for a user whenever
+      their Resident row is saved or deleted (password, status or role changes).
+    - Signed tokens (see `make_signed_token`) contain a `:` and are verified
+      from their signature alone.
+    - Each request gets its own copy of the cached user, so views may modify it safely.
+    - `aauthenticate_credentials` serves async views; it only leaves the event loop
+      on a cache miss.
+    """
+    def authenticate_credentials(self, key):
+        resolved = self.resolve_without_database(key)
+        if resolved is None:
+            resolved = super().authenticate_credentials(key)
+            token_cache.set(key, *resolved)
+        return self.check_user(*resolved)
+
+    async def aauthenticate_credentials(self, key):
+        resolved = self.resolve_without_database(key)
+        if resolved is None:
+            return await sync_to_async(self.authenticate_credentials)(key)
+        return self.check_user(*resolved)
+
+    def resolve_without_database(self, key):
+        """
+        Return `(user, token)` from a signed token or the cache, or None if the DB is needed.
+        """
+        if ":" in key:
+            return load_signed_token(key), None
+        return token_cache.get(key)
+
+    def check_user(self, user, token):
+        if not user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return copy.copy(user), token
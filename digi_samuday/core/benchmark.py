@@ -0,0 +1,621 @@
+import asyncio
+import json
+import logging
+import math
+import random
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.db import connection, transaction
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+
+from .authentication import token_cache
+from .cache import get_cache
+from .fastpath import FastJSONRenderer, RowPlan, orjson
+from .models import (
+    Complaint, Facility, FacilityBooking, Notice, Payment, ReportJob, Resident, SecurityLog, Visitor,
+)
+from .ratelimit import login_buckets, login_identities, reset_login_limits
+from .serializers import ComplaintSerializer, PaymentSerializer, SecurityLogSerializer
+
+
+class Scenario:
+    """
+    One request in the traffic mix.
+
+    - `path` is formatted with the benchmark context (sample ids, dates).
+    - `data` is a dict or `data(context, n)` for bodies that must differ per request.
+    - `before(context)` runs untimed before each request, to reset state a write consumed.
+    """
+    def __init__(self, name, user, method, path, weight, data=None, before=None):
+        self.name = name
+        self.user = user  # "admin", "resident", "guard", "spare" or None (anonymous)
+        self.method = method
+        self.path = path
+        self.weight = weight
+        self.data = data
+        self.before = before
+
+
+def reopen_log(context):
+    SecurityLog.objects.filter(pk=context["log"]).update(exit_time=None)
+
+
+def restore_spare_token(context):
+    Token.objects.get_or_create(key=context["tokens"]["spare"], defaults={"user_id": context["users"]["spare"]})
+
+
+def reset_login_limits_for(context):
+    reset_login_limits(ip="127.0.0.1", username=context["usernames"]["resident"])  # The test client's REMOTE_ADDR
+
+
+def new_booking(context, n):
+    start = timezone.now() + timedelta(days=400 + n)  # Past the seeded range, so it never conflicts
+    return {"facility_name": context["facility_name"], "start_time": start.isoformat(), "end_time": (start + timedelta(hours=2)).isoformat()}
+
+
+# A read-heavy mix modelled on the React app: every screen loads the dashboard and profile,
+# guards poll logs, admins review queues. Covers every route in `core/urls.py`.
+SCENARIOS = [
+    Scenario("dashboard", "resident", "GET", "/api/dashboard/", 20),
+    Scenario("user_profile", "resident", "GET", "/api/user-profile/", 8),
+    Scenario("notices_list", "resident", "GET", "/api/notices/", 10),
+    Scenario("notice_detail", "resident", "GET", "/api/notices/{notice}/", 2),
+    Scenario("facilities_list", "resident", "GET", "/api/facilities/", 5),
+    Scenario("facility_detail", "resident", "GET", "/api/facilities/{facility}/", 1),
+    Scenario("facility_availability", "resident", "GET", "/api/facilities/{facility}/availability/", 3),
+    Scenario("bookings_list", "resident", "GET", "/api/facility-bookings/", 4),
+    Scenario("booking_detail", "resident", "GET", "/api/facility-bookings/{booking}/", 1),
+    Scenario("complaints_list", "resident", "GET", "/api/complaints/", 6),
+    Scenario("complaint_detail", "resident", "GET", "/api/complaints/{complaint}/", 1),
+    Scenario("payments_list", "resident", "GET", "/api/payments/", 5),
+    Scenario("payment_detail", "resident", "GET", "/api/payments/{payment}/", 1),
+    Scenario("payments_summary", "admin", "GET", "/api/payments/summary/", 1),
+    Scenario("payments_summary_residents", "admin", "GET", "/api/payments/summary/residents/", 0.3),
+    Scenario("residents_list", "admin", "GET", "/api/residents/", 2),
+    Scenario("resident_detail", "admin", "GET", "/api/residents/{resident}/", 1),
+    Scenario("visitors_list", "guard", "GET", "/api/visitors/", 6),
+    Scenario("visitor_detail", "guard", "GET", "/api/visitors/{visitor}/", 1),
+    Scenario("security_logs_list", "guard", "GET", "/api/security-logs/", 8),
+    Scenario("security_log_detail", "guard", "GET", "/api/security-logs/{log}/", 1),
+    Scenario("premises_inside", "guard", "GET", "/api/security-logs/inside/", 3),
+    Scenario("premises_count", "guard", "GET", "/api/security-logs/inside/count/", 6),
+    Scenario("booking_conflicts", "admin", "GET", "/api/facility-bookings/{booking}/conflicts/", 1),
+    Scenario("search", "resident", "GET", "/api/search/?q=lift", 2),
+    Scenario("cache_stats", "admin", "GET", "/api/cache-stats/", 0.2),
+    Scenario("csv_report", "admin", "GET", "/api/reports/complaints/?from={month_ago}", 0.5),
+    Scenario("report_job_detail", "admin", "GET", "/api/report-jobs/{report_job}/", 0.5),
+    Scenario("report_job_download", "admin", "GET", "/api/report-jobs/{report_job}/download/", 0.2),
+    Scenario("login", None, "POST", "/api/login/", 3, data=lambda context, n: {"username": context["usernames"]["resident"], "password": context["password"]}, before=reset_login_limits_for),
+    Scenario("logout", "spare", "POST", "/api/logout/", 1, before=restore_spare_token),
+    Scenario("register", None, "POST", "/api/register/", 0.5, data=lambda context, n: {
+        "username": f"bench_{n}", "password": "bench-pass-123", "email": f"bench_{n}@example.com",
+        "phone_number": "9000000000", "apartment_no": "Z-001", "role": "resident",
+    }),
+    Scenario("update_profile", "resident", "PATCH", "/api/update-profile/", 1, data={"first_name": "Bench"}),
+    Scenario("complaint_create", "resident", "POST", "/api/complaints/", 2, data={"title": "Lift not working", "description": "Stuck on floor 3."}),
+    Scenario("complaint_update_status", "admin", "PATCH", "/api/complaints/{complaint}/update-status/", 0.5, data={"status": "in_progress"}),
+    Scenario("complaint_status_action", "admin", "PATCH", "/api/complaints/{complaint}/update_status/", 0.5, data={"status": "in_progress"}),
+    Scenario("complaints_bulk_status", "admin", "PATCH", "/api/complaints/bulk-update-status/", 0.3, data=lambda context, n: {"ids": context["complaint_ids"], "status": "in_progress"}),
+    Scenario("booking_create", "resident", "POST", "/api/facility-bookings/", 1, data=new_booking),
+    Scenario("booking_approve", "admin", "PATCH", "/api/facility-bookings/{booking}/approve/", 0.5),
+    Scenario("booking_reject", "admin", "PATCH", "/api/facility-bookings/{booking}/reject/", 0.3),
+    Scenario("bookings_bulk_status", "admin", "PATCH", "/api/facility-bookings/bulk-status/", 0.3, data=lambda context, n: {"ids": context["booking_ids"], "status": "rejected"}),
+    Scenario("payment_approve", "admin", "PATCH", "/api/payments/{payment}/approve_payment/", 0.5, data={"payment_status": "completed"}),
+    Scenario("payments_bulk_approve", "admin", "PATCH", "/api/payments/bulk-approve/", 0.3, data=lambda context, n: {"ids": context["payment_ids"], "payment_status": "completed"}),
+    Scenario("visitor_entry", "guard", "POST", "/api/visitors/", 1, data=lambda context, n: {"name": f"Guest {n}", "phone_number": "8000000000", "resident": context["resident"]}),
+    Scenario("visitor_check_in", "guard", "POST", "/api/visitors/check-in/", 2, data=lambda context, n: {"name": f"Guest {n}", "phone_number": "8000000000", "apartment_no": context["apartment_no"]}),
+    Scenario("visitor_check_in_batch", "guard", "POST", "/api/visitors/check-in/batch/", 0.3, data=lambda context, n: {"entries": [
+        {"name": f"Guest {n}-{i}", "phone_number": "8000000000", "apartment_no": context["apartment_no"]} for i in range(50)
+    ]}),
+    Scenario("visitor_checkout", "guard", "PATCH", "/api/security-logs/{log}/checkout/", 2, before=reopen_log),
+    Scenario("residents_import", "admin", "POST", "/api/residents/import/", 0.1, data=lambda context, n: [
+        {"username": f"import_{n}_{i}", "password": "bench-pass-123", "phone_number": "9000000000", "apartment_no": f"N{n}-{i:03d}"} for i in range(20)
+    ]),
+    Scenario("report_job_create", "admin", "POST", "/api/report-jobs/", 0.3, data=lambda context, n: {"report_type": "payments", "from": context["month_ago"]}),
+]
+
+
+def build_context(password):
+    """
+    Pick the users and sample rows the scenarios address, and issue their tokens.
+    """
+    admin = Resident.objects.filter(role="admin", is_staff=True).order_by("pk").first()
+    guard = Resident.objects.filter(role="security").order_by("pk").first()
+    residents = list(Resident.objects.filter(role="resident", complaint__isnull=False).distinct().order_by("pk")[:2])
+    facility = Facility.objects.order_by("pk").first()
+    if admin is None or guard is None or len(residents) < 2 or facility is None:
+        raise ValueError("The database has too little data to benchmark; run `manage.py seed_society` first.")
+    resident, spare = residents
+
+    users = {"admin": admin, "resident": resident, "guard": guard, "spare": spare}
+    log = SecurityLog.objects.filter(exit_time__isnull=True).order_by("-pk").first() or SecurityLog.objects.order_by("-pk").first()
+    return {
+        "password": password,
+        "users": {role: user.pk for role, user in users.items()},
+        "usernames": {role: user.username for role, user in users.items()},
+        "tokens": {role: Token.objects.get_or_create(user=user)[0].key for role, user in users.items()},
+        "resident": resident.pk,
+        "apartment_no": resident.apartment_no,
+        "facility": facility.pk,
+        "facility_name": facility.name,
+        "complaint": Complaint.objects.filter(resident=resident).order_by("-pk").values_list("pk", flat=True).first(),
+        "payment": Payment.objects.filter(resident=resident).order_by("-pk").values_list("pk", flat=True).first(),
+        "booking": FacilityBooking.objects.filter(resident=resident).order_by("-pk").values_list("pk", flat=True).first(),
+        "notice": Notice.objects.order_by("-pk").values_list("pk", flat=True).first(),
+        "visitor": Visitor.objects.order_by("-pk").values_list("pk", flat=True).first(),
+        "log": log.pk if log else None,
+        "complaint_ids": list(Complaint.objects.filter(status="open").order_by("-pk").values_list("pk", flat=True)[:20]),
+        "booking_ids": list(FacilityBooking.objects.filter(status="pending").order_by("-pk").values_list("pk", flat=True)[:20]),
+        "payment_ids": list(Payment.objects.filter(payment_status="pending").order_by("-pk").values_list("pk", flat=True)[:20]),
+        "report_job": ReportJob.objects.create(report_type="complaints", cache_key="benchmark", requested_by=admin).pk,
+        "month_ago": (timezone.now() - timedelta(days=30)).date().isoformat(),
+    }
+
+
+@contextmanager
+def quiet_request_log(names=("django.request",)):
+    """
+    Silence `django.request` warnings for the expected 4xx answers (409s, 400s); errors still log.
+    """
+    loggers = [logging.getLogger(name) for name in names]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        for logger, level in zip(loggers, levels):
+            logger.setLevel(level)
+
+
+def perform(client, scenario, context, n):
+    """
+    Send one request; return `(milliseconds, query_count, response_bytes, status_code)`.
+    """
+    if scenario.before is not None:
+        scenario.before(context)
+    if scenario.user is None:
+        client.cookies.clear()  # Anonymous requests must not ride on an earlier login's session
+    path = scenario.path.format(**context)
+    data = scenario.data(context, n) if callable(scenario.data) else scenario.data
+    send = getattr(client, scenario.method.lower())
+    kwargs = {} if scenario.method == "GET" else {"data": data or {}, "content_type": "application/json"}
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = send(path, **kwargs)
+        size = len(b"".join(response.streaming_content)) if response.streaming else len(response.content)
+        elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, len(queries), size, response.status_code
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a non-empty list.
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(samples):
+    """
+    Latency percentiles, query counts, body size and statuses of `(ms, queries, bytes, status)` samples.
+
+    - Samples whose query count is `None` (not measurable) are left out of the query figures.
+    """
+    latencies = [sample[0] for sample in samples]
+    queries = [sample[1] for sample in samples if sample[1] is not None]
+    summary = {
+        "count": len(samples),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_bytes": round(sum(sample[2] for sample in samples) / len(samples)),
+        "statuses": dict(Counter(str(sample[3]) for sample in samples)),
+    }
+    if queries:
+        summary["mean_queries"] = round(sum(queries) / len(queries), 2)
+        summary["max_queries"] = max(queries)
+    return summary
+
+
+def run_benchmark(requests=500, warmup=1, seed=0, password="password", host="localhost", cold=False, only=None, memory=True):
+    """
+    Replay a weighted traffic mix through the Django test client and report per-endpoint statistics.
+
+    - Every scenario runs once, then `requests` more are drawn by weight; latency covers
+      the full middleware stack and reading the whole (possibly streamed) body.
+    - `cold=True` clears the response and token caches before each request.
+    - With `memory=True`, each scenario runs once more under `tracemalloc` (kept out of
+      the timed runs because it slows allocation) to record its peak allocation.
+    - Everything runs in a transaction that is rolled back, so writes leave no trace;
+      `on_commit` work such as queued report jobs never starts.
+    """
+    scenarios = [scenario for scenario in SCENARIOS if not only or scenario.name in only]
+    unknown = set(only or ()) - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}.")
+
+    rng = random.Random(seed)
+    counter = iter(range(10 ** 9))
+    results = {scenario.name: [] for scenario in scenarios}
+    peaks = {}
+
+    with transaction.atomic(), quiet_request_log():
+        context = build_context(password)
+        clients = {None: Client(HTTP_HOST=host, raise_request_exception=False)}
+        for role, key in context["tokens"].items():
+            clients[role] = Client(HTTP_HOST=host, HTTP_AUTHORIZATION=f"Token {key}", raise_request_exception=False)
+
+        def run(scenario):
+            if cold:
+                get_cache().clear()
+                token_cache.clear()
+            return perform(clients[scenario.user], scenario, context, next(counter))
+
+        for scenario in scenarios:
+            for _ in range(warmup):
+                run(scenario)
+
+        plan = scenarios + rng.choices(scenarios, weights=[scenario.weight for scenario in scenarios], k=requests)
+        for scenario in plan:
+            results[scenario.name].append(run(scenario))
+
+        if memory:
+            tracemalloc.start()
+            try:
+                for scenario in scenarios:
+                    tracemalloc.reset_peak()
+                    baseline = tracemalloc.get_traced_memory()[0]
+                    run(scenario)
+                    peaks[scenario.name] = round((tracemalloc.get_traced_memory()[1] - baseline) / 1024, 1)
+            finally:
+                tracemalloc.stop()
+
+        transaction.set_rollback(True)
+
+    endpoints = {}
+    for scenario in scenarios:
+        endpoints[scenario.name] = {"method": scenario.method, "path": scenario.path, **summarize(results[scenario.name])}
+        if scenario.name in peaks:
+            endpoints[scenario.name]["peak_kb"] = peaks[scenario.name]
+
+    return {
+        "meta": {
+            "created": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "requests": len(plan),
+            "cold": cold,
+            "seed": seed,
+            "rows": {model.__name__: model.objects.count() for model in (Resident, Visitor, SecurityLog, Complaint, Payment, FacilityBooking, Notice)},
+        },
+        "overall": summarize([sample for samples in results.values() for sample in samples]),
+        "endpoints": endpoints,
+    }
+
+
+# Read endpoints that have an async view, so both deployments answer the same requests
+CONCURRENT_SCENARIOS = ["user_profile", "notices_list", "facilities_list", "complaints_list", "security_logs_list"]
+
+
+def deployment_urlconf(mode):
+    """
+    Root URLconf for `mode`: the sync views ("wsgi") or the async read views in front ("asgi"),
+    regardless of `ASYNC_READ_VIEWS` in this process.
+    """
+    from django.contrib import admin
+    from django.urls import include, path
+
+    from . import urls
+
+    sync_patterns = [pattern for pattern in urls.urlpatterns if pattern not in urls.async_read_urlpatterns]
+    patterns = urls.async_read_urlpatterns + sync_patterns if mode == "asgi" else sync_patterns
+    return type("DeploymentURLConf", (), {"urlpatterns": [path("admin/", admin.site.urls), path("", include(patterns))]})
+
+
+def run_wsgi_load(plan, context, host, concurrency):
+    """
+    Send `plan` from `concurrency` threads, each with its own client and DB connection,
+    the way a threaded WSGI server handles simultaneous requests.
+    """
+    pending = iter(enumerate(plan))
+    lock = threading.Lock()
+    samples = []
+
+    def worker():
+        clients = {}
+        try:
+            while True:
+                with lock:
+                    item = next(pending, None)
+                if item is None:
+                    return
+                n, scenario = item
+                client = clients.get(scenario.user)
+                if client is None:
+                    client = clients[scenario.user] = Client(HTTP_HOST=host, HTTP_AUTHORIZATION=f"Token {context['tokens'][scenario.user]}", raise_request_exception=False)
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = client.get(scenario.path.format(**context))
+                    elapsed = (time.perf_counter() - started) * 1000
+                samples.append((scenario, (elapsed, len(queries), len(response.content), response.status_code)))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def run_asgi_load(plan, context, host, concurrency):
+    """
+    Send `plan` through the ASGI handler from one event loop, at most `concurrency` requests
+    in flight.
+
+    - Query counts are not recorded: the async ORM runs queries for every request on one
+      shared worker thread, so they cannot be told apart.
+    """
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        client = AsyncClient(raise_request_exception=False)
+
+        async def send(scenario):
+            headers = {"Authorization": f"Token {context['tokens'][scenario.user]}"}
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(scenario.path.format(**context), headers=headers)
+                elapsed = (time.perf_counter() - started) * 1000
+            return scenario, (elapsed, None, len(response.content), response.status_code)
+
+        return await asyncio.gather(*(send(scenario) for scenario in plan))
+
+    return asyncio.run(main())
+
+
+def run_concurrency_benchmark(mode="wsgi", concurrency=16, requests=400, seed=0, host="localhost", only=None):
+    """
+    Measure throughput and latency of the read endpoints under concurrent load.
+
+    - `mode="wsgi"` uses the sync views from a thread per concurrent client; `mode="asgi"`
+      serves the async read views from a single event loop.
+    - The same seeded mix of `CONCURRENT_SCENARIOS` is sent in both modes, so reports
+      compare directly; latency includes time spent queued behind other requests.
+    - Reads only, outside a transaction (threads cannot share one); the seeded users'
+      tokens are kept.
+    """
+    if mode not in ("wsgi", "asgi"):
+        raise ValueError(f"Unknown mode {mode!r}; use 'wsgi' or 'asgi'.")
+    names = only or CONCURRENT_SCENARIOS
+    unknown = set(names) - set(CONCURRENT_SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}; choose from {', '.join(CONCURRENT_SCENARIOS)}.")
+    scenarios = [scenario for scenario in SCENARIOS if scenario.name in names]
+
+    context = build_context(password=None)
+    ReportJob.objects.filter(pk=context["report_job"]).delete()
+    rng = random.Random(seed)
+    plan = rng.choices(scenarios, weights=[scenario.weight for scenario in scenarios], k=requests)
+    load = run_asgi_load if mode == "asgi" else run_wsgi_load
+
+    # AsyncClient always sends `Host: testserver`
+    allowed_hosts = [*settings.ALLOWED_HOSTS, host, "testserver"]
+    with override_settings(ROOT_URLCONF=deployment_urlconf(mode), ALLOWED_HOSTS=allowed_hosts), quiet_request_log():
+        load(scenarios, context, host, concurrency)  # Warm up connections, caches and imports
+        started = time.perf_counter()
+        samples = load(plan, context, host, concurrency)
+        wall = time.perf_counter() - started
+
+    results = {scenario.name: [] for scenario in scenarios}
+    for scenario, sample in samples:
+        results[scenario.name].append(sample)
+    return {
+        "meta": {
+            "created": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "mode": mode,
+            "concurrency": concurrency,
+            "requests": len(plan),
+            "seed": seed,
+            "wall_seconds": round(wall, 3),
+        },
+        "overall": {"throughput_rps": round(len(plan) / wall, 1), **summarize([sample for _, sample in samples])},
+        "endpoints": {
+            scenario.name: {"method": scenario.method, "path": scenario.path, **summarize(results[scenario.name])}
+            for scenario in scenarios if results[scenario.name]
+        },
+    }
+
+
+def run_login_benchmark(requests=20, iterations=None, host="localhost"):
+    """
+    Measure wall and CPU time per request to `/api/login/`, by outcome.
+
+    - `token_only` and `with_session` are successful logins without and with the session
+      write; `wrong_password` is a failed attempt (a full hash); `rejected` is an attempt
+      the limiter turns away before hashing.
+    - `iterations` overrides `PASSWORD_PBKDF2_ITERATIONS`; the untimed first login of each
+      outcome upgrades the user's hash to it, as it would in production.
+    - Runs as a throwaway user in a transaction that is rolled back.
+    """
+    overrides = {} if iterations is None else {"PASSWORD_PBKDF2_ITERATIONS": iterations}
+    password = "bench-login-pass"
+    cases = {}
+
+    # Every hashed login is "slow" by design; keep it out of the slow-request log
+    with transaction.atomic(), quiet_request_log(("django.request", "core.slow_requests")), override_settings(**overrides):
+        hasher = get_hasher()
+        policy = {"hasher": hasher.algorithm, "iterations": getattr(hasher, "iterations", None)}
+        user = Resident.objects.create_user(
+            username="login_bench", password=password, role="resident", apartment_no="Z-000", phone_number="9000000000",
+        )
+        client = Client(HTTP_HOST=host, raise_request_exception=False)
+        bodies = {
+            "token_only": {"username": user.username, "password": password},
+            "with_session": {"username": user.username, "password": password, "session": True},
+            "wrong_password": {"username": user.username, "password": "wrong"},
+            "rejected": {"username": user.username, "password": "wrong"},
+        }
+        for case, body in bodies.items():
+            samples = []
+            for n in range(requests + 1):
+                reset_login_limits(ip="127.0.0.1", username=user.username)
+                if case == "rejected":
+                    username_bucket = login_buckets()[1]
+                    identity = login_identities("127.0.0.1", user.username)[0]
+                    while username_bucket is not None and username_bucket.consume(identity):
+                        pass
+                client.cookies.clear()
+                cpu_started, started = time.process_time(), time.perf_counter()
+                response = client.post("/api/login/", body, content_type="application/json")
+                sample = ((time.perf_counter() - started) * 1000, (time.process_time() - cpu_started) * 1000, response.status_code)
+                if n:  # The first request warms up (and upgrades the hash)
+                    samples.append(sample)
+            cpu_ms = sum(sample[1] for sample in samples) / len(samples)
+            cases[case] = {
+                "count": len(samples),
+                "p50_ms": round(percentile([sample[0] for sample in samples], 50), 3),
+                "p95_ms": round(percentile([sample[0] for sample in samples], 95), 3),
+                "cpu_ms": round(cpu_ms, 3),
+                "per_cpu_second": round(1000 / cpu_ms, 1) if cpu_ms else None,
+                "statuses": dict(Counter(str(sample[2]) for sample in samples)),
+            }
+        transaction.set_rollback(True)
+
+    return {
+        "meta": {
+            "created": timezone.now().isoformat(),
+            "database": connection.vendor,
+            **policy,
+            "requests": requests,
+        },
+        "cases": cases,
+    }
+
+
+# Lists timed by `run_serializer_benchmark`: name -> (serializer, model, keyset field)
+SERIALIZER_TARGETS = {
+    "complaints": (ComplaintSerializer, Complaint, "created_at"),
+    "payments": (PaymentSerializer, Payment, "payment_date"),
+    "security_logs": (SecurityLogSerializer, SecurityLog, "entry_time"),
+}
+
+
+def run_serializer_benchmark(rows=2000, iterations=5, only=None):
+    """
+    Compare rows per second of DRF serializers with the `fastpath` row plans.
+
+    - Each list renders its newest `rows` rows to JSON bytes `iterations` times per path:
+      `drf` fetches model instances and renders with `JSONRenderer`, `fast` fetches
+      `values()` rows and renders with `FastJSONRenderer`. The best run counts.
+    - `serialize` excludes the fetch; `total` includes it.
+    - `identical` tells whether both paths wrote the same bytes.
+    """
+    targets = {}
+    for name, (serializer_class, model, keyset_field) in SERIALIZER_TARGETS.items():
+        if only and name not in only:
+            continue
+        queryset = serializer_class.setup_queryset(model.objects.all()).order_by(f"-{keyset_field}", "-pk")
+        plan = RowPlan.build(serializer_class())
+        instances, values = queryset[:rows], plan.values(queryset)[:rows]
+        paths = {  # `.all()` so every run queries again
+            "drf": (lambda: list(instances.all()), lambda page: JSONRenderer().render(serializer_class(page, many=True).data)),
+            "fast": (lambda: list(values.all()), lambda page: FastJSONRenderer().render(plan.render(page))),
+        }
+        results, outputs = {}, {}
+        for path, (fetch, render) in paths.items():
+            best_total = best_serialize = math.inf
+            for _ in range(iterations):
+                started = time.perf_counter()
+                page = fetch()
+                fetched = time.perf_counter()
+                outputs[path] = render(page)
+                finished = time.perf_counter()
+                best_total = min(best_total, finished - started)
+                best_serialize = min(best_serialize, finished - fetched)
+            count = len(page)
+            results[path] = {
+                "rows": count,
+                "total_ms": round(best_total * 1000, 3),
+                "serialize_ms": round(best_serialize * 1000, 3),
+                "rows_per_sec": round(count / best_total) if count else 0,
+                "serialize_rows_per_sec": round(count / best_serialize) if count else 0,
+            }
+        drf, fast = results["drf"], results["fast"]
+        results["speedup"] = round(drf["total_ms"] / fast["total_ms"], 2) if fast["total_ms"] else None
+        results["serialize_speedup"] = round(drf["serialize_ms"] / fast["serialize_ms"], 2) if fast["serialize_ms"] else None
+        results["identical"] = outputs["drf"] == outputs["fast"]
+        targets[name] = results
+
+    return {
+        "meta": {
+            "created": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "encoder": "orjson" if orjson is not None else "json",
+            "rows": rows,
+            "iterations": iterations,
+        },
+        "targets": targets,
+    }
+
+
+def compare_throughput(baseline, current, threshold=10.0):
+    """
+    List regressions of a concurrency report against `baseline` (say, the WSGI run).
+
+    - Throughput regresses when it falls by more than `threshold` percent; overall p95
+      when it grows by more than `threshold` percent.
+    """
+    regressions = []
+    before, now = baseline["overall"], current["overall"]
+    if now["throughput_rps"] < before["throughput_rps"] * (1 - threshold / 100):
+        regressions.append(f"throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s")
+    if now["p95_ms"] > before["p95_ms"] * (1 + threshold / 100):
+        regressions.append(f"p95 {before['p95_ms']} ms -> {now['p95_ms']} ms")
+    return regressions
+
+
+def compare_reports(baseline, current, threshold=10.0, noise_ms=1.0):
+    """
+    List regressions of `current` against a saved `baseline` report.
+
+    - Latency regresses when p95 grows by more than `threshold` percent and by more
+      than `noise_ms`; query counts regress on any increase; peak memory on growth
+      beyond `threshold` percent.
+    """
+    regressions = []
+    factor = 1 + threshold / 100
+    for name, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * factor and now["p95_ms"] - before["p95_ms"] > noise_ms:
+            regressions.append(f"{name}: p95 {before['p95_ms']} ms -> {now['p95_ms']} ms")
+        if now["max_queries"] > before["max_queries"]:
+            regressions.append(f"{name}: queries {before['max_queries']} -> {now['max_queries']}")
+        if "peak_kb" in now and "peak_kb" in before and now["peak_kb"] > before["peak_kb"] * factor:
+            regressions.append(f"{name}: peak memory {before['peak_kb']} KB -> {now['peak_kb']} KB")
+    return regressions
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def save_report(report, path):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
@@ -0,0 +1,214 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import FacilityBooking
+
+
+class IntervalIndex:
+    """
+    Sorted interval index over one facility's approved bookings.
+
+    - Intervals are kept sorted by start, alongside a running maximum of end times,
+      so both overlap bounds are a binary search even if legacy rows overlap.
+    - `overlapping` and `free_slots` cost O(log n + k) for k matching bookings.
+    """
+    def __init__(self, intervals):
+        intervals = sorted(intervals)
+        self.starts = [start for start, _, _ in intervals]
+        self.ends = [end for _, end, _ in intervals]
+        self.ids = [booking_id for _, _, booking_id in intervals]
+        self.max_ends = []
+        for end in self.ends:
+            self.max_ends.append(max(end, self.max_ends[-1]) if self.max_ends else end)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _window(self, start, end):
+        # Everything before `lo` ends by `start`; everything from `hi` starts at or after `end`
+        return bisect_right(self.max_ends, start), bisect_left(self.starts, end)
+
+    def overlapping(self, start, end):
+        """
+        Return `(start, end, booking_id)` for every booking intersecting `[start, end)`.
+        """
+        lo, hi = self._window(start, end)
+        return [
+            (self.starts[i], self.ends[i], self.ids[i])
+            for i in range(lo, hi) if self.ends[i] > start
+        ]
+
+    def free_slots(self, start, end):
+        """
+        Return the `(start, end)` gaps in `[start, end)` not covered by any booking.
+        """
+        slots = []
+        cursor = start
+        for busy_start, busy_end, _ in self.overlapping(start, end):
+            if busy_start > cursor:
+                slots.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if cursor < end:
+            slots.append((cursor, end))
+        return slots
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_interval_index(facility_name):
+    """
+    Return the cached interval index for a facility, loading it on first use.
+
+    - Entries are dropped by the FacilityBooking signals and expire after
+      `BOOKING_INDEX_TTL` seconds, so changes made by other workers show up too.
+    """
+    ttl = getattr(settings, "BOOKING_INDEX_TTL", 30)
+    now = time.monotonic()
+    with _indexes_lock:
+        cached = _indexes.get(facility_name)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+
+    rows = (
+        FacilityBooking.objects
+        .filter(facility_name=facility_name, status="approved", end_time__isnull=False)
+        .order_by("start_time")
+        .values_list("start_time", "end_time", "id")
+    )
+    index = IntervalIndex(rows)
+    with _indexes_lock:
+        _indexes[facility_name] = (now, index)
+    return index
+
+
+def invalidate_interval_index(facility_name=None):
+    """
+    Drop the cached index of one facility, or of every facility.
+    """
+    with _indexes_lock:
+        if facility_name is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(facility_name, None)
+
+
+def find_conflicts(facility_name, start_time, end_time, exclude_id=None):
+    """
+    Return ids of approved bookings for the facility overlapping `[start_time, end_time)`.
+
+    - Reads the database (not the cache), as a range scan on the
+      `(facility_name, start_time, end_time, status)` index.
+    """
+    conflicts = FacilityBooking.objects.filter(
+        facility_name=facility_name,
+        status="approved",
+        start_time__lt=end_time,
+        end_time__gt=start_time,
+    )
+    if exclude_id is not None:
+        conflicts = conflicts.exclude(pk=exclude_id)
+    return list(conflicts.values_list("id", flat=True))
+
+
+def lock_approved_overlaps(facility_names, start_time, end_time, ids):
+    """
+    Lock the bookings `ids` and every booking of the facilities intersecting
+    `[start_time, end_time)`, whatever their status; return the approved ones
+    as `(facility_name, start_time, end_time, id)`.
+
+    - Must run inside a transaction. Two approvals of overlapping slots lock each
+      other's rows, so the second waits and then sees the first as approved. This
+      holds whether or not a Facility row carries the booking's free-text name.
+    - Rows are locked in id order, so concurrent approvals do not deadlock.
+    """
+    rows = (
+        FacilityBooking.objects
+        .select_for_update()
+        .filter(Q(facility_name__in=facility_names, start_time__lt=end_time, end_time__gt=start_time) | Q(pk__in=ids))
+        .order_by("pk")
+        .values_list("facility_name", "start_time", "end_time", "id", "status")
+    )
+    return [row[:4] for row in rows if row[4] == "approved" and row[3] not in ids]
+
+
+def check_approval(booking):
+    """
+    Lock the bookings `booking` could clash with and return the ids of the approved
+    ones it overlaps (empty when it can be approved).
+
+    - Must run inside a transaction; `booking` carries the times it will be approved
+      with, which may not be saved yet.
+    - Raises ValueError for a booking without an end time, whose slot cannot be checked.
+    """
+    if booking.end_time is None:
+        raise ValueError("Set an end time before approving this booking.")
+    approved = lock_approved_overlaps([booking.facility_name], booking.start_time, booking.end_time, [booking.pk])
+    return [booking_id for _, _, _, booking_id in approved]
+
+
+def approve_booking(booking):
+    """
+    Approve `booking` unless it overlaps another approved booking.
+
+    - Approvals of overlapping slots are serialized by row locks (`check_approval`),
+      so two admins cannot approve them at the same moment.
+    - Returns the list of conflicting booking ids (empty on success); raises
+      ValueError for a booking without an end time.
+    """
+    with transaction.atomic():
+        conflicts = check_approval(booking)
+        if conflicts:
+            return conflicts
+        booking.status = "approved"
+        booking.save(update_fields=["status", "updated_at"])
+    return []
+
+
+def validate_bulk_approval(bookings):
+    """
+    Check a batch of bookings before approving them together.
+
+    - Locks and loads the bookings of the involved facilities in the batch's time
+      window with one query (see `lock_approved_overlaps`).
+    - A booking is refused if it has no end time, or overlaps an approved booking or
+      an earlier booking of the same batch.
+    - Returns `{booking_id: reason}` for the refused bookings.
+    """
+    errors = {booking.pk: "Set an end time before approving this booking." for booking in bookings if booking.end_time is None}
+    candidates = sorted(
+        (booking for booking in bookings if booking.end_time is not None),
+        key=lambda booking: (booking.facility_name, booking.start_time),
+    )
+    if not candidates:
+        return errors
+
+    names = {booking.facility_name for booking in candidates}
+    approved = lock_approved_overlaps(
+        names,
+        min(booking.start_time for booking in candidates),
+        max(booking.end_time for booking in candidates),
+        [booking.pk for booking in bookings],
+    )
+    intervals = {name: [] for name in names}
+    for facility_name, start_time, end_time, booking_id in approved:
+        intervals[facility_name].append((start_time, end_time, booking_id))
+    indexes = {name: IntervalIndex(rows) for name, rows in intervals.items()}
+
+    batch_end = {}  # Latest end time accepted so far in this batch, per facility
+    for booking in candidates:
+        clashes = indexes[booking.facility_name].overlapping(booking.start_time, booking.end_time)
+        if clashes:
+            ids = ", ".join(str(booking_id) for _, _, booking_id in clashes)
+            errors[booking.pk] = f"Overlaps approved booking(s) {ids}."
+        elif booking.facility_name in batch_end and booking.start_time < batch_end[booking.facility_name]:
+            errors[booking.pk] = "Overlaps another booking in this batch."
+        else:
+            batch_end[booking.facility_name] = max(booking.end_time, batch_end.get(booking.facility_name, booking.end_time))
+    return errors
@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .signals import bulk_status_updated
+
+
+def parse_ids(raw_ids):
+    """
+    Split a request's `ids` list into valid integer ids and per-id errors.
+    """
+    if not isinstance(raw_ids, list) or not raw_ids:
+        raise ValidationError({"ids": "Provide a non-empty list of ids."})
+    ids, errors = [], {}
+    for raw in raw_ids:
+        try:
+            ids.append(int(raw))
+        except (TypeError, ValueError):
+            errors[str(raw)] = "Invalid id."
+    return list(dict.fromkeys(ids)), errors  # Drop duplicates, keep order
+
+
+def bulk_update_status(queryset, raw_ids, field, new_status, validate=None, on_update=None):
+    """
+    Set `field` to `new_status` on every listed row with a single UPDATE.
+
+    - Rows are locked and checked first; missing ids and ids rejected by
+      `validate(rows)` (which returns `{id: reason}`) are reported, not updated.
+    - `on_update(rows)` runs inside the transaction with the rows about to change
+      (pre-update instances), for bookkeeping that must commit with the update.
+    - Partial by design: the valid rows are updated and the refused ones reported.
+      The lock, checks and UPDATE share one transaction, so only a database error
+      rolls the whole batch back.
+    - Sends `bulk_status_updated` after commit so caches and listeners can react.
+    - Returns `(updated_ids, errors)`.
+    """
+    ids, errors = parse_ids(raw_ids)
+    model = queryset.model
+
+    with transaction.atomic():
+        rows = list(queryset.select_for_update().filter(pk__in=ids))
+        found = {row.pk for row in rows}
+        for missing in ids:
+            if missing not in found:
+                errors[str(missing)] = "Not found."
+
+        if validate is not None and rows:
+            rejected = validate(rows)
+            errors.update({str(pk): reason for pk, reason in rejected.items()})
+            rows = [row for row in rows if row.pk not in rejected]
+
+        updated = [row.pk for row in rows]
+        if updated:
+            changes = {field: new_status}
+            # `.update()` skips auto_now, so keep `updated_at`-style columns current by hand
+            now = timezone.now()
+            for model_field in model._meta.concrete_fields:
+                if getattr(model_field, "auto_now", False):
+                    changes[model_field.name] = now
+            model.objects.filter(pk__in=updated).update(**changes)
+            if on_update is not None:
+                on_update(rows)
+            transaction.on_commit(lambda: bulk_status_updated.send(
+                sender=model, ids=updated, field=field, status=new_status, rows=rows,
+            ))
+
+    return updated, errors
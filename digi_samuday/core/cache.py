@@ -0,0 +1,157 @@
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+
+def get_cache():
+    return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+
+class CacheStats:
+    """
+    Thread-safe, in-process hit/miss counters per cache namespace.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def record(self, namespace, hit):
+        with self._lock:
+            self._counts[namespace]["hits" if hit else "misses"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {namespace: dict(counts) for namespace, counts in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+stats = CacheStats()
+
+
+def _version_key(namespace):
+    return f"api:version:{namespace}"
+
+
+def get_namespace_version(namespace):
+    """
+    Return the current version of a namespace, creating it if needed.
+
+    - Versions start from a millisecond timestamp rather than 1, so a version key
+      evicted from the cache never comes back equal to an older one.
+    """
+    cache = get_cache()
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_namespace(namespace):
+    """
+    Invalidate every cached response in a namespace by bumping its version.
+    """
+    cache = get_cache()
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+# Bumped when a resident's row changes; ETags of payloads embedding resident columns mix it in
+RESIDENTS_NAMESPACE = "residents"
+
+
+def user_namespace(user_id):
+    return f"user:{user_id}"
+
+
+def invalidate_user(user_id):
+    """
+    Invalidate every per-user cached response belonging to one user.
+    """
+    invalidate_namespace(user_namespace(user_id))
+
+
+def build_cache_key(request, namespace, per_user):
+    """
+    Key a response by namespace version, full path (including cursor and filters)
+    and, for personal data, the requesting user and that user's version.
+    """
+    owner = "shared"
+    if per_user:
+        owner = f"{request.user.pk}:{get_namespace_version(user_namespace(request.user.pk))}"
+    version = get_namespace_version(namespace)
+    path_hash = hashlib.md5(request.get_full_path().encode("utf-8")).hexdigest()
+    return f"api:response:{namespace}:{version}:{owner}:{path_hash}"
+
+
+def cached_call(request, namespace, compute, per_user=False, timeout=None):
+    """
+    Return a cached `Response` for `request`, or compute and cache it.
+
+    - Only successful GET responses are stored; the serialized `data` is cached,
+      not the rendered bytes, so content negotiation still works.
+    """
+    if request.method != "GET":
+        return compute()
+
+    cache = get_cache()
+    key = build_cache_key(request, namespace, per_user)
+    data = cache.get(key)
+    if data is not None:
+        stats.record(namespace, hit=True)
+        return Response(data)
+
+    stats.record(namespace, hit=False)
+    response = compute()
+    if response.status_code == 200:
+        if timeout is None:
+            timeout = getattr(settings, "API_CACHE_TIMEOUT", 300)
+        cache.set(key, response.data, timeout)
+    return response
+
+
+def cache_response(namespace, per_user=False, timeout=None):
+    """
+    Decorator caching a function view's GET responses.
+
+    - `per_user=True` keys entries by user, for personal data; `invalidate_user`
+      then clears one user's entries and `invalidate_namespace` clears everyone's.
+    - Apply it below `@api_view`/`@permission_classes` so the request is authenticated.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            compute = lambda: view(request, *args, **kwargs)
+            return cached_call(request, namespace, compute, per_user=per_user, timeout=timeout)
+        return wrapped
+    return decorator
+
+
+class CachedResponseMixin:
+    """
+    ViewSet mixin caching `list` and `retrieve` responses in `cache_namespace`.
+    """
+    cache_namespace = None
+    cache_per_user = False
+    cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        compute = lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs)
+        return cached_call(request, self.cache_namespace, compute, self.cache_per_user, self.cache_timeout)
+
+    def retrieve(self, request, *args, **kwargs):
+        compute = lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs)
+        return cached_call(request, self.cache_namespace, compute, self.cache_per_user, self.cache_timeout)
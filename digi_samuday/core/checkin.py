@@ -0,0 +1,186 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import SkipField, empty
+
+from .cache import invalidate_namespace
+from .models import Resident, SecurityLog, Visitor
+from .serializers import VisitorSerializer
+
+PREMISES_NAMESPACE = "premises"  # Cached "currently inside" list and count
+
+
+class ResidentDirectory:
+    """
+    Snapshot of the residents a visitor can be logged against.
+
+    - `ids` holds every resident id; `by_apartment` maps an apartment number to its
+      first-registered active resident, so gate staff can key in the flat instead of an id.
+    """
+    def __init__(self, rows):
+        self.ids = set()
+        self.by_apartment = {}
+        for pk, apartment_no, role, status in rows:
+            self.ids.add(pk)
+            if role == Resident.RESIDENT and status == "active" and apartment_no:
+                self.by_apartment.setdefault(apartment_no.strip().upper(), pk)
+
+    def resolve(self, resident_id=None, apartment_no=None):
+        """
+        Return the resident id for an entry, or `None` if it names no known resident.
+        """
+        if resident_id not in (None, ""):
+            try:
+                resident_id = int(resident_id)
+            except (TypeError, ValueError):
+                return None
+            return resident_id if resident_id in self.ids else None
+        return self.by_apartment.get(str(apartment_no).strip().upper())
+
+
+_directory = None
+_directory_lock = threading.Lock()
+
+
+def get_resident_directory():
+    """
+    Return the cached resident directory, loading it with one query when missing or stale.
+
+    - Resident signals drop it, and it expires after `CHECKIN_DIRECTORY_TTL` seconds so
+      changes made by other workers show up too.
+    """
+    global _directory
+    ttl = getattr(settings, "CHECKIN_DIRECTORY_TTL", 300)
+    now = time.monotonic()
+    with _directory_lock:
+        if _directory is not None and now - _directory[0] < ttl:
+            return _directory[1]
+
+    rows = Resident.objects.order_by("pk").values_list("pk", "apartment_no", "role", "status")
+    directory = ResidentDirectory(rows.iterator(chunk_size=2000))
+    with _directory_lock:
+        _directory = (now, directory)
+    return directory
+
+
+def invalidate_resident_directory():
+    global _directory
+    with _directory_lock:
+        _directory = None
+
+
+ENTRY_FIELDS = ["name", "phone_number", "vehicle_number"]  # Visitor columns an entry fills in
+
+
+def entry_fields():
+    """
+    The `VisitorSerializer` fields for an entry's own columns, so entries get the same
+    type and `max_length` checks as the API, without the per-entry resident query.
+    """
+    fields = VisitorSerializer().fields
+    return {name: fields[name] for name in ENTRY_FIELDS}
+
+
+def clean_entry(entry, directory, fields=None):
+    """
+    Validate one check-in entry; return `(visitor_fields, None)` or `(None, errors)`.
+
+    - `fields` are the `entry_fields()` to validate with (built once per batch).
+    - The resident is given as `resident_id` (or `resident`) or as `apartment_no`.
+    """
+    if not isinstance(entry, dict):
+        return None, {"error": "Each entry must be an object."}
+    resident_id = entry.get("resident_id", entry.get("resident"))
+    apartment_no = entry.get("apartment_no")
+
+    cleaned, errors = {}, {}
+    for name, field in (fields or entry_fields()).items():
+        try:
+            cleaned[name] = field.run_validation(entry.get(name, empty))
+        except SkipField:  # Optional and not given
+            cleaned[name] = None
+        except ValidationError as e:
+            errors[name] = str(e.detail[0])
+    if resident_id in (None, "") and not apartment_no:
+        errors["resident_id"] = "This field is required."
+    if errors:
+        return None, errors
+
+    resident = directory.resolve(resident_id, apartment_no)
+    if resident is None:
+        return None, {"error": "Resident not found."}
+    return {
+        "name": cleaned["name"],
+        "phone_number": cleaned["phone_number"],
+        "vehicle_number": cleaned["vehicle_number"] or None,
+        "resident_id": resident,
+    }, None
+
+
+def write_check_ins(rows, guard_name):
+    """
+    Insert the visitors and their security logs in one transaction.
+
+    - Visitors go in with one multi-row INSERT where the backend returns the new
+      primary keys (PostgreSQL, SQLite, MariaDB); on MySQL each is its own INSERT.
+      Logs always share one INSERT.
+    """
+    visitors = [Visitor(**fields) for fields in rows]
+    with transaction.atomic():
+        if connection.features.can_return_rows_from_bulk_insert:
+            Visitor.objects.bulk_create(visitors)
+        else:
+            for visitor in visitors:
+                visitor.save(force_insert=True)
+        SecurityLog.objects.bulk_create([SecurityLog(visitor=visitor, guard_name=guard_name) for visitor in visitors])
+        transaction.on_commit(lambda: invalidate_namespace(PREMISES_NAMESPACE))  # bulk_create sends no post_save
+    return visitors
+
+
+def check_in_visitors(entries, guard):
+    """
+    Log a batch of gate entries for `guard`.
+
+    - Entries are validated against the cached resident directory, so a check-in
+      costs no lookup query, and against `VisitorSerializer`'s field rules (types,
+      lengths); invalid entries are reported by index, not written.
+    - Valid entries are written all-or-nothing: no visitor without its log.
+    - If a cached resident was deleted meanwhile, the directory is reloaded and the
+      batch validated and written again.
+    - Returns `(visitors, errors)` with `visitors` as `(index, Visitor)` pairs.
+    """
+    fields = entry_fields()
+    for attempt in range(2):
+        directory = get_resident_directory()
+        valid, errors = [], {}
+        for index, entry in enumerate(entries):
+            cleaned, entry_errors = clean_entry(entry, directory, fields)
+            if entry_errors:
+                errors[str(index)] = entry_errors
+            else:
+                valid.append((index, cleaned))
+        if not valid:
+            return [], errors
+        try:
+            visitors = write_check_ins([cleaned for _, cleaned in valid], guard.username)
+        except IntegrityError:
+            if attempt:
+                raise
+            invalidate_resident_directory()
+            continue
+        return list(zip([index for index, _ in valid], visitors)), errors
+
+
+def open_logs():
+    """
+    Security logs of visitors still inside, newest entry first.
+
+    - Served by the partial index on `entry_time WHERE exit_time IS NULL` (the
+      `(exit_time, entry_time)` index on MySQL), so the cost follows the number of
+      people inside, not the size of the log history.
+    """
+    return SecurityLog.objects.filter(exit_time__isnull=True).order_by("-entry_time")
+
@@ -0,0 +1,161 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import get_namespace_version
+
+
+def make_etag(*parts):
+    """
+    Build a strong, quoted ETag from the given validator parts.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return quote_etag(digest)
+
+
+def is_not_modified(request, etag, last_modified):
+    """
+    Evaluate `If-None-Match` (preferred) or `If-Modified-Since` against the validators.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return "*" in etags or etag in etags
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    if if_modified_since is not None and last_modified is not None:
+        return int(last_modified.timestamp()) <= if_modified_since
+    return False
+
+
+def conditional_response(request, validators, compute):
+    """
+    Answer a GET with 304 when the client's copy is current, else compute it.
+
+    - `validators` returns `(etag, last_modified)` and must be far cheaper than
+      `compute` (an aggregate query rather than serializing rows).
+    - Successful responses are tagged with `ETag`, and with `Last-Modified` unless
+      `last_modified` is None.
+    """
+    if request.method != "GET":
+        return compute()
+
+    etag, last_modified = validators()
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response = compute()
+    if response.status_code == 200:
+        for name, value in headers.items():
+            response[name] = value
+    return response
+
+
+async def aconditional_response(request, validators, compute):
+    """
+    Async version of `conditional_response` for async views.
+
+    - `validators` and `compute` are coroutine functions; `compute` returns a Django `HttpResponse`.
+    """
+    etag, last_modified = await validators()
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+    if is_not_modified(request, etag, last_modified):
+        return HttpResponseNotModified(headers=headers)
+
+    response = await compute()
+    if response.status_code == 200:
+        for name, value in headers.items():
+            response[name] = value
+    return response
+
+
+def namespace_versions(namespaces):
+    """
+    Current versions of the cache namespaces an ETag depends on (see `ConditionalGetMixin.etag_namespaces`).
+    """
+    return [get_namespace_version(namespace) for namespace in namespaces]
+
+
+def list_summary_etag(request, summary, versions=()):
+    """
+    Build list validators from a `total`/`last_id`/`last_modified` aggregate and namespace versions.
+
+    - Returns `(etag, None)`: a list has no trustworthy modification time, since
+      deleting a row or renaming an embedded resident leaves `MAX(updated_at)`
+      where it was, so lists are revalidated by ETag only.
+    """
+    etag = make_etag(
+        request.get_full_path(), summary["total"], summary["last_id"],
+        summary["last_modified"].isoformat() if summary["last_modified"] else "", *versions,
+    )
+    return etag, None
+
+
+async def alist_validators(request, queryset, field="updated_at", namespaces=()):
+    """
+    Async version of `ConditionalGetMixin.list_validators` for a given queryset.
+
+    - Namespace versions are read from the cache without leaving the event loop,
+      as the token cache is.
+    """
+    summary = await queryset.order_by().aaggregate(total=Count("pk"), last_modified=Max(field), last_id=Max("pk"))
+    return list_summary_etag(request, summary, namespace_versions(namespaces))
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding ETag/Last-Modified validation to `list` and `retrieve`.
+
+    - List validators come from one `COUNT`/`MAX(updated_at)`/`MAX(id)` aggregate over
+      the filtered queryset, so inserts, edits and deletes all change the ETag;
+      lists send no `Last-Modified`, which deletes would not move.
+    - Detail validators read only the object's `updated_at`.
+    - Neither sees joined rows, so payloads embedding another table's columns
+      (`resident.username`) list its cache namespace in `etag_namespaces`; that
+      namespace's version, bumped by the model's signals, is mixed into both ETags,
+      and such details send no `Last-Modified` either.
+      With a per-process cache (LocMem) a bump only reaches its own worker, so
+      multi-worker deployments need a shared cache, as for `CachedResponseMixin`.
+    - Place it before `CachedResponseMixin` so 304s skip the cache lookup too.
+    """
+    etag_field = "updated_at"
+    etag_namespaces = ()
+
+    def list_validators(self):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        summary = queryset.aggregate(
+            total=Count("pk"), last_modified=Max(self.etag_field), last_id=Max("pk"),
+        )
+        return list_summary_etag(self.request, summary, namespace_versions(self.etag_namespaces))
+
+    def retrieve_validators(self):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        last_modified = (
+            self.filter_queryset(self.get_queryset())
+            .filter(**{self.lookup_field: lookup})
+            .values_list(self.etag_field, flat=True)
+            .first()
+        )
+        etag = make_etag(
+            self.request.get_full_path(), last_modified.isoformat() if last_modified else "missing",
+            *namespace_versions(self.etag_namespaces),
+        )
+        return etag, None if self.etag_namespaces else last_modified
+
+    def list(self, request, *args, **kwargs):
+        compute = lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        return conditional_response(request, self.list_validators, compute)
+
+    def retrieve(self, request, *args, **kwargs):
+        compute = lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        return conditional_response(request, self.retrieve_validators, compute)
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+BROADCAST = "all"  # Channel every signed-in user listens on
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+def role_channel(role):
+    return f"role:{role}"
+
+
+class Subscription:
+    """
+    One client's event queue, bound to the event loop that reads it.
+
+    - The queue is bounded; if a client falls behind, its backlog is replaced by a
+      single `resync` event telling it to re-fetch instead.
+    """
+    def __init__(self, broker, channels, loop, maxsize):
+        self.broker = broker
+        self.channels = channels
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def deliver(self, event):
+        # Runs on `self.loop`
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "data": {}, "at": event["at"]})
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Fan events out to the subscribers connected to this worker process.
+
+    - `publish` may be called from any thread (signal handlers run in request threads);
+      delivery is handed to each subscriber's event loop with `call_soon_threadsafe`.
+    - Idle subscribers cost a parked coroutine and an open socket, nothing more.
+    """
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = {}  # channel -> set of subscriptions
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels, loop=None):
+        subscription = Subscription(self, list(channels), loop or asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return len({subscription for subscribers in self._subscribers.values() for subscription in subscribers})
+
+    def publish(self, channel, event):
+        self.deliver(channel, event)
+
+    def deliver(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:  # The subscriber's loop has closed
+                subscription.close()
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Relay events through Redis pub/sub so every worker process can fan them out.
+
+    - `publish` sends to Redis; one listener thread per process receives every
+      channel and delivers to the local subscribers.
+    - Needs the optional `redis` package and `EVENT_BROKER_OPTIONS = {"url": ...}`.
+    """
+    def __init__(self, url="redis://127.0.0.1:6379/0", prefix="digisamuday:events", queue_size=100):
+        import redis
+
+        super().__init__(queue_size)
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def publish(self, channel, event):
+        self._redis.publish(f"{self.prefix}:{channel}", json.dumps(event))
+
+    def subscribe(self, channels, loop=None):
+        self._ensure_listener()
+        return super().subscribe(channels, loop)
+
+    def _ensure_listener(self):
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="event-broker", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(f"{self.prefix}:*")
+        offset = len(self.prefix) + 1
+        for message in pubsub.listen():
+            try:
+                self.deliver(message["channel"].decode()[offset:], json.loads(message["data"]))
+            except Exception:
+                logger.exception("Dropped a malformed event from Redis")
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Return this process's broker, built from `EVENT_BROKER` and `EVENT_BROKER_OPTIONS`.
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            broker_class = import_string(getattr(settings, "EVENT_BROKER", "core.events.InProcessBroker"))
+            _broker = broker_class(**getattr(settings, "EVENT_BROKER_OPTIONS", {}))
+        return _broker
+
+
+def publish_event(channels, event_type, data):
+    """
+    Publish an event to `channels` once the current transaction commits.
+
+    - Broker failures are logged, never raised into the request that caused the event.
+    """
+    event = {"type": event_type, "data": data, "at": timezone.now().isoformat()}
+
+    def send():
+        broker = get_broker()
+        for channel in channels:
+            try:
+                broker.publish(channel, event)
+            except Exception:
+                logger.exception("Could not publish %s to %s", event_type, channel)
+
+    transaction.on_commit(send)
+
+
+def format_sse(event):
+    """
+    Encode an event as one Server-Sent Events message.
+    """
+    return f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
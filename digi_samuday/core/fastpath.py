@@ -0,0 +1,195 @@
+import decimal
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import fields as drf_fields, relations, serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from .fieldsets import column_path
+from .filters import get_ordering
+from .metrics import record_serializer_time
+from .serializers import QueryPlanMixin
+
+try:
+    import orjson
+except ImportError:  # Optional; without it the stdlib encoder writes the same bytes, only slower
+    orjson = None
+
+
+def identity(value):
+    return value
+
+
+def datetime_converter(field):
+    """
+    Precompile `DateTimeField.to_representation` for aware datetimes in ISO 8601.
+    """
+    if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601 or hasattr(field, "timezone") or not settings.USE_TZ:
+        return None
+    zone = timezone.get_current_timezone()
+
+    def convert(value):
+        value = value.astimezone(zone) if value.tzinfo is not None else timezone.make_aware(value, zone)
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    return convert
+
+
+def date_converter(field):
+    if getattr(field, "format", api_settings.DATE_FORMAT) != ISO_8601:
+        return None
+    return lambda value: value.isoformat()
+
+
+def decimal_converter(field):
+    """
+    Precompile `DecimalField.to_representation` (quantized, as a string).
+    """
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return None
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+    return convert
+
+
+def choice_converter(field):
+    choices = field.choice_strings_to_values
+    if not all(isinstance(key, str) for key in choices):
+        return None
+    return lambda value: choices.get(value, value) if isinstance(value, str) else field.to_representation(value)
+
+
+# DRF field class -> factory of a converter for the raw `values()` value (None: not supported).
+# Exact classes only: a subclass may override `to_representation`.
+CONVERTERS = {
+    drf_fields.CharField: lambda field: str,
+    drf_fields.EmailField: lambda field: str,
+    drf_fields.IntegerField: lambda field: int,
+    drf_fields.BigIntegerField: lambda field: str if getattr(field, "coerce_to_string", api_settings.COERCE_BIGINT_TO_STRING) else int,
+    drf_fields.BooleanField: lambda field: field.to_representation,
+    drf_fields.ReadOnlyField: lambda field: identity,
+    drf_fields.ChoiceField: choice_converter,
+    drf_fields.DateTimeField: datetime_converter,
+    drf_fields.DateField: date_converter,
+    drf_fields.DecimalField: decimal_converter,
+    relations.PrimaryKeyRelatedField: lambda field: identity if field.pk_field is None else None,
+}
+
+
+class RowPlan:
+    """
+    A serializer's fields compiled into `values()` columns plus one converter per field.
+
+    - `build(serializer)` returns None unless every field can be compiled: a column
+      source through non-null relations, and a field type listed in `CONVERTERS`.
+    - `render(rows)` produces the same dicts (same keys, same order, same values) as
+      `serializer_class(instances, many=True).data` for the same rows.
+    """
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields  # [(name, column, convert)]
+        self.columns = [column for _, column, _ in fields]
+
+    @classmethod
+    def build(cls, serializer):
+        model = serializer.Meta.model
+        if type(serializer).to_representation not in (serializers.Serializer.to_representation, QueryPlanMixin.to_representation):
+            return None
+        compiled = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            factory = CONVERTERS.get(type(field))
+            path = column_path(model, field.source) if factory is not None and field.source != "*" else None
+            if path is None or not cls.non_null_relations(model, path[1]):
+                return None
+            convert = factory(field)
+            if convert is None:
+                return None
+            compiled.append((name, path[0], convert))
+        return cls(model, compiled)
+
+    @staticmethod
+    def non_null_relations(model, relations):
+        # Through a null relation DRF renders None or skips the field; `values()` cannot tell which
+        for relation in relations:
+            opts = model._meta
+            for name in relation.split("__"):
+                field = opts.get_field(name)
+                if field.null:
+                    return False
+                opts = field.related_model._meta
+        return True
+
+    def values(self, queryset, keep=()):
+        """
+        Turn `queryset` into `values()` rows with the plan's columns, the pk and `keep`.
+        """
+        return queryset.values("pk", *dict.fromkeys([*self.columns, *(column for column in keep if column != "pk")]))
+
+    def render(self, rows):
+        started = time.perf_counter()
+        fields = self.fields
+        data = [
+            {name: None if (value := row[column]) is None else convert(value) for name, column, convert in fields}
+            for row in rows
+        ]
+        record_serializer_time(time.perf_counter() - started)
+        return data
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` encoding with orjson, for data holding only JSON-native values
+    (str, int, bool, None, lists and str-keyed dicts), such as `RowPlan.render` output.
+
+    - Writes the same bytes as `JSONRenderer` with DRF's default compact, unicode
+      settings; falls back to it for indented output or other settings.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:  # e.g. an int beyond 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class FastListMixin:
+    """
+    ViewSet mixin serving `list` from `values()` rows through a compiled `RowPlan`,
+    skipping model instances and DRF's per-field dispatch.
+
+    - Used for JSON responses when the serializer compiles; otherwise (the browsable
+      API, method fields, ...) the regular `list` runs. The output is the same.
+    - `?fields=`/`?exclude=` apply, since the plan is built from the narrowed serializer.
+    - Set `fast_list = False` on a ViewSet to opt out.
+    """
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        plan = None
+        if self.fast_list and type(request.accepted_renderer) is JSONRenderer:
+            plan = RowPlan.build(self.get_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = plan.values(self.filter_queryset(self.get_queryset()), [get_ordering(request, self)[0]])
+        page = self.paginate_queryset(rows)
+        request.accepted_renderer = FastJSONRenderer()  # The rows hold only JSON-native values
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
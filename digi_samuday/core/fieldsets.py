@@ -0,0 +1,89 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+from .filters import get_ordering
+from .utils import split_names
+
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+
+
+def requested_fields(request, available):
+    """
+    Return the names in `available` kept by `?fields=`/`?exclude=`, in their declared
+    order, or None when the request asks for no fieldset.
+
+    - Both parameters take comma-separated names; `exclude` applies after `fields`.
+    - Only reads (GET/HEAD) are narrowed, so write responses keep their full shape.
+    - Unknown names raise a ValidationError (400) rather than being ignored.
+    """
+    if request is None or request.method not in ("GET", "HEAD"):
+        return None
+    params = getattr(request, "query_params", request.GET)
+    fields, exclude = split_names(params.get(FIELDS_PARAM)), split_names(params.get(EXCLUDE_PARAM))
+    if not fields and not exclude:
+        return None
+
+    errors = {}
+    for param, names in ((FIELDS_PARAM, fields), (EXCLUDE_PARAM, exclude)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}."
+    if errors:
+        raise ValidationError(errors)
+    return [name for name in available if (not fields or name in fields) and name not in exclude]
+
+
+def column_path(model, source):
+    """
+    Turn a serializer `source` (`resident.username`) into an ORM path (`resident__username`)
+    and the relations it crosses; None when it is not a chain of concrete fields.
+    """
+    names = source.split(".")
+    opts, relations = model._meta, []
+    for position, name in enumerate(names):
+        try:
+            field = opts.pk if name == "pk" else opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete:
+            return None
+        if position < len(names) - 1:
+            if not field.is_relation or field.many_to_many:
+                return None
+            relations.append("__".join(names[:position + 1]))
+            opts = field.related_model._meta
+    return "__".join(names), relations
+
+
+def projection(model, sources, keep=()):
+    """
+    Return the `(select_related, only)` plan loading just the columns `sources` read,
+    plus the primary key and the `keep` columns; None when some source is not a column.
+    """
+    only, select_related = {model._meta.pk.name}, set()
+    for source in [*sources, *keep]:
+        if source == "pk":
+            continue
+        path = column_path(model, source) if source != "*" else None
+        if path is None:
+            return None
+        only.add(path[0])
+        select_related.update(path[1])
+    return sorted(select_related), sorted(only)
+
+
+class ProjectedQuerysetMixin:
+    """
+    ViewSet mixin pushing a `?fields=`/`?exclude=` fieldset down into the queryset of
+    `list` and `retrieve`, so deferred columns are never read.
+
+    - The serializer's `project_queryset` builds the `.only()` plan; the pagination key
+      (`keyset_field`, or the `?ordering=` field) is always loaded.
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if self.action not in ("list", "retrieve") or not hasattr(serializer_class, "project_queryset"):
+            return queryset
+        return serializer_class.project_queryset(queryset, self.request, [get_ordering(self.request, self)[0]])
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with its cost taken from `PASSWORD_PBKDF2_ITERATIONS`.
+
+    - Shares Django's algorithm name, so it verifies existing hashes. After a successful
+      login Django re-hashes a password stored at another cost (`must_update`), so a
+      changed policy reaches every active user without a reset.
+    - List it first in `PASSWORD_HASHERS`; the other entries only verify old hashes,
+      which are likewise upgraded on login.
+    """
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", None) or hashers.PBKDF2PasswordHasher.iterations
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import ReportJob
+from .reports import REPORTS, parse_report_filters, stream_csv, gzip_stream
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Return the process-wide worker pool, creating it on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "REPORT_JOB_WORKERS", 2),
+                thread_name_prefix="report-job",
+            )
+    return _executor
+
+
+def get_export_dir():
+    path = Path(getattr(settings, "REPORT_EXPORT_DIR", settings.BASE_DIR / "exports"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def get_export_path(job):
+    """
+    Content-addressed location of a job's finished file.
+    """
+    extension = ".csv.gz" if job.params.get("compress") else ".csv"
+    return get_export_dir() / f"{job.cache_key}{extension}"
+
+
+def normalize_params(report, data):
+    """
+    Validate the request body and return JSON-safe, canonical job parameters.
+
+    - Raises ValueError with a client-facing message on bad input.
+    """
+    filters = parse_report_filters(data, report)
+    params = {
+        "from": filters["date_from"].isoformat() if "date_from" in filters else None,
+        "to": filters["date_to"].isoformat() if "date_to" in filters else None,
+        "status": filters.get("status"),
+        "compress": data.get("compress") == "gzip",
+    }
+    return params
+
+
+def compute_cache_key(report_type, params):
+    """
+    Hash the report, its parameters and the current table fingerprint.
+
+    - Identical requests over unchanged data hash to the same key.
+    """
+    fingerprint = REPORTS[report_type].fingerprint()
+    payload = json.dumps(
+        {"report": report_type, "params": params, "data": fingerprint},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def submit_report_job(report_type, data, user):
+    """
+    Create a job for `report_type` and hand it to the worker pool.
+
+    - If an identical export already exists on disk, the job is returned finished.
+    - If an identical job is already queued or running, that job is returned instead.
+    """
+    report = REPORTS.get(report_type)
+    if report is None:
+        raise ValueError("Invalid report type. Use one of: " + ", ".join(REPORTS) + ".")
+    params = normalize_params(report, data)
+    cache_key = compute_cache_key(report_type, params)
+
+    in_flight = ReportJob.objects.filter(cache_key=cache_key, status__in=["queued", "running"]).first()
+    if in_flight is not None:
+        return in_flight
+
+    job = ReportJob(report_type=report_type, params=params, cache_key=cache_key, requested_by=user)
+    if get_export_path(job).exists():
+        job.status = "done"
+        job.cached = True
+        job.finished_at = timezone.now()
+        job.save()
+        return job
+
+    job.save()
+    enqueue_report_job(job)
+    return job
+
+
+def enqueue_report_job(job):
+    """
+    Run the job in the worker pool once the creating transaction commits.
+
+    - With `REPORT_JOBS_EAGER = True` the job runs inline (useful for tests and shells).
+    """
+    if getattr(settings, "REPORT_JOBS_EAGER", False):
+        run_report_job(job.pk)
+        job.refresh_from_db()
+        return
+    transaction.on_commit(lambda: get_executor().submit(_run_in_worker, job.pk))
+
+
+def _run_in_worker(job_id):
+    """
+    Pool entry point: give each job a fresh DB connection and release it afterwards.
+    """
+    close_old_connections()
+    try:
+        run_report_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def run_report_job(job_id):
+    """
+    Write a job's CSV to disk and record the outcome.
+
+    - The file is written under a temporary name and renamed into place, so a
+      crashed job never leaves a partial file behind the cache key; a failed
+      write removes its temporary file.
+    """
+    try:
+        updated = ReportJob.objects.filter(pk=job_id, status="queued").update(status="running")
+        if not updated:
+            return  # Already picked up by another worker
+        job = ReportJob.objects.get(pk=job_id)
+        report = REPORTS[job.report_type]
+        path = get_export_path(job)
+
+        if not path.exists():
+            filters = parse_report_filters(
+                {key: job.params.get(key) for key in ("from", "to", "status")}, report
+            )
+            content = stream_csv(report.headers, report.rows(**filters))
+            if job.params.get("compress"):
+                content = gzip_stream(content)
+            temp_path = path.with_name(f"{path.name}.{job.pk}.tmp")
+            try:
+                with open(temp_path, "wb") as handle:
+                    for chunk in content:
+                        handle.write(chunk)
+                os.replace(temp_path, path)
+            except Exception:
+                temp_path.unlink(missing_ok=True)
+                raise
+        else:
+            job.cached = True
+
+        job.status = "done"
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "cached", "finished_at"])
+    except Exception as e:
+        logger.exception("Report job %s failed", job_id)
+        ReportJob.objects.filter(pk=job_id).update(status="failed", error=str(e), finished_at=timezone.now())
+
+
+def resume_report_jobs():
+    """
+    Re-enqueue jobs left queued or running by a worker that exited mid-export.
+    """
+    jobs = list(ReportJob.objects.filter(status__in=["queued", "running"]))
+    for job in jobs:
+        ReportJob.objects.filter(pk=job.pk).update(status="queued")
+        enqueue_report_job(job)
+    return len(jobs)
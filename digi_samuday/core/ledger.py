@@ -0,0 +1,174 @@
+from collections import namedtuple
+from datetime import datetime, time
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Payment, PaymentLedger
+
+# Payment status -> ledger column prefix; other statuses are not counted
+COLUMNS = {"completed": "collected", "pending": "pending", "rejected": "rejected"}
+FIELDS = [f"{column}_{suffix}" for column in COLUMNS.values() for suffix in ("count", "total")]
+
+# What the ledger knows about a payment: where it is counted, and how much
+PaymentState = namedtuple("PaymentState", ["resident_id", "month", "status", "amount"])
+
+
+def month_of(moment):
+    """
+    Return the first day of the (local) month `moment` falls in.
+    """
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+def month_bounds(month):
+    """
+    Return the aware datetimes `[start, end)` of the month starting on `month`.
+    """
+    following = month.replace(year=month.year + 1, month=1) if month.month == 12 else month.replace(month=month.month + 1)
+    return (
+        timezone.make_aware(datetime.combine(month, time.min)),
+        timezone.make_aware(datetime.combine(following, time.min)),
+    )
+
+
+def snapshot(payment):
+    return PaymentState(payment.resident_id, month_of(payment.payment_date), payment.payment_status, Decimal(payment.amount))
+
+
+def update_ledger(before=(), after=()):
+    """
+    Move the ledger from the `before` payment states to the `after` states.
+
+    - Call it inside the transaction that writes the payments, so the totals commit
+      (or roll back) with them.
+    - Each touched row gets one `UPDATE ... SET total = total + delta`; rows are
+      visited in key order so concurrent writers lock them in the same order.
+    """
+    deltas = {}
+    for states, sign in ((before, -1), (after, 1)):
+        for state in states:
+            column = COLUMNS.get(state.status)
+            if column is None:
+                continue
+            row = deltas.setdefault((state.resident_id, state.month), {})
+            row[f"{column}_count"] = row.get(f"{column}_count", 0) + sign
+            row[f"{column}_total"] = row.get(f"{column}_total", Decimal("0")) + sign * state.amount
+
+    for (resident_id, month), row in sorted(deltas.items()):
+        changes = {field: delta for field, delta in row.items() if delta}
+        if not changes:
+            continue
+        rows = PaymentLedger.objects.filter(resident_id=resident_id, month=month)
+        increments = {field: F(field) + delta for field, delta in changes.items()}
+        increments["updated_at"] = timezone.now()  # `.update()` skips auto_now
+        if rows.update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                PaymentLedger.objects.create(resident_id=resident_id, month=month, **changes)
+        except IntegrityError:  # Another request created the row first
+            rows.update(**increments)
+
+
+def ledger_totals(rows):
+    """
+    Sum ledger `rows` into `{"collected": {"count", "total"}, "pending": ..., "rejected": ...}`.
+    """
+    sums = rows.aggregate(**{field: Sum(field) for field in FIELDS})
+    return format_totals(sums)
+
+
+def format_totals(row):
+    return {
+        column: {
+            "count": row[f"{column}_count"] or 0,
+            "total": str((row[f"{column}_total"] or Decimal("0")).quantize(Decimal("0.01"))),
+        }
+        for column in COLUMNS.values()
+    }
+
+
+def expected_rows(payments=None):
+    """
+    Compute ledger rows from the payments themselves: `{(resident_id, month): {field: value}}`.
+    """
+    payments = Payment.objects.all() if payments is None else payments
+    grouped = (
+        payments.order_by()
+        .annotate(month=TruncMonth("payment_date", output_field=PaymentLedger._meta.get_field("month")))
+        .values("resident_id", "month", "payment_status")
+        .annotate(count=Count("id"), total=Sum("amount"))
+    )
+    expected = {}
+    for group in grouped:
+        column = COLUMNS.get(group["payment_status"])
+        if column is None:
+            continue
+        row = expected.setdefault((group["resident_id"], group["month"]), dict.fromkeys(FIELDS, 0))
+        row[f"{column}_count"] = group["count"]
+        row[f"{column}_total"] = group["total"]
+    return expected
+
+
+def reconcile_ledger(fix=False):
+    """
+    Compare the ledger with totals recomputed from `Payment`; return the mismatches.
+
+    - Each mismatch is `{"resident_id", "month", "field", "expected", "actual"}`.
+    - With `fix`, every mismatched row is recomputed under a row lock, so payments
+      written meanwhile are neither lost nor counted twice; rows left all zero are removed.
+    """
+    expected = expected_rows()
+    actual = {
+        (row["resident_id"], row["month"]): row
+        for row in PaymentLedger.objects.values("resident_id", "month", *FIELDS)
+    }
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        want, have = expected.get(key, {}), actual.get(key, {})
+        for field in FIELDS:
+            if want.get(field, 0) != have.get(field, 0):
+                mismatches.append({
+                    "resident_id": key[0], "month": key[1], "field": field,
+                    "expected": want.get(field, 0), "actual": have.get(field, 0),
+                })
+
+    if fix:
+        for resident_id, month in sorted({(item["resident_id"], item["month"]) for item in mismatches}):
+            repair_row(resident_id, month)
+    return mismatches
+
+
+def repair_row(resident_id, month):
+    with transaction.atomic():
+        row, _ = PaymentLedger.objects.select_for_update().get_or_create(resident_id=resident_id, month=month)
+        start, end = month_bounds(month)
+        payments = Payment.objects.filter(resident_id=resident_id, payment_date__gte=start, payment_date__lt=end)
+        values = expected_rows(payments).get((resident_id, month))
+        if values is None:
+            row.delete()
+            return
+        for field, value in values.items():
+            setattr(row, field, value)
+        row.save()
+
+
+def rebuild_ledger():
+    """
+    Replace the whole ledger with totals recomputed from `Payment`; return the rows written.
+
+    - For bulk loads that bypass the payment API (e.g. `seed_society`); not safe while
+      payments are being written, use `reconcile_ledger(fix=True)` then.
+    """
+    with transaction.atomic():
+        PaymentLedger.objects.all().delete()
+        rows = [
+            PaymentLedger(resident_id=resident_id, month=month, **values)
+            for (resident_id, month), values in expected_rows().items()
+        ]
+        PaymentLedger.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
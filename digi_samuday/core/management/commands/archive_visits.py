@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.archive import archive_visits, optimize_tables
+
+
+class Command(BaseCommand):
+    help = (
+        "Move visitors and security logs older than the retention window into monthly gzip JSONL "
+        "files under ARCHIVE_DIR. Exports read them back for the months a date range covers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retention-days", type=int, help="Keep this many days live (default: ARCHIVE_RETENTION_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Visitors moved per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would move.")
+        parser.add_argument("--optimize", action="store_true", help="Rebuild the live tables afterwards (MySQL) to release freed pages.")
+
+    def handle(self, *args, **options):
+        if options["retention_days"] is not None and options["retention_days"] < 1:
+            raise CommandError("--retention-days must be at least 1.")
+        counts = archive_visits(
+            retention_days=options["retention_days"], batch_size=options["batch_size"], dry_run=options["dry_run"],
+        )
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        self.stdout.write(
+            f"{verb} {counts['visitors']} visitors and {counts['security_logs']} security logs "
+            f"from before {counts['cutoff']}."
+        )
+        if options["optimize"] and not options["dry_run"]:
+            if optimize_tables():
+                self.stdout.write(self.style.SUCCESS("Optimized the live tables."))
+            else:
+                self.stdout.write("Table optimization only applies to MySQL; skipped.")
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import SCENARIOS, compare_reports, load_report, run_benchmark, save_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a realistic traffic mix against every API route and report p50/p95/p99 latency, "
+        "queries per request and peak memory. Seed the database first with `seed_society`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Weighted requests after one pass over every scenario.")
+        parser.add_argument("--warmup", type=int, default=1, help="Untimed requests per scenario before measuring.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the traffic mix.")
+        parser.add_argument("--password", default="password", help="Password of the seeded users (used by the login scenario).")
+        parser.add_argument("--host", default="localhost", help="Host header; must be allowed by ALLOWED_HOSTS.")
+        parser.add_argument("--cold", action="store_true", help="Clear the response and token caches before every request.")
+        parser.add_argument("--only", nargs="*", help=f"Scenarios to run: {', '.join(scenario.name for scenario in SCENARIOS)}.")
+        parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+        parser.add_argument("--save", help="Write the report to this JSON file (a baseline).")
+        parser.add_argument("--compare", help="Compare against a saved baseline and fail on regressions.")
+        parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95/memory growth in percent.")
+
+    def handle(self, *args, **options):
+        try:
+            report = run_benchmark(
+                requests=options["requests"], warmup=options["warmup"], seed=options["seed"],
+                password=options["password"], host=options["host"], cold=options["cold"],
+                only=options["only"], memory=not options["no_memory"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        header = f"{'endpoint':<26} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KB':>9}  statuses"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+        for name, stats in rows:
+            statuses = " ".join(f"{code}x{count}" for code, count in sorted(stats["statuses"].items()))
+            self.stdout.write(
+                f"{name:<26} {stats['count']:>5} {stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9} "
+                f"{stats['mean_queries']:>8} {stats.get('peak_kb', ''):>9}  {statuses}"
+            )
+
+        if options["save"]:
+            save_report(report, options["save"])
+            self.stdout.write(self.style.SUCCESS(f"Saved report to {options['save']}."))
+
+        if options["compare"]:
+            regressions = compare_reports(load_report(options["compare"]), report, threshold=options["threshold"])
+            if regressions:
+                raise CommandError("Regressions against baseline:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}."))
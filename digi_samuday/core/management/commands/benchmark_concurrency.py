@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import CONCURRENT_SCENARIOS, compare_throughput, load_report, run_concurrency_benchmark, save_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the read endpoints with concurrent clients through the sync (WSGI) or async (ASGI) "
+        "views and report throughput and p50/p95/p99 latency. Seed the database first with `seed_society`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=["wsgi", "asgi", "both"], default="both", help="Deployment to simulate.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once.")
+        parser.add_argument("--requests", type=int, default=400, help="Requests per mode.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the traffic mix.")
+        parser.add_argument("--host", default="localhost", help="Host header; must be allowed by ALLOWED_HOSTS.")
+        parser.add_argument("--only", nargs="*", help=f"Scenarios to run: {', '.join(CONCURRENT_SCENARIOS)}.")
+        parser.add_argument("--save", help="Write the report(s) to this JSON file.")
+        parser.add_argument("--compare", help="Compare the last mode against a saved report and fail on regressions.")
+        parser.add_argument("--threshold", type=float, default=10.0, help="Allowed throughput loss / p95 growth in percent.")
+
+    def handle(self, *args, **options):
+        modes = ["wsgi", "asgi"] if options["mode"] == "both" else [options["mode"]]
+        reports = {}
+        try:
+            for mode in modes:
+                reports[mode] = run_concurrency_benchmark(
+                    mode=mode, concurrency=options["concurrency"], requests=options["requests"],
+                    seed=options["seed"], host=options["host"], only=options["only"],
+                )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        header = f"{'mode':<6} {'endpoint':<22} {'n':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for mode, report in reports.items():
+            rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+            for name, stats in rows:
+                statuses = " ".join(f"{code}x{count}" for code, count in sorted(stats["statuses"].items()))
+                self.stdout.write(
+                    f"{mode:<6} {name:<22} {stats['count']:>5} {stats.get('throughput_rps', ''):>8} "
+                    f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}  {statuses}"
+                )
+
+        if len(reports) == 2:
+            wsgi, asgi = reports["wsgi"]["overall"], reports["asgi"]["overall"]
+            self.stdout.write(f"ASGI/WSGI throughput: {asgi['throughput_rps'] / wsgi['throughput_rps']:.2f}x")
+
+        if options["save"]:
+            save_report(reports if len(reports) > 1 else reports[modes[0]], options["save"])
+            self.stdout.write(self.style.SUCCESS(f"Saved report to {options['save']}."))
+
+        if options["compare"]:
+            baseline = load_report(options["compare"])
+            if "overall" not in baseline:  # A saved `--mode both` report; compare like with like
+                baseline = baseline[modes[-1]]
+            regressions = compare_throughput(baseline, reports[modes[-1]], threshold=options["threshold"])
+            if regressions:
+                raise CommandError("Regressions against baseline:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from core.benchmark import run_login_benchmark, save_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure wall time and CPU time per login (token-only, with session, wrong password, "
+        "rate-limited) at one or more PBKDF2 costs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20, help="Timed logins per outcome.")
+        parser.add_argument("--iterations", type=int, nargs="*", help="PBKDF2 costs to compare (default: PASSWORD_PBKDF2_ITERATIONS).")
+        parser.add_argument("--host", default="localhost", help="Host header; must be allowed by ALLOWED_HOSTS.")
+        parser.add_argument("--save", help="Write the report(s) to this JSON file.")
+
+    def handle(self, *args, **options):
+        reports = [
+            run_login_benchmark(requests=options["requests"], iterations=iterations, host=options["host"])
+            for iterations in options["iterations"] or [None]
+        ]
+
+        header = f"{'hasher':<14} {'iterations':>10} {'outcome':<15} {'n':>4} {'p50 ms':>9} {'p95 ms':>9} {'cpu ms':>8} {'per cpu-s':>9}  statuses"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for report in reports:
+            meta = report["meta"]
+            for case, stats in report["cases"].items():
+                statuses = " ".join(f"{code}x{count}" for code, count in sorted(stats["statuses"].items()))
+                self.stdout.write(
+                    f"{meta['hasher']:<14} {str(meta['iterations'] or '-'):>10} {case:<15} {stats['count']:>4} "
+                    f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['cpu_ms']:>8} {str(stats['per_cpu_second']):>9}  {statuses}"
+                )
+
+        if options["save"]:
+            save_report(reports if len(reports) > 1 else reports[0], options["save"])
+            self.stdout.write(self.style.SUCCESS(f"Saved report to {options['save']}."))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from core.benchmark import SERIALIZER_TARGETS, run_serializer_benchmark, save_report
+
+
+class Command(BaseCommand):
+    help = "Compare rows/sec of the DRF serializers and the fast read path on the complaint, payment and security-log lists."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000, help="Rows per list (the newest ones).")
+        parser.add_argument("--iterations", type=int, default=5, help="Runs per path; the best one counts.")
+        parser.add_argument("--only", nargs="*", choices=sorted(SERIALIZER_TARGETS), help="Lists to measure.")
+        parser.add_argument("--save", help="Write the report to this JSON file.")
+
+    def handle(self, *args, **options):
+        report = run_serializer_benchmark(rows=options["rows"], iterations=options["iterations"], only=options["only"])
+
+        self.stdout.write(f"Encoder: {report['meta']['encoder']}")
+        header = f"{'list':<14} {'path':<5} {'rows':>6} {'total ms':>9} {'rows/s':>9} {'ser. ms':>9} {'ser. rows/s':>11}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, results in report["targets"].items():
+            for path in ("drf", "fast"):
+                stats = results[path]
+                self.stdout.write(
+                    f"{name:<14} {path:<5} {stats['rows']:>6} {stats['total_ms']:>9} {stats['rows_per_sec']:>9} "
+                    f"{stats['serialize_ms']:>9} {stats['serialize_rows_per_sec']:>11}"
+                )
+            line = f"{name:<14} speedup x{results['speedup']} (serialize x{results['serialize_speedup']})"
+            if results["identical"]:
+                self.stdout.write(line)
+            else:
+                self.stdout.write(self.style.ERROR(f"{line}; output differs from the DRF serializer"))
+
+        if options["save"]:
+            save_report(report, options["save"])
+            self.stdout.write(self.style.SUCCESS(f"Saved report to {options['save']}."))
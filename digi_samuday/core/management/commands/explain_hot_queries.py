@@ -0,0 +1,96 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from core.models import Complaint, FacilityBooking, Notice, Payment, Resident, SecurityLog, Visitor
+
+
+def hot_queries(resident_id, facility_name):
+    """
+    The filter/order patterns behind the busiest API screens, as unevaluated querysets.
+    """
+    now = timezone.now()
+    return {
+        "residents_page": Resident.objects.order_by("-date_joined", "-pk")[:50],
+        "visitors_page": Visitor.objects.order_by("-check_in", "-pk")[:50],
+        "security_logs_page": SecurityLog.objects.order_by("-entry_time", "-pk")[:50],
+        "visitors_inside": SecurityLog.objects.filter(exit_time__isnull=True).order_by("-entry_time")[:50],
+        "notices_page": Notice.objects.order_by("-created_at", "-pk")[:50],
+        "complaints_by_status": Complaint.objects.filter(status="open").order_by("-created_at", "-pk")[:50],
+        "resident_complaints": Complaint.objects.filter(resident_id=resident_id).order_by("-created_at", "-pk")[:50],
+        "resident_complaint_counts": (
+            Complaint.objects.filter(resident_id=resident_id).values("status").annotate(total=Count("id")).order_by()
+        ),
+        "pending_payments": Payment.objects.filter(payment_status="pending").order_by("-payment_date", "-pk")[:50],
+        "resident_pending_dues": (
+            Payment.objects.filter(resident_id=resident_id, payment_status="pending").order_by().values("resident_id")
+            .annotate(total=Sum("amount"), count=Count("id"))
+        ),
+        "pending_bookings": FacilityBooking.objects.filter(status="pending").order_by("start_time")[:50],
+        # List filters (`?status=`, `?facility=`, `?from=`/`?to=`) on the default newest-first pages
+        "bookings_by_status": FacilityBooking.objects.filter(status="pending").order_by("-created_at", "-pk")[:50],
+        "bookings_by_facility": FacilityBooking.objects.filter(facility_name=facility_name).order_by("-created_at", "-pk")[:50],
+        "payments_in_range": (
+            Payment.objects.filter(payment_status="completed", payment_date__gte=now - timedelta(days=30))
+            .order_by("-payment_date", "-pk")[:50]
+        ),
+        "complaint_counts_by_status": (
+            Complaint.objects.filter(status__in=["open", "in_progress"]).order_by().values("status").annotate(total=Count("id"))
+        ),
+        "resident_upcoming_bookings": (
+            FacilityBooking.objects.filter(resident_id=resident_id, status__in=["pending", "approved"], start_time__gte=now)
+            .order_by("start_time")[:5]
+        ),
+        "booking_conflicts": FacilityBooking.objects.filter(
+            facility_name=facility_name, status="approved", start_time__lt=now, end_time__gt=now,
+        ).values_list("id", flat=True),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plan and median run time of each hot query. Run it against a seeded "
+        "database before and after `migrate core` to compare plans with and without the indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", nargs="*", help="Names of the queries to explain (default: all).")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query.")
+        parser.add_argument("--analyze", action="store_true", help="Use EXPLAIN ANALYZE (MySQL 8.0.18+, PostgreSQL).")
+        parser.add_argument("--output", help="Also write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        resident_id = Resident.objects.filter(role="resident").values_list("id", flat=True).first()
+        facility_name = FacilityBooking.objects.values_list("facility_name", flat=True).first() or ""
+        queries = hot_queries(resident_id, facility_name)
+
+        names = options["only"] or list(queries)
+        unknown = set(names) - set(queries)
+        if unknown:
+            raise CommandError(f"Unknown queries: {', '.join(sorted(unknown))}. Choose from: {', '.join(queries)}.")
+
+        explain_options = {"analyze": True} if options["analyze"] else {}
+        results = {}
+        for name in names:
+            queryset = queries[name]
+            plan = queryset.explain(**explain_options)
+            timings = []
+            for _ in range(max(options["repeat"], 1)):
+                started = time.perf_counter()
+                list(queryset.all())  # Fresh clone, so the result cache is not reused
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = {"median_ms": round(statistics.median(timings), 3), "plan": plan}
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}  ({results[name]['median_ms']} ms)"))
+            self.stdout.write(plan)
+            self.stdout.write("")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} plan(s) to {options['output']}."))
@@ -0,0 +1,42 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.onboarding import UploadError, import_residents, parse_upload
+
+
+class Command(BaseCommand):
+    help = (
+        "Register residents from a CSV or JSON file (columns: username, password, email, first_name, "
+        "last_name, phone_number, apartment_no, role). Invalid rows are listed and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON file to import.")
+        parser.add_argument("--dry-run", action="store_true", help="Only validate the file.")
+        parser.add_argument("--allow-shared-apartments", action="store_true", help="Accept several residents per apartment.")
+        parser.add_argument("--workers", type=int, help="Password-hashing processes (default: RESIDENT_IMPORT_WORKERS or every CPU).")
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows per INSERT.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        try:
+            rows = parse_upload(path.read_bytes(), path.name)
+        except (OSError, UploadError) as e:
+            raise CommandError(str(e))
+
+        started = time.perf_counter()
+        created, errors = import_residents(
+            rows, dry_run=options["dry_run"], allow_shared_apartments=options["allow_shared_apartments"],
+            batch_size=options["batch_size"], workers=options["workers"],
+        )
+        for index, row_errors in errors.items():
+            details = "; ".join(f"{field}: {message}" for field, message in row_errors.items())
+            self.stdout.write(f"row {index}: {details}")
+        verb = "Would create" if options["dry_run"] else "Created"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(created)} of {len(rows)} residents in {time.perf_counter() - started:.1f} s."
+        ))
+        if errors and not created:
+            raise CommandError("No residents were imported.")
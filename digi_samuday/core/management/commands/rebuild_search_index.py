@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.search import get_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the complaint and notice full-text index from the database. Run it once after "
+        "deploying search, and to repair the index after restoring a backup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows read and indexed per batch.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = get_search_index().rebuild(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} documents in {time.perf_counter() - started:.1f} s."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ledger import rebuild_ledger, reconcile_ledger
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the payment ledger against the payments table (run it nightly). Exits with an error "
+        "when totals have drifted, e.g. after payments were edited outside the API, unless --fix is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Recompute every mismatched ledger row.")
+        parser.add_argument("--rebuild", action="store_true", help="Recreate the whole ledger (first deploy, or after a restore).")
+        parser.add_argument("--show", type=int, default=20, help="Mismatches to list.")
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            rows = rebuild_ledger()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt the ledger: {rows} resident-month rows."))
+            return
+
+        mismatches = reconcile_ledger(fix=options["fix"])
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("Payment ledger matches the payments table."))
+            return
+        for item in mismatches[:options["show"]]:
+            self.stdout.write(
+                f"resident {item['resident_id']} {item['month']:%Y-%m} {item['field']}: "
+                f"ledger {item['actual']}, payments {item['expected']}"
+            )
+        rows = len({(item["resident_id"], item["month"]) for item in mismatches})
+        if options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {rows} ledger rows."))
+        else:
+            raise CommandError(f"{rows} ledger rows differ from the payments table; run with --fix to repair them.")
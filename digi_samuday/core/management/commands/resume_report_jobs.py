@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.jobs import resume_report_jobs
+
+
+class Command(BaseCommand):
+    help = "Re-run report jobs that were left queued or running when a worker stopped."
+
+    def handle(self, *args, **options):
+        count = resume_report_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Resumed {count} report job(s)."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.seeding import seed_society
+
+
+class Command(BaseCommand):
+    help = "Fill the database with a synthetic society (residents, visitors, logs, payments, complaints, bookings)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--residents", type=int, default=200, help="Number of residents.")
+        parser.add_argument("--years", type=int, default=1, help="Years of history to generate.")
+        parser.add_argument("--guards", type=int, default=4, help="Number of security guards.")
+        parser.add_argument("--facilities", type=int, default=5, help="Number of facilities.")
+        parser.add_argument("--visitors-per-year", type=int, default=24, help="Visitors per resident per year.")
+        parser.add_argument("--complaints-per-year", type=int, default=3, help="Complaints per resident per year.")
+        parser.add_argument("--bookings-per-year", type=int, default=6, help="Bookings per resident per year.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk insert.")
+        parser.add_argument("--password", default="password", help="Password shared by every seeded user.")
+        parser.add_argument("--seed", type=int, help="Random seed, for a reproducible dataset.")
+
+    def handle(self, *args, **options):
+        counts = seed_society(
+            residents=options["residents"], years=options["years"], guards=options["guards"],
+            facilities=options["facilities"], visitors_per_year=options["visitors_per_year"],
+            complaints_per_year=options["complaints_per_year"], bookings_per_year=options["bookings_per_year"],
+            batch_size=options["batch_size"], password=options["password"], seed=options["seed"],
+        )
+        for name, count in counts.items():
+            self.stdout.write(f"{name}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Seeded {sum(counts.values())} rows."))
@@ -0,0 +1,181 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+
+# Default bucket upper bounds (Prometheus `le`), chosen for this API's range of values
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram keyed by a tuple of label values.
+
+    - `observe` costs one binary search and a few additions under a lock.
+    """
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            labels = dict(zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": str(bound)}, cumulative
+            yield f"{self.name}_sum", labels, values[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        lines += [format_sample(name, labels, value) for name, labels, value in self.samples()]
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter keyed by a tuple of label values.
+    """
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines += [
+            format_sample(self.name, dict(zip(self.labels, label_values)), value)
+            for label_values, value in sorted(values.items())
+        ]
+        return lines
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_sample(name, labels, value):
+    if labels:
+        name = name + "{" + ",".join(f'{key}="{escape_label(label)}"' for key, label in labels.items()) + "}"
+    return f"{name} {round(value, 6) if isinstance(value, float) else value}"
+
+
+REQUEST_LABELS = ("view", "method")
+
+request_duration = Histogram(
+    "digisamuday_request_duration_seconds", "Wall time spent handling a request.", REQUEST_LABELS, DURATION_BUCKETS,
+)
+db_queries = Histogram(
+    "digisamuday_request_db_queries", "Database queries run per request.", REQUEST_LABELS, QUERY_BUCKETS,
+)
+db_duration = Histogram(
+    "digisamuday_request_db_seconds", "Time spent in database queries per request.", REQUEST_LABELS, DURATION_BUCKETS,
+)
+serializer_duration = Histogram(
+    "digisamuday_request_serializer_seconds", "Time spent in serializer to_representation per request.", REQUEST_LABELS, DURATION_BUCKETS,
+)
+response_size = Histogram(
+    "digisamuday_response_size_bytes", "Size of non-streaming response bodies.", REQUEST_LABELS, SIZE_BUCKETS,
+)
+requests_total = Counter(
+    "digisamuday_requests_total", "Requests handled, by response status.", REQUEST_LABELS + ("status",),
+)
+slow_requests_total = Counter(
+    "digisamuday_slow_requests_total", "Requests slower than SLOW_REQUEST_THRESHOLD_MS.", REQUEST_LABELS,
+)
+
+REGISTRY = [request_duration, db_queries, db_duration, serializer_duration, response_size, requests_total, slow_requests_total]
+
+
+def render_metrics():
+    """
+    Render every metric of this process in the Prometheus text exposition format.
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+class RequestMetrics:
+    """
+    Measurements collected while one request is handled.
+
+    - Also counts and times every query `record_query` hands it (an `execute_wrapper`),
+      keeping up to `sql_limit` statements for the slow-request log.
+    """
+    def __init__(self, sql_limit):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.statements = []
+        self.sql_limit = sql_limit
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            if len(self.statements) < self.sql_limit:
+                self.statements.append((elapsed, sql))
+
+
+current_request = ContextVar("current_request_metrics", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database `execute_wrapper` that hands each query to the request being handled, if any.
+
+    - Installed once on every connection (`instrument_connection`); the request is found
+      through `current_request`, which `sync_to_async` carries into its worker threads,
+      so queries count wherever the ORM runs them.
+    """
+    request_metrics = current_request.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    return request_metrics(execute, sql, params, many, context)
+
+
+def instrument_connection(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def record_serializer_time(seconds):
+    """
+    Add serializer time to the request being handled, if any.
+    """
+    metrics = current_request.get()
+    if metrics is not None:
+        metrics.serializer_time += seconds
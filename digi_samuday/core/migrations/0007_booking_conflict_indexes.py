@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-17 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_reportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='facility',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='facilitybooking',
+            index=models.Index(fields=['facility_name', 'start_time', 'end_time', 'status'], name='booking_facility_time_idx'),
+        ),
+    ]
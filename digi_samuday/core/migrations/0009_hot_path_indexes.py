@@ -0,0 +1,86 @@
+# Generated by Django 5.1.7 on 2026-10-17 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0008_updated_at_columns'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['resident', 'status', 'created_at'], name='complaint_resident_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['status', 'created_at'], name='complaint_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['created_at'], name='complaint_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facilitybooking',
+            index=models.Index(fields=['status', 'start_time'], name='booking_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facilitybooking',
+            index=models.Index(fields=['resident', 'status', 'start_time'], name='booking_resident_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facilitybooking',
+            index=models.Index(fields=['created_at'], name='booking_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['created_at'], name='notice_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['resident', 'payment_status', 'payment_date'], name='payment_resident_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['payment_status', 'payment_date'], name='payment_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['payment_date'], name='payment_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(fields=['date_joined'], name='resident_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(fields=['apartment_no'], name='resident_apartment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(fields=['role', 'status'], name='resident_role_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='securitylog',
+            index=models.Index(fields=['entry_time'], name='securitylog_entry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='securitylog',
+            index=models.Index(fields=['exit_time', 'entry_time'], name='securitylog_exit_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='securitylog',
+            index=models.Index(condition=models.Q(('exit_time__isnull', True)), fields=['entry_time'], name='securitylog_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitor',
+            index=models.Index(fields=['check_in'], name='visitor_check_in_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitor',
+            index=models.Index(fields=['resident', 'check_in'], name='visitor_resident_idx'),
+        ),
+    ]
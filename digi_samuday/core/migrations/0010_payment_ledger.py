@@ -0,0 +1,66 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+COLUMNS = {'completed': 'collected', 'pending': 'pending', 'rejected': 'rejected'}
+
+
+def backfill_ledger(apps, schema_editor):
+    """
+    Fill the ledger from existing payments, grouped like `core.ledger.expected_rows`.
+    """
+    Payment = apps.get_model('core', 'Payment')
+    PaymentLedger = apps.get_model('core', 'PaymentLedger')
+    grouped = (
+        Payment.objects.order_by()
+        .annotate(month=TruncMonth('payment_date', output_field=models.DateField()))
+        .values('resident_id', 'month', 'payment_status')
+        .annotate(count=Count('id'), total=Sum('amount'))
+    )
+    rows = {}
+    for group in grouped:
+        column = COLUMNS.get(group['payment_status'])
+        if column is None:
+            continue
+        row = rows.setdefault((group['resident_id'], group['month']), {})
+        row[f'{column}_count'] = group['count']
+        row[f'{column}_total'] = group['total']
+    PaymentLedger.objects.bulk_create(
+        [PaymentLedger(resident_id=resident_id, month=month, **values) for (resident_id, month), values in rows.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('collected_count', models.IntegerField(default=0)),
+                ('collected_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('pending_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('rejected_count', models.IntegerField(default=0)),
+                ('rejected_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('resident', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['month'], name='ledger_month_idx')],
+                'constraints': [models.UniqueConstraint(fields=('resident', 'month'), name='ledger_resident_month_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
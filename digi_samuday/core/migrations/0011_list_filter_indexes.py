@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_payment_ledger'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='payment_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('rejected', 'Rejected')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='facilitybooking',
+            index=models.Index(fields=['status', 'created_at'], name='booking_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facilitybooking',
+            index=models.Index(fields=['facility_name', 'created_at'], name='booking_facility_created_idx'),
+        ),
+    ]
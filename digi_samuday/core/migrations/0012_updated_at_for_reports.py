@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resident',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='securitylog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='visitor',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.db import models
 from django.conf import settings
@@ -22,10 +24,18 @@ class Resident(AbstractUser):
     phone_number = models.CharField(max_length=15)  # Contact number
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)  # User role
     status = models.CharField(max_length=10, choices=[('active', 'Active'), ('inactive', 'Inactive')], default='active')
+    updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
 
     groups = models.ManyToManyField(Group, related_name="resident_group_set", blank=True)  # Group permissions
     user_permissions = models.ManyToManyField(Permission, related_name="resident_permission_set", blank=True)  # User permissions
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["date_joined"], name="resident_joined_idx"),  # Resident list pagination
+            models.Index(fields=["apartment_no"], name="resident_apartment_idx"),  # Lookup by apartment
+            models.Index(fields=["role", "status"], name="resident_role_status_idx"),  # Role-filtered lists
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.role})"
 
@@ -38,8 +48,15 @@ class Visitor(models.Model):
     vehicle_number = models.CharField(max_length=20, blank=True, null=True)  # Optional vehicle number
     check_in = models.DateTimeField(auto_now_add=True)  # Check-in time
     check_out = models.DateTimeField(null=True, blank=True)  # Check-out time
+    updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
     resident = models.ForeignKey(Resident, on_delete=models.CASCADE)  # Resident being visited
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["check_in"], name="visitor_check_in_idx"),  # Visitor list pagination
+            models.Index(fields=["resident", "check_in"], name="visitor_resident_idx"),  # A resident's visitors
+        ]
+
 class Complaint(models.Model):
     """
     Model representing complaints filed by residents.
@@ -51,6 +68,13 @@ class Complaint(models.Model):
     updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
     resident = models.ForeignKey(Resident, on_delete=models.CASCADE)  # Resident who filed the complaint
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["resident", "status", "created_at"], name="complaint_resident_idx"),  # A resident's complaints and counts
+            models.Index(fields=["status", "created_at"], name="complaint_status_idx"),  # Admin screens filtered by status
+            models.Index(fields=["created_at"], name="complaint_created_idx"),  # Complaint list pagination
+        ]
+
 class Payment(models.Model):
     """
     Model representing payment transactions made by residents.
@@ -59,19 +83,51 @@ class Payment(models.Model):
     payment_date = models.DateTimeField(auto_now_add=True)  # Payment timestamp
     payment_status = models.CharField(
         max_length=20, 
-        choices=[('pending', 'Pending'), ('completed', 'Completed')], 
+        choices=[('pending', 'Pending'), ('completed', 'Completed'), ('rejected', 'Rejected')], 
         default='pending'
     )  # Payment status
     payment_method = models.CharField(max_length=50)  # Payment method
+    updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
     resident = models.ForeignKey(Resident, on_delete=models.CASCADE)  # Resident making the payment
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["resident", "payment_status", "payment_date"], name="payment_resident_idx"),  # A resident's dues
+            models.Index(fields=["payment_status", "payment_date"], name="payment_status_idx"),  # Approval screen
+            models.Index(fields=["payment_date"], name="payment_date_idx"),  # Payment list pagination
+        ]
+
+class PaymentLedger(models.Model):
+    """
+    Model holding the running payment totals of one resident for one calendar month.
+    Maintained by the payment API as payments are made and decided (see `core/ledger.py`).
+    """
+    resident = models.ForeignKey(Resident, on_delete=models.CASCADE)  # Resident the totals belong to
+    month = models.DateField()  # First day of the month the payments were made in
+    collected_count = models.IntegerField(default=0)  # Completed payments
+    collected_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # Sum of completed payments
+    pending_count = models.IntegerField(default=0)  # Payments awaiting approval
+    pending_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # Sum of pending payments
+    rejected_count = models.IntegerField(default=0)  # Rejected payments
+    rejected_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # Sum of rejected payments
+    updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["resident", "month"], name="ledger_resident_month_uniq"),  # One row per resident and month
+        ]
+        indexes = [
+            models.Index(fields=["month"], name="ledger_month_idx"),  # Society-wide monthly figures
+        ]
+
 class Facility(models.Model):
     """
     Model representing facilities available in the society.
     """
-    name = models.CharField(max_length=100)  # Facility name
+    name = models.CharField(max_length=100, db_index=True)  # Facility name (bookings reference it by name)
     description = models.TextField()  # Facility details
     availability_status = models.CharField(max_length=20, choices=[('available', 'Available'), ('booked', 'Booked')], default='available')  # Booking status
+    updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
 
 class FacilityBooking(models.Model):
     """
@@ -89,6 +145,18 @@ class FacilityBooking(models.Model):
     end_time = models.DateTimeField(null=True, blank=True)  # Booking end time
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")  # Booking status
     created_at = models.DateTimeField(auto_now_add=True)  # Timestamp of booking request
+    updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
+
+    class Meta:
+        indexes = [
+            # Conflict checks and availability: range scan per facility over approved slots
+            models.Index(fields=["facility_name", "start_time", "end_time", "status"], name="booking_facility_time_idx"),
+            models.Index(fields=["status", "start_time"], name="booking_status_idx"),  # Approval screen
+            models.Index(fields=["resident", "status", "start_time"], name="booking_resident_idx"),  # Upcoming bookings
+            models.Index(fields=["created_at"], name="booking_created_idx"),  # Booking list pagination
+            models.Index(fields=["status", "created_at"], name="booking_status_created_idx"),  # List filtered by status
+            models.Index(fields=["facility_name", "created_at"], name="booking_facility_created_idx"),  # List filtered by facility
+        ]
 
     def __str__(self):
         return f"{self.facility_name} - {self.resident.username} ({self.status})"
@@ -101,6 +169,12 @@ class Notice(models.Model):
     content = models.TextField()  # Notice details
     posted_by = models.ForeignKey(Resident, on_delete=models.CASCADE, limit_choices_to={'role': 'admin'})  # Admin posting the notice
     created_at = models.DateTimeField(auto_now_add=True)  # Timestamp of notice creation
+    updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="notice_created_idx"),  # Newest-first notice board
+        ]
 
 class SecurityLog(models.Model):
     """
@@ -109,4 +183,41 @@ class SecurityLog(models.Model):
     visitor = models.ForeignKey(Visitor, on_delete=models.CASCADE)  # Visitor being logged
     entry_time = models.DateTimeField(auto_now_add=True)  # Entry timestamp
     exit_time = models.DateTimeField(null=True, blank=True)  # Exit timestamp
-    guard_name = models.CharField(max_length=100)  # Name of the security guard logging the entry
\ No newline at end of file
+    guard_name = models.CharField(max_length=100)  # Name of the security guard logging the entry
+    updated_at = models.DateTimeField(auto_now=True)  # Update timestamp
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["entry_time"], name="securitylog_entry_idx"),  # Newest-first log pagination
+            # Visitors still inside. MySQL has no partial indexes, so the composite index
+            # serves `exit_time IS NULL ORDER BY entry_time` there; backends that support
+            # conditions (PostgreSQL, SQLite) also get the smaller partial index.
+            models.Index(fields=["exit_time", "entry_time"], name="securitylog_exit_idx"),
+            models.Index(fields=["entry_time"], name="securitylog_open_idx", condition=models.Q(exit_time__isnull=True)),
+        ]
+
+class ReportJob(models.Model):
+    """
+    Model representing a background CSV export requested by an admin.
+    Finished files are stored on disk under a content-addressed name (`cache_key`).
+    """
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # Job id returned to the client
+    report_type = models.CharField(max_length=20)  # complaints, payments, bookings or visitors
+    params = models.JSONField(default=dict, blank=True)  # Normalized filters (from, to, status, compress)
+    cache_key = models.CharField(max_length=64, db_index=True)  # SHA-256 of report, filters and data fingerprint
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")  # Job state
+    cached = models.BooleanField(default=False)  # Answered from an existing export file
+    error = models.TextField(blank=True)  # Failure message, if any
+    requested_by = models.ForeignKey(Resident, on_delete=models.SET_NULL, null=True, blank=True)  # Admin who requested the export
+    created_at = models.DateTimeField(auto_now_add=True)  # Submission timestamp
+    finished_at = models.DateTimeField(null=True, blank=True)  # Completion timestamp
+
+    def __str__(self):
+        return f"{self.report_type} report ({self.status})"
@@ -0,0 +1,197 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower, Trim, Upper
+
+from .checkin import invalidate_resident_directory
+from .models import Resident
+from .passwords import hash_passwords
+
+# Columns read on import and written on export, in export order
+FIELDS = ["username", "password", "email", "first_name", "last_name", "phone_number", "apartment_no", "role"]
+REQUIRED = ["username", "password", "phone_number", "apartment_no"]
+EXPORT_FIELDS = ["id", "username", "email", "first_name", "last_name", "phone_number", "apartment_no", "role", "status", "date_joined"]
+LOOKUP_CHUNK = 500  # Values per IN (...) lookup
+
+
+class UploadError(ValueError):
+    """
+    The upload itself cannot be read (not a malformed row).
+    """
+
+
+def parse_upload(content, filename=""):
+    """
+    Read residents from CSV or JSON text into a list of dicts.
+
+    - CSV headers may be field names or the spaced, capitalised export headers
+      (`Apartment No`); unknown columns (e.g. `id` from an export) are ignored.
+    - JSON is a list of objects, or `{"residents": [...]}`.
+    """
+    text = content.decode("utf-8-sig") if isinstance(content, bytes) else content
+    if filename.lower().endswith(".json") or text.lstrip()[:1] in ("[", "{"):
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise UploadError(f"Invalid JSON: {e}")
+        return rows_from_json(data)
+
+    reader = csv.reader(io.StringIO(text))
+    headers = [header.strip().lower().replace(" ", "_") for header in next(reader, [])]
+    if "username" not in headers:
+        raise UploadError("The CSV needs a header row with at least a username column.")
+    return [
+        {header: value for header, value in zip(headers, values) if header in FIELDS}
+        for values in reader if any(value.strip() for value in values)
+    ]
+
+
+def rows_from_json(data):
+    if isinstance(data, dict):
+        data = data.get("residents")
+    if not isinstance(data, list):
+        raise UploadError('Send a list of residents, or {"residents": [...]}.')
+    return data
+
+
+def clean_row(row):
+    """
+    Check one row on its own; return `(fields, None)` or `(None, errors)`.
+    """
+    if not isinstance(row, dict):
+        return None, {"error": "Each resident must be an object."}
+    fields = {name: str(row.get(name) or "").strip() for name in FIELDS}
+    fields["password"] = str(row.get("password") or "")  # Kept as typed
+    fields["role"] = fields["role"] or Resident.RESIDENT
+
+    errors = {name: "This field is required." for name in REQUIRED if not fields[name]}
+    for name, value in fields.items():
+        max_length = Resident._meta.get_field(name).max_length
+        if name not in errors and name != "password" and max_length and len(value) > max_length:
+            errors[name] = f"Ensure this field has no more than {max_length} characters."
+    checks = [("username", UnicodeUsernameValidator()), ("email", validate_email)]
+    for name, validator in checks:
+        if fields[name] and name not in errors:
+            try:
+                validator(fields[name])
+            except DjangoValidationError as e:
+                errors[name] = e.messages[0]
+    if fields["role"] not in dict(Resident.ROLE_CHOICES):
+        errors["role"] = f"Invalid role. Use one of: {', '.join(dict(Resident.ROLE_CHOICES))}."
+    return (None, errors) if errors else (fields, None)
+
+
+def apartment_key(apartment_no):
+    return apartment_no.strip().upper()
+
+
+def chunked(values):
+    values = list(values)
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        yield values[start:start + LOOKUP_CHUNK]
+
+
+def clean_rows(rows, allow_shared_apartments=False):
+    """
+    Validate a whole upload; return `(valid, errors)`.
+
+    - `valid` is a list of `(index, fields)`; `errors` maps a row index to its field errors.
+    - Rows are checked on their own first; uniqueness is then checked across the set:
+      usernames (case-insensitively) against each other and the database, and the
+      apartments of `resident` rows against each other and the active residents, with
+      one lookup query per 500 values instead of one per row.
+    - `allow_shared_apartments` lets several residents register the same flat.
+    """
+    valid, errors = [], {}
+    for index, row in enumerate(rows):
+        fields, row_errors = clean_row(row)
+        if row_errors:
+            errors[str(index)] = row_errors
+        else:
+            valid.append((index, fields))
+
+    usernames = {fields["username"].lower() for _, fields in valid}
+    taken = set()
+    for chunk in chunked(usernames):
+        taken.update(
+            Resident.objects.annotate(key=Lower("username")).filter(key__in=chunk).values_list("key", flat=True)
+        )
+    occupied = set()
+    if not allow_shared_apartments:
+        apartments = {apartment_key(fields["apartment_no"]) for _, fields in valid if fields["role"] == Resident.RESIDENT}
+        for chunk in chunked(apartments):
+            occupied.update(
+                Resident.objects.filter(role=Resident.RESIDENT, status="active")
+                .annotate(key=Upper(Trim("apartment_no"))).filter(key__in=chunk).values_list("key", flat=True)
+            )
+
+    first_username, first_apartment, unique = {}, {}, []
+    for index, fields in valid:
+        row_errors = {}
+        username = fields["username"].lower()
+        if username in taken:
+            row_errors["username"] = "A user with that username already exists."
+        elif username in first_username:
+            row_errors["username"] = f"Duplicate of row {first_username[username]}."
+        apartment = apartment_key(fields["apartment_no"])
+        if not allow_shared_apartments and fields["role"] == Resident.RESIDENT:
+            if apartment in occupied:
+                row_errors["apartment_no"] = "This apartment already has an active resident."
+            elif apartment in first_apartment:
+                row_errors["apartment_no"] = f"Same apartment as row {first_apartment[apartment]}."
+        if row_errors:
+            errors[str(index)] = row_errors
+            continue
+        first_username[username] = index
+        if fields["role"] == Resident.RESIDENT:
+            first_apartment.setdefault(apartment, index)
+        unique.append((index, fields))
+    return unique, errors
+
+
+def import_residents(rows, dry_run=False, allow_shared_apartments=False, batch_size=500, workers=None):
+    """
+    Validate and create residents in bulk; return `(created, errors)`.
+
+    - `created` lists `(index, username)` pairs; invalid rows are reported under
+      `errors` by index and skipped, the rest are created all-or-nothing.
+    - Passwords are hashed in a process pool before the transaction opens, then the
+      rows go in with `bulk_create` in `batch_size` batches.
+    - If a username is registered meanwhile, the upload is validated and written once more.
+    - With `dry_run`, rows are only validated and `created` lists what would be created.
+    """
+    valid, errors = clean_rows(rows, allow_shared_apartments)
+    if dry_run or not valid:
+        return [(index, fields["username"]) for index, fields in valid], errors
+
+    hashed = {}
+    for attempt in range(2):
+        missing = [(index, fields["password"]) for index, fields in valid if index not in hashed]
+        hashed.update(zip([index for index, _ in missing], hash_passwords([password for _, password in missing], workers)))
+        residents = [Resident(**dict(fields, password=hashed[index])) for index, fields in valid]
+        try:
+            with transaction.atomic():
+                Resident.objects.bulk_create(residents, batch_size=batch_size)
+                transaction.on_commit(invalidate_resident_directory)  # bulk_create sends no post_save
+        except IntegrityError:
+            if attempt:
+                raise
+            valid, errors = clean_rows(rows, allow_shared_apartments)
+            if not valid:
+                return [], errors
+            continue
+        return [(index, fields["username"]) for index, fields in valid], errors
+
+
+def export_rows(queryset=None):
+    """
+    Yield residents as `EXPORT_FIELDS` tuples, id order, in chunks; the CSV re-imports
+    once a password column is added.
+    """
+    queryset = Resident.objects.all() if queryset is None else queryset
+    return queryset.order_by("id").values_list(*EXPORT_FIELDS).iterator(chunk_size=2000)
@@ -0,0 +1,261 @@
+import base64
+import binascii
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .filters import get_ordering, model_field
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on a `(timestamp, id)` pair, newest first.
+
+    - The view declares the timestamp column through `keyset_field`
+      (e.g. `created_at`, `entry_time`); the primary key breaks ties. A whitelisted
+      `?ordering=` (see `filters.get_ordering`) replaces it, in either direction.
+    - Each page is a `WHERE (field, id) < (last_field, last_id)` seek on the index,
+      so page 1000 costs the same as page 1 (no OFFSET scan).
+    - Responses carry opaque `next`/`previous` cursor links that stay stable
+      while new rows are being inserted.
+    - `?paginate=false` is an opt-in legacy mode returning the whole list as a
+      plain array, for clients that have not migrated to cursors yet.
+    - `apaginate_queryset` is the async-ORM variant for async views.
+    """
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    legacy_query_param = "paginate"
+    keyset_field = "pk"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of `queryset`, or None when the client asked for legacy mode.
+        """
+        if self.is_legacy_request(request):
+            return None
+        return self.set_page(list(self.page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async version of `paginate_queryset`, fetching the page with `async for`.
+        """
+        if self.is_legacy_request(request):
+            return None
+        return self.set_page([row async for row in self.page_queryset(queryset, request, view)])
+
+    def page_queryset(self, queryset, request, view):
+        """
+        Order, seek and slice `queryset` for the requested page.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        if view is not None:
+            self.field, self.descending = get_ordering(request, view)
+        else:
+            self.field, self.descending = self.keyset_field, True
+        self.page_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request)
+        if self.position is not None:
+            self.position = self.clean_position(queryset.model, self.position)
+
+        # Walking back (a `previous` cursor) reads the list in the opposite direction
+        if self.reverse == self.descending:
+            queryset = queryset.order_by(*self.ascending_ordering())
+            if self.position is not None:
+                queryset = queryset.filter(self.seek_filter(self.position, "gt"))
+        else:
+            queryset = queryset.order_by(*self.descending_ordering())
+            if self.position is not None:
+                queryset = queryset.filter(self.seek_filter(self.position, "lt"))
+
+        # Fetch one extra row to learn whether there is another page in this direction
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def is_legacy_request(self, request):
+        """
+        Check whether the client opted into the unpaginated legacy response.
+        """
+        value = request.query_params.get(self.legacy_query_param, "")
+        return value.lower() in ("false", "0", "no", "off")
+
+    def get_page_size(self, request):
+        """
+        Read `?page_size=` from the request, clamped to `max_page_size`.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def descending_ordering(self):
+        if self.field == "pk":
+            return ["-pk"]
+        return [f"-{self.field}", "-pk"]
+
+    def ascending_ordering(self):
+        if self.field == "pk":
+            return ["pk"]
+        return [self.field, "pk"]
+
+    def seek_filter(self, position, lookup):
+        """
+        Build the row-value comparison `(field, pk) <lookup> (value, pk)` as a Q object.
+        """
+        value, pk = position
+        if self.field == "pk":
+            return Q(**{f"pk__{lookup}": pk})
+        return Q(**{f"{self.field}__{lookup}": value}) | Q(**{self.field: value, f"pk__{lookup}": pk})
+
+    def get_position(self, instance):
+        if isinstance(instance, dict):  # A `values()` row (see `fastpath.RowPlan`)
+            value, pk = instance.get(self.field), instance["pk"]
+        else:
+            value, pk = getattr(instance, self.field, None), instance.pk
+        if self.field == "pk":
+            return "", pk
+        return value.isoformat() if hasattr(value, "isoformat") else str(value), pk
+
+    def decode_cursor(self, request):
+        """
+        Decode the `?cursor=` parameter into a `((value, pk), reverse)` pair.
+
+        - Cursors are urlsafe base64 of `"<direction>|<pk>|<value>"`.
+        - Raises NotFound for tampered or malformed cursors.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8")
+            direction, pk, value = raw.split("|", 2)
+            if direction not in ("n", "p"):
+                raise ValueError(direction)
+            return (value, int(pk)), direction == "p"
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound("Invalid cursor")
+
+    def clean_position(self, model, position):
+        """
+        Convert a decoded cursor value with the keyset field's `to_python`.
+
+        - Raises NotFound when the value does not fit the column.
+        """
+        value, pk = position
+        if self.field == "pk":
+            return position
+        try:
+            return model_field(model, self.field).to_python(value), pk
+        except ValidationError:
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, position, reverse):
+        value, pk = position
+        raw = f"{'p' if reverse else 'n'}|{pk}|{value}"
+        encoded = base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+
+def project_queryset(queryset, request, serializer_class, keyset_field=None, view=None):
+    if not hasattr(serializer_class, "project_queryset"):
+        return queryset
+    keep = get_ordering(request, view)[0] if view is not None else keyset_field or "pk"
+    return serializer_class.project_queryset(queryset, request, [keep])
+
+
+def paginated_response(request, queryset, serializer_class, keyset_field=None, context=None):
+    """
+    Paginate and serialize `queryset` for function-based views.
+
+    - Mirrors what `ListModelMixin.list` does for the ViewSets, `?fields=` projection included.
+    - Falls back to a plain list when the client opted into legacy mode.
+    """
+    paginator = KeysetPagination()
+    if keyset_field:
+        paginator.keyset_field = keyset_field
+    context = {"request": request} if context is None else context
+    queryset = project_queryset(queryset, request, serializer_class, keyset_field)
+    page = paginator.paginate_queryset(queryset, request)
+    if page is None:
+        serializer = serializer_class(queryset, many=True, context=context)
+        return Response(serializer.data)
+    serializer = serializer_class(page, many=True, context=context)
+    return paginator.get_paginated_response(serializer.data)
+
+
+async def apaginated_data(request, queryset, serializer_class, keyset_field=None, view=None):
+    """
+    Async counterpart of `paginated_response` for async views; returns the payload, not a Response.
+
+    - Rows are fetched with the async ORM; serializing them must not touch the database,
+      so `queryset` should come from `serializer_class.setup_queryset`.
+    """
+    paginator = KeysetPagination()
+    if keyset_field:
+        paginator.keyset_field = keyset_field
+    context = {"request": request}
+    queryset = project_queryset(queryset, request, serializer_class, keyset_field, view)
+    page = await paginator.apaginate_queryset(queryset, request, view)
+    if page is None:
+        return serializer_class([row async for row in queryset], many=True, context=context).data
+    return paginator.get_paginated_data(serializer_class(page, many=True, context=context).data)
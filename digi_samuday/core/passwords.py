@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+# This module imports no models, so pool workers started with `spawn` or
+# `forkserver` can load it before Django's app registry is ready.
+
+
+def hash_chunk(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def hash_passwords(passwords, workers=None, min_parallel=8):
+    """
+    Hash `passwords` with the configured hasher, in input order, spread over a process pool.
+
+    - The default hasher (PBKDF2) deliberately costs tens of milliseconds of CPU per
+      password and holds the GIL, so threads would not help; processes scale with cores.
+    - `workers` defaults to `RESIDENT_IMPORT_WORKERS`, then the CPU count. Small
+      batches, or a single worker, are hashed inline without starting a pool.
+    """
+    passwords = list(passwords)
+    if workers is None:
+        workers = getattr(settings, "RESIDENT_IMPORT_WORKERS", None) or os.cpu_count() or 1
+    workers = min(workers, len(passwords))
+    if workers <= 1 or len(passwords) < min_parallel:
+        return hash_chunk(passwords)
+
+    size = -(-len(passwords) // (workers * 4))  # A few chunks per worker evens out their finish times
+    chunks = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [hashed for chunk in executor.map(hash_chunk, chunks) for hashed in chunk]
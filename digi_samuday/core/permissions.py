@@ -16,6 +16,14 @@ class IsResident(BasePermission):
         # Check if the user is authenticated and has the role of 'resident'
         return request.user.is_authenticated and getattr(request.user, "role", None) == "resident"
 
+class IsAdminOrSecurity(BasePermission):
+    """
+    Custom permission to allow access only to admins and security personnel.
+    """
+    def has_permission(self, request, view):
+        # Check if the user is authenticated and has the role of 'admin' or 'security'
+        return request.user.is_authenticated and getattr(request.user, "role", None) in ("admin", "security")
+
 class IsSecurity(BasePermission):
     """
     Custom permission to allow access only to security personnel.
@@ -0,0 +1,150 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limit per identity (an IP, a username), kept in a Django cache.
+
+    - Holds up to `capacity` tokens and refills completely over `refill_seconds`,
+      so short bursts pass and sustained traffic is held to `capacity / refill_seconds` per second.
+    - State is `(tokens, timestamp)` under a hashed key; with a shared cache (Redis,
+      Memcached) every worker enforces the same limit. Concurrent requests can each
+      read the same state, so a burst may overshoot by the number of workers.
+    """
+    def __init__(self, name, capacity, refill_seconds, cache_alias="default"):
+        self.name = name
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.rate = capacity / refill_seconds
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def key(self, identity):
+        digest = hashlib.sha256(str(identity).encode()).hexdigest()[:32]
+        return f"ratelimit:{self.name}:{digest}"
+
+    def tokens(self, identity, now):
+        state = self.cache.get(self.key(identity))
+        if state is None:
+            return self.capacity
+        tokens, stamp = state
+        return min(self.capacity, tokens + (now - stamp) * self.rate)
+
+    def retry_after(self, identity):
+        """
+        Seconds until `identity` has a token again; 0 when it has one now.
+        """
+        missing = 1 - self.tokens(identity, time.time())
+        return math.ceil(missing / self.rate) if missing > 0 else 0
+
+    def consume(self, identity):
+        """
+        Take a token for `identity`; return False (taking nothing) when the bucket is empty.
+        """
+        now = time.time()
+        tokens = self.tokens(identity, now)
+        if tokens < 1:
+            return False
+        self.cache.set(self.key(identity), (tokens - 1, now), timeout=math.ceil(self.refill_seconds))
+        return True
+
+    def reset(self, identity):
+        self.cache.delete(self.key(identity))
+
+
+LOGIN_BUCKETS = [
+    ("login-ip", "LOGIN_IP_BUCKET", (30, 60)),
+    ("login-user", "LOGIN_USERNAME_BUCKET", (5, 300)),
+    ("login-account", "LOGIN_ACCOUNT_BUCKET", (100, 3600)),
+]
+
+
+def login_buckets():
+    """
+    Return the `(ip, username, account)` login buckets from `LOGIN_IP_BUCKET`,
+    `LOGIN_USERNAME_BUCKET` and `LOGIN_ACCOUNT_BUCKET`; any is None when its setting
+    is None (limit disabled).
+    """
+    alias = getattr(settings, "LOGIN_RATE_LIMIT_CACHE", "default")
+    buckets = []
+    for name, setting, default in LOGIN_BUCKETS:
+        config = getattr(settings, setting, default)
+        buckets.append(TokenBucket(name, *config, cache_alias=alias) if config else None)
+    return tuple(buckets)
+
+
+def login_identities(ip, username):
+    """
+    Return the `(username, account)` bucket identities: the username from this IP, and the username alone.
+    """
+    username = username.strip().lower()
+    return (username, ip), username
+
+
+def client_ip(request):
+    # REMOTE_ADDR only; behind a reverse proxy, have it set REMOTE_ADDR to the real client
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def check_login_attempt(request, username):
+    """
+    Admit a login attempt before any password hashing; return 0, or the seconds to wait.
+
+    - Every attempt spends a token of the client IP's bucket.
+    - The username buckets are only spent by failures (`record_failed_login`). The
+      small one is per username and IP, so guessing from one client stops there
+      without locking the owner out from elsewhere; the much larger per-account one
+      only slows guessing spread over many IPs.
+    """
+    ip = client_ip(request)
+    ip_bucket, username_bucket, account_bucket = login_buckets()
+    for bucket, identity in zip((username_bucket, account_bucket), login_identities(ip, username)):
+        wait = bucket.retry_after(identity) if bucket is not None else 0
+        if wait:
+            return wait
+    if ip_bucket is not None and not ip_bucket.consume(ip):
+        return ip_bucket.retry_after(ip)
+    return 0
+
+
+def record_failed_login(request, username):
+    _, *buckets = login_buckets()
+    for bucket, identity in zip(buckets, login_identities(client_ip(request), username)):
+        if bucket is not None:
+            bucket.consume(identity)
+
+
+def record_successful_login(request, username):
+    """
+    Forget the failures of `username` from this client, so a user who finally got
+    their password right starts afresh; the per-account bucket refills on its own.
+    """
+    username_bucket = login_buckets()[1]
+    if username_bucket is not None:
+        username_bucket.reset(login_identities(client_ip(request), username)[0])
+
+
+def reset_login_limits(ip=None, username=None):
+    """
+    Forget the limiter state of a client IP and/or username (e.g. after an admin unlocks an account).
+
+    - The username's per-IP bucket is cleared for `ip` only; without `ip`, only its
+      per-account bucket is cleared.
+    """
+    ip_bucket, username_bucket, account_bucket = login_buckets()
+    if ip is not None and ip_bucket is not None:
+        ip_bucket.reset(ip)
+    if username is not None:
+        pair, account = login_identities(ip, username)
+        if ip is not None and username_bucket is not None:
+            username_bucket.reset(pair)
+        if account_bucket is not None:
+            account_bucket.reset(account)
@@ -0,0 +1,232 @@
+import csv
+import io
+import zlib
+from itertools import chain
+
+from django.db.models import Count, Max
+
+from .archive import ARCHIVES
+from .models import Visitor, Complaint, Payment, FacilityBooking, SecurityLog
+from .utils import parse_datetime_bound
+
+
+class CSVReport:
+    """
+    Declarative description of one CSV export.
+
+    - `columns` pairs each CSV header with the `values_list` path that feeds it,
+      so related columns (e.g. `resident__username`) come from a single JOIN.
+    - `date_field`/`status_field` are the columns the `from`/`to`/`status` filters apply to;
+      reports without a status column pass `status_field=None`.
+    - `archive` names the `archive.ARCHIVES` entry holding the table's older rows; they
+      are read back for the months the date range covers, ahead of the live rows.
+    """
+    chunk_size = 2000  # Rows fetched per round trip by `.iterator()`
+
+    def __init__(self, model, columns, date_field, status_field, archive=None):
+        self.model = model
+        self.columns = columns
+        self.date_field = date_field
+        self.status_field = status_field
+        self.archive = archive
+
+    @property
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    @property
+    def status_choices(self):
+        if self.status_field is None:
+            return []
+        return [value for value, _ in self.model._meta.get_field(self.status_field).choices]
+
+    def get_queryset(self, date_from=None, date_to=None, status=None):
+        """
+        Build the filtered, id-ordered projection for this report.
+        """
+        queryset = self.model.objects.all()
+        if date_from is not None:
+            queryset = queryset.filter(**{f"{self.date_field}__gte": date_from})
+        if date_to is not None:
+            queryset = queryset.filter(**{f"{self.date_field}__lt": date_to})
+        if status is not None:
+            queryset = queryset.filter(**{self.status_field: status})
+        return queryset.order_by("id").values_list(*[path for _, path in self.columns])
+
+    @property
+    def models(self):
+        """
+        The report's model followed by every model its columns join, e.g. `Resident`
+        for `resident__username`.
+        """
+        models = [self.model]
+        for _, path in self.columns:
+            opts = self.model._meta
+            for name in path.split("__")[:-1]:
+                opts = opts.get_field(name).related_model._meta
+                if opts.model not in models:
+                    models.append(opts.model)
+        return models
+
+    def fingerprint(self):
+        """
+        Cheap aggregate summary of every table the export reads, used to tell whether a
+        finished export is stale.
+
+        - Row count and max id catch inserts and deletes.
+        - `max(updated_at)` catches edits, including those to joined rows (a renamed resident).
+        - Bulk `.update()` calls must set `updated_at` by hand (see `bulk.bulk_update_status`).
+        """
+        return {
+            model._meta.label: model.objects.order_by().aggregate(
+                count=Count("pk"), max_id=Max("pk"), max_updated_at=Max("updated_at"),
+            )
+            for model in self.models
+        }
+
+    def rows(self, **filters):
+        """
+        Yield report rows without populating the queryset result cache.
+        """
+        rows = self.get_queryset(**filters).iterator(chunk_size=self.chunk_size)
+        if self.archive is None:
+            return rows
+        return chain(self.archived_rows(**filters), rows)
+
+    def archived_rows(self, date_from=None, date_to=None, status=None):
+        paths = [path for _, path in self.columns]
+        for row in ARCHIVES[self.archive].read(date_from, date_to):
+            if status is None or row[self.status_field] == status:
+                yield tuple(row[path] for path in paths)
+
+
+REPORTS = {
+    "complaints": CSVReport(
+        Complaint,
+        columns=[
+            ("Complaint ID", "id"),
+            ("Title", "title"),
+            ("Description", "description"),
+            ("Status", "status"),
+            ("Resident", "resident__username"),
+            ("Created At", "created_at"),
+        ],
+        date_field="created_at",
+        status_field="status",
+    ),
+    "payments": CSVReport(
+        Payment,
+        columns=[
+            ("Payment ID", "id"),
+            ("Amount", "amount"),
+            ("Status", "payment_status"),
+            ("Resident", "resident__username"),
+            ("Date", "payment_date"),
+        ],
+        date_field="payment_date",
+        status_field="payment_status",
+    ),
+    "bookings": CSVReport(
+        FacilityBooking,
+        columns=[
+            ("Booking ID", "id"),
+            ("Facility", "facility_name"),
+            ("Start Time", "start_time"),
+            ("End Time", "end_time"),
+            ("Resident", "resident__username"),
+            ("Status", "status"),
+        ],
+        date_field="start_time",
+        status_field="status",
+    ),
+    "visitors": CSVReport(
+        Visitor,
+        columns=[
+            ("Visitor ID", "id"),
+            ("Name", "name"),
+            ("Phone Number", "phone_number"),
+            ("Vehicle Number", "vehicle_number"),
+            ("Resident", "resident__username"),
+            ("Check In", "check_in"),
+            ("Check Out", "check_out"),
+        ],
+        date_field="check_in",
+        status_field=None,
+        archive="visitors",
+    ),
+    "security_logs": CSVReport(
+        SecurityLog,
+        columns=[
+            ("Log ID", "id"),
+            ("Visitor", "visitor__name"),
+            ("Resident", "visitor__resident__username"),
+            ("Guard", "guard_name"),
+            ("Entry Time", "entry_time"),
+            ("Exit Time", "exit_time"),
+        ],
+        date_field="entry_time",
+        status_field=None,
+        archive="security_logs",
+    ),
+}
+
+
+def parse_report_filters(params, report):
+    """
+    Validate the `from`, `to` and `status` query parameters for `report`.
+
+    - Raises ValueError with a client-facing message on bad input.
+    """
+    filters = {}
+    if params.get("from"):
+        filters["date_from"] = parse_datetime_bound(params["from"], "from")
+    if params.get("to"):
+        filters["date_to"] = parse_datetime_bound(params["to"], "to", end_of_range=True)
+    if params.get("status"):
+        if report.status_field is None:
+            raise ValueError("This report does not support a status filter.")
+        if params["status"] not in report.status_choices:
+            raise ValueError(f"Invalid status. Use one of: {', '.join(report.status_choices)}.")
+        filters["status"] = params["status"]
+    return filters
+
+
+def stream_csv(headers, rows, buffer_size=64 * 1024):
+    """
+    Encode `rows` as CSV and yield it in roughly `buffer_size` byte chunks.
+
+    - The header is yielded on its own so the first bytes leave immediately.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= buffer_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_stream(chunks, level=6):
+    """
+    Compress a byte stream into a gzip file on the fly.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    first = True
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if first:
+            # Flush the header row so the client starts receiving bytes right away
+            compressed += compressor.flush(zlib.Z_SYNC_FLUSH)
+            first = False
+        if compressed:
+            yield compressed
+    yield compressor.flush()
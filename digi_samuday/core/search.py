@@ -0,0 +1,177 @@
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Complaint, Notice
+
+logger = logging.getLogger(__name__)
+
+# Indexed models: kind -> (code, model, title field, body field, owner field or None if public).
+# The kind code is folded into the FTS rowid (`pk * 2 + code`), so a row is found,
+# replaced or removed by primary key without scanning the index.
+KINDS = {
+    "complaint": (0, Complaint, "title", "description", "resident_id"),
+    "notice": (1, Notice, "title", "content", None),
+}
+KIND_BY_CODE = {code: kind for kind, (code, *_) in KINDS.items()}
+KIND_BY_MODEL = {spec[1]: kind for kind, spec in KINDS.items()}
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+    title, body, kind UNINDEXED, owner_id UNINDEXED, tokenize = 'porter unicode61'
+)
+"""
+INSERT = "INSERT INTO documents (rowid, title, body, kind, owner_id) VALUES (?, ?, ?, ?, ?)"
+
+
+def to_match_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    - Words are quoted, so FTS syntax typed by users (`AND`, `*`, `"`) is searched literally.
+    """
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """
+    Full-text index of complaint and notice text in a local SQLite FTS5 database.
+
+    - Results are ranked with BM25, title matches weighted above body matches.
+    - One connection per thread; WAL mode lets every worker process read while one writes.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def upsert(self, kind, pk, title, body, owner_id):
+        rowid = pk * 2 + KINDS[kind][0]
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM documents WHERE rowid = ?", (rowid,))
+            connection.execute(INSERT, (rowid, title or "", body or "", kind, owner_id))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def delete(self, kind, pk):
+        self.connection.execute("DELETE FROM documents WHERE rowid = ?", (pk * 2 + KINDS[kind][0],))
+
+    def rebuild(self, chunk_size=2000):
+        """
+        Replace the whole index with the current database rows; return documents indexed.
+        """
+        total = 0
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM documents")
+            for kind, (code, model, title_field, body_field, owner_field) in KINDS.items():
+                fields = ["pk", title_field, body_field] + ([owner_field] if owner_field else [])
+                rows = model.objects.order_by("pk").values_list(*fields).iterator(chunk_size=chunk_size)
+                batch = []
+                for row in rows:
+                    owner_id = row[3] if owner_field else None
+                    batch.append((row[0] * 2 + code, row[1] or "", row[2] or "", kind, owner_id))
+                    if len(batch) >= chunk_size:
+                        connection.executemany(INSERT, batch)
+                        total += len(batch)
+                        batch = []
+                if batch:
+                    connection.executemany(INSERT, batch)
+                    total += len(batch)
+            connection.execute("INSERT INTO documents (documents) VALUES ('optimize')")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return total
+
+    def search(self, text, kinds, owner_id=None, limit=20, offset=0):
+        """
+        Return `(total, hits)` for `text`, hits as `(kind, pk, snippet)` in rank order;
+        the snippet is the best-matching stretch of the body, matches in brackets.
+
+        - `kinds` limits the document types; with `owner_id`, owned kinds (complaints)
+          only match that owner's documents, public kinds (notices) always match.
+        """
+        query = to_match_query(text)
+        if query is None or not kinds:
+            return 0, []
+        conditions = ["documents MATCH ?", f"kind IN ({', '.join('?' for _ in kinds)})"]
+        params = [query, *kinds]
+        if owner_id is not None:
+            public = [kind for kind in kinds if KINDS[kind][4] is None]
+            conditions.append(f"(owner_id = ? OR kind IN ({', '.join('?' for _ in public) or 'NULL'}))")
+            params += [owner_id, *public]
+        where = " AND ".join(conditions)
+
+        total = self.connection.execute(f"SELECT count(*) FROM documents WHERE {where}", params).fetchone()[0]
+        rows = self.connection.execute(
+            f"SELECT rowid, snippet(documents, 1, '[', ']', '…', 24) "
+            f"FROM documents WHERE {where} ORDER BY bm25(documents, 5.0, 1.0) LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        return total, [(KIND_BY_CODE[rowid % 2], rowid // 2, snippet) for rowid, snippet in rows]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index():
+    """
+    Return the index stored at `SEARCH_INDEX_PATH`.
+    """
+    path = str(getattr(settings, "SEARCH_INDEX_PATH", settings.BASE_DIR / "search_index.sqlite3"))
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = SearchIndex(path)
+        return _indexes[path]
+
+
+def schedule_index_update(instance, deleted=False):
+    """
+    Re-index (or drop) a complaint or notice once the current transaction commits.
+
+    - Index failures are logged, never raised into the request; `rebuild_search_index`
+      repairs a missed update.
+    """
+    kind = KIND_BY_MODEL[type(instance)]
+    _, _, title_field, body_field, owner_field = KINDS[kind]
+    pk = instance.pk  # Deletion clears it before on_commit callbacks run
+    document = (getattr(instance, title_field), getattr(instance, body_field), getattr(instance, owner_field) if owner_field else None)
+
+    def apply():
+        try:
+            if deleted:
+                get_search_index().delete(kind, pk)
+            else:
+                get_search_index().upsert(kind, pk, *document)
+        except Exception:
+            logger.exception("Could not update the search index for %s %s", kind, pk)
+
+    transaction.on_commit(apply)
@@ -0,0 +1,230 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .cache import invalidate_namespace
+from .ledger import rebuild_ledger
+from .models import Complaint, Facility, FacilityBooking, Notice, Payment, Resident, SecurityLog, Visitor
+
+
+FACILITY_NAMES = [
+    "Community Hall", "Gym", "Swimming Pool", "Tennis Court", "Clubhouse",
+    "Party Lawn", "Badminton Court", "Library", "Yoga Room", "Guest Suite",
+]
+COMPLAINT_TITLES = [
+    "Water leakage", "Lift not working", "Power outage", "Parking dispute",
+    "Garbage not collected", "Noise after hours", "Broken street light", "Pest control",
+]
+NOTICE_TITLES = [
+    "Water supply interruption", "Maintenance dues reminder", "Festival celebration",
+    "Annual general meeting", "Lift servicing", "Fire drill",
+]
+VISITOR_NAMES = ["Amit", "Priya", "Rahul", "Sneha", "Vikram", "Anjali", "Courier", "Plumber", "Electrician", "Cab driver"]
+PAYMENT_METHODS = ["upi", "card", "netbanking", "cash", "cheque"]
+MAINTENANCE_AMOUNTS = [Decimal("1500.00"), Decimal("2000.00"), Decimal("2500.00"), Decimal("3000.00")]
+
+
+@contextmanager
+def manual_timestamps(*models):
+    """
+    Let `bulk_create` store the given timestamps instead of "now".
+
+    - Temporarily turns off `auto_now`/`auto_now_add` on the models' fields;
+      callers must then set those fields themselves.
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bulk_insert(model, objects, batch_size):
+    """
+    Insert objects from an iterable in batches, never holding more than one batch.
+    """
+    objects = iter(objects)
+    total = 0
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return total
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        total += len(batch)
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+
+def reset_sequences(*models):
+    """
+    Move primary key sequences past explicitly assigned ids (PostgreSQL; a no-op elsewhere).
+    """
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def seed_society(
+    residents=200, years=1, guards=4, facilities=5, visitors_per_year=24, complaints_per_year=3,
+    bookings_per_year=6, batch_size=1000, password="password", seed=None, prefix="seed",
+):
+    """
+    Fill the database with a synthetic society for benchmarking.
+
+    - Creates residents, guards and one admin, `years` of visitors with their security
+      logs, monthly maintenance payments, complaints, bookings and weekly notices.
+    - Rows are generated lazily and written with `bulk_create` in `batch_size` batches;
+      only visit timestamps are held in memory, to sort them. Residents and visitors
+      get explicit ids because MySQL does not return ids from `bulk_create`.
+    - All users share `password`, hashed once. Usernames start with `prefix` and the
+      first free resident id, so the command can be run again to grow the dataset.
+    - Returns the number of rows created per model.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    start = now - timedelta(days=365 * years)
+    span = (now - start).total_seconds()
+    months = 12 * years
+
+    def moment(after=start, before=now):
+        return after + timedelta(seconds=rng.uniform(0, (before - after).total_seconds()))
+
+    password_hash = make_password(password)
+    counts = {}
+
+    with transaction.atomic(), manual_timestamps(Resident, Visitor, Complaint, Payment, FacilityBooking, Notice, SecurityLog):
+        first_id = next_id(Resident)
+
+        def user(offset, role, apartment_no, **extra):
+            user_id = first_id + offset
+            joined = moment()
+            return Resident(
+                id=user_id, username=f"{prefix}_{role}_{user_id}", password=password_hash, role=role,
+                apartment_no=apartment_no, phone_number=f"9{user_id:09d}"[-10:],
+                email=f"{prefix}_{user_id}@example.com", date_joined=joined, updated_at=joined, **extra,
+            )
+
+        people = [user(0, "admin", "Office", is_staff=True)]
+        people += [user(1 + i, "security", "Gate") for i in range(guards)]
+        people += [
+            user(1 + guards + i, "resident", f"{chr(65 + (i // 100) % 26)}-{i % 100 + 1:03d}")
+            for i in range(residents)
+        ]
+        counts["residents"] = bulk_insert(Resident, people, batch_size)
+        admin_id = people[0].id
+        guard_names = [person.username for person in people[1:1 + guards]] or ["guard"]
+        resident_ids = [person.id for person in people[1 + guards:]]
+        reset_sequences(Resident)
+
+        existing = set(Facility.objects.values_list("name", flat=True))
+        names = FACILITY_NAMES[:facilities] + [f"Facility {i}" for i in range(len(FACILITY_NAMES), facilities)]
+        counts["facilities"] = bulk_insert(Facility, (
+            Facility(name=name, description=f"{name} for residents", updated_at=now)
+            for name in names if name not in existing
+        ), batch_size)
+
+        # Visitors and their security logs, oldest first; the last day's visitors may still be inside
+        first_visitor_id = next_id(Visitor)
+        total_visitors = len(resident_ids) * visitors_per_year * years
+        check_ins = sorted(start + timedelta(seconds=rng.uniform(0, span)) for _ in range(total_visitors))
+        visits = []
+        for offset, check_in in enumerate(check_ins):
+            inside = now - check_in < timedelta(days=1) and rng.random() < 0.3
+            check_out = None if inside else min(check_in + timedelta(minutes=rng.randint(10, 240)), now)
+            visits.append((first_visitor_id + offset, check_in, check_out))
+
+        counts["visitors"] = bulk_insert(Visitor, (
+            Visitor(
+                id=visitor_id, name=rng.choice(VISITOR_NAMES), phone_number=f"8{rng.randrange(10 ** 9):09d}",
+                vehicle_number=f"MH{rng.randint(1, 50):02d}AB{rng.randint(1000, 9999)}" if rng.random() < 0.4 else None,
+                check_in=check_in, check_out=check_out, updated_at=check_out or check_in,
+                resident_id=rng.choice(resident_ids),
+            )
+            for visitor_id, check_in, check_out in visits
+        ), batch_size)
+        reset_sequences(Visitor)
+        counts["security_logs"] = bulk_insert(SecurityLog, (
+            SecurityLog(
+                visitor_id=visitor_id, entry_time=check_in, exit_time=check_out, updated_at=check_out or check_in,
+                guard_name=rng.choice(guard_names),
+            )
+            for visitor_id, check_in, check_out in visits
+        ), batch_size)
+        del visits, check_ins
+
+        def payments():
+            for resident_id in resident_ids:
+                amount = rng.choice(MAINTENANCE_AMOUNTS)
+                for month in range(months):
+                    paid_at = start + timedelta(days=30 * month + rng.randint(0, 27), seconds=rng.randint(0, 86399))
+                    pending = month == months - 1 and rng.random() < 0.3
+                    yield Payment(
+                        amount=amount, payment_date=min(paid_at, now), updated_at=min(paid_at, now),
+                        payment_status="pending" if pending else "completed",
+                        payment_method=rng.choice(PAYMENT_METHODS), resident_id=resident_id,
+                    )
+        counts["payments"] = bulk_insert(Payment, payments(), batch_size)
+        rebuild_ledger()  # `bulk_create` bypasses the payment API that keeps the ledger current
+
+        def complaints():
+            for resident_id in resident_ids:
+                for _ in range(complaints_per_year * years):
+                    created_at = moment()
+                    age = now - created_at
+                    status = "resolved" if age > timedelta(days=30) else rng.choice(["open", "in_progress", "resolved"])
+                    yield Complaint(
+                        title=rng.choice(COMPLAINT_TITLES), description="Reported by resident, please look into it.",
+                        status=status, created_at=created_at, updated_at=min(created_at + timedelta(days=rng.randint(0, 10)), now),
+                        resident_id=resident_id,
+                    )
+        counts["complaints"] = bulk_insert(Complaint, complaints(), batch_size)
+
+        def bookings():
+            booking_names = names or ["Community Hall"]
+            for resident_id in resident_ids:
+                for _ in range(bookings_per_year * years):
+                    created_at = moment()
+                    start_time = created_at + timedelta(days=rng.randint(1, 30), hours=rng.randint(6, 20))
+                    start_time = start_time.replace(minute=0, second=0, microsecond=0)
+                    if start_time > now:
+                        status = rng.choice(["pending", "pending", "approved"])
+                    else:
+                        status = "approved" if rng.random() < 0.85 else "rejected"
+                    yield FacilityBooking(
+                        resident_id=resident_id, facility_name=rng.choice(booking_names), start_time=start_time,
+                        end_time=start_time + timedelta(hours=rng.randint(1, 4)), status=status,
+                        created_at=created_at, updated_at=created_at,
+                    )
+        counts["bookings"] = bulk_insert(FacilityBooking, bookings(), batch_size)
+
+        counts["notices"] = bulk_insert(Notice, (
+            Notice(
+                title=rng.choice(NOTICE_TITLES), content="Please take note of the following update.",
+                posted_by_id=admin_id, created_at=start + timedelta(weeks=week), updated_at=start + timedelta(weeks=week),
+            )
+            for week in range(52 * years)
+        ), batch_size)
+
+    # `bulk_create` sends no signals, so clear the shared response caches by hand
+    for namespace in ("notices", "facilities", "dashboard"):
+        invalidate_namespace(namespace)
+    return counts
@@ -1,7 +1,79 @@
+import time
+
 from rest_framework import serializers
-from .models import Resident, Visitor, Complaint, Payment, Facility, FacilityBooking, Notice, SecurityLog
+from .fieldsets import projection, requested_fields
+from .metrics import record_serializer_time
+from .models import Resident, Visitor, Complaint, Payment, Facility, FacilityBooking, Notice, SecurityLog, ReportJob
 from django.contrib.auth.hashers import make_password
 
+class SparseFieldsetMixin:
+    """
+    Lets a client ask for a subset of the fields with `?fields=id,apartment_no`
+    or `?exclude=description`.
+
+    - Read from the `request` in the serializer context; without one (or on writes)
+      every field is rendered.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = requested_fields(self.context.get("request"), list(self.fields))
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+class QueryPlanMixin(SparseFieldsetMixin):
+    """
+    Lets a serializer declare the queryset shape it needs to render a list
+    without one extra query per row.
+
+    - `Meta.select_related`: relations read by the serializer (e.g. `resident.username`).
+    - `Meta.only`: columns to load; everything else stays deferred.
+    - Time spent in `to_representation` is reported to the request metrics
+      (row fetching in between rows is not counted).
+    """
+    @classmethod
+    def setup_queryset(cls, queryset):
+        """
+        Apply the declared `select_related`/`only` plan to `queryset`.
+        """
+        meta = getattr(cls, "Meta", None)
+        select_related = getattr(meta, "select_related", None)
+        only = getattr(meta, "only", None)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if only:
+            queryset = queryset.only(*only)
+        return queryset
+
+    @classmethod
+    def project_queryset(cls, queryset, request, keep=()):
+        """
+        Narrow `queryset` to the columns read by the fields `request` asked for.
+
+        - `keep` names extra columns the view needs, e.g. the pagination key.
+        - Without a fieldset, or when a kept field is not backed by a column (a method
+          field), the queryset is returned unchanged.
+        """
+        fields = cls().fields
+        selected = requested_fields(request, list(fields))
+        if selected is None:
+            return queryset
+        plan = projection(cls.Meta.model, [fields[name].source for name in selected], keep)
+        if plan is None:
+            return queryset
+        select_related, only = plan
+        queryset = queryset.select_related(None)  # Relations the dropped fields read are not joined
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        return queryset.only(*only)
+
+    def to_representation(self, instance):
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            record_serializer_time(time.perf_counter() - started)
+
 class RegisterSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration.
@@ -19,15 +91,16 @@ class RegisterSerializer(serializers.ModelSerializer):
         validated_data['password'] = make_password(validated_data['password'])  # Hash the password
         return super().create(validated_data)
 
-class ResidentSerializer(serializers.ModelSerializer):
+class ResidentSerializer(QueryPlanMixin, serializers.ModelSerializer):
     """
     Serializer for the Resident model, excluding sensitive information like password.
     """
     class Meta:
         model = Resident
         fields = ['id', 'username', 'email', 'apartment_no', 'phone_number', 'role', 'status']
+        only = fields + ['date_joined']  # date_joined is the pagination key
 
-class VisitorSerializer(serializers.ModelSerializer):
+class VisitorSerializer(QueryPlanMixin, serializers.ModelSerializer):
     """
     Serializer for the Visitor model, including all fields.
     """
@@ -35,7 +108,7 @@ class VisitorSerializer(serializers.ModelSerializer):
         model = Visitor
         fields = '__all__'
 
-class ComplaintSerializer(serializers.ModelSerializer):
+class ComplaintSerializer(QueryPlanMixin, serializers.ModelSerializer):
     """
     Serializer for the Complaint model.
     Includes the resident's username as a read-only field.
@@ -45,8 +118,10 @@ class ComplaintSerializer(serializers.ModelSerializer):
     class Meta:
         model = Complaint
         fields = ["id", "title", "description", "status", "created_at", "updated_at", "resident_name"]
+        select_related = ["resident"]
+        only = ["id", "title", "description", "status", "created_at", "updated_at", "resident__username"]
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(QueryPlanMixin, serializers.ModelSerializer):
     """
     Serializer for the Payment model.
     The resident field is read-only to prevent modification.
@@ -57,7 +132,7 @@ class PaymentSerializer(serializers.ModelSerializer):
         model = Payment
         fields = ["id", "amount", "payment_date", "payment_status", "payment_method", "resident"]
 
-class FacilitySerializer(serializers.ModelSerializer):
+class FacilitySerializer(QueryPlanMixin, serializers.ModelSerializer):
     """
     Serializer for the Facility model, including all details about a facility.
     """
@@ -65,7 +140,7 @@ class FacilitySerializer(serializers.ModelSerializer):
         model = Facility
         fields = ["id", "name", "description", "availability_status"]
 
-class FacilityBookingSerializer(serializers.ModelSerializer):
+class FacilityBookingSerializer(QueryPlanMixin, serializers.ModelSerializer):
     """
     Serializer for Facility Booking model.
     Includes the resident's username as a read-only field.
@@ -75,8 +150,20 @@ class FacilityBookingSerializer(serializers.ModelSerializer):
     class Meta:
         model = FacilityBooking
         fields = ["id", "facility_name", "start_time", "end_time", "status", "resident"]
+        select_related = ["resident"]
+        only = ["id", "facility_name", "start_time", "end_time", "status", "created_at", "updated_at", "resident__username"]
+
+    def validate(self, attrs):
+        """
+        Ensure the booking ends after it starts.
+        """
+        start_time = attrs.get("start_time", getattr(self.instance, "start_time", None))
+        end_time = attrs.get("end_time", getattr(self.instance, "end_time", None))
+        if start_time and end_time and end_time <= start_time:
+            raise serializers.ValidationError({"end_time": "End time must be after start time."})
+        return attrs
 
-class NoticeSerializer(serializers.ModelSerializer):
+class NoticeSerializer(QueryPlanMixin, serializers.ModelSerializer):
     """
     Serializer for the Notice model.
     Includes the admin username who posted the notice as a read-only field.
@@ -86,11 +173,46 @@ class NoticeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notice
         fields = ["id", "title", "content", "created_at", "posted_by"]
+        select_related = ["posted_by"]
+        only = ["id", "title", "content", "created_at", "updated_at", "posted_by__username"]
 
-class SecurityLogSerializer(serializers.ModelSerializer):
+class SecurityLogSerializer(QueryPlanMixin, serializers.ModelSerializer):
     """
     Serializer for the Security Log model, including all fields.
     """
     class Meta:
         model = SecurityLog
         fields = '__all__'
+
+class OnPremisesSerializer(QueryPlanMixin, serializers.ModelSerializer):
+    """
+    Serializer for an open security log: who is inside, whom they visit, and since when.
+    """
+    visitor_id = serializers.IntegerField(read_only=True)
+    visitor_name = serializers.CharField(source="visitor.name", read_only=True)
+    phone_number = serializers.CharField(source="visitor.phone_number", read_only=True)
+    vehicle_number = serializers.CharField(source="visitor.vehicle_number", read_only=True)
+    resident_id = serializers.IntegerField(source="visitor.resident_id", read_only=True)
+    resident_name = serializers.CharField(source="visitor.resident.username", read_only=True)
+    apartment_no = serializers.CharField(source="visitor.resident.apartment_no", read_only=True)
+
+    class Meta:
+        model = SecurityLog
+        fields = [
+            "id", "entry_time", "guard_name", "visitor_id", "visitor_name", "phone_number",
+            "vehicle_number", "resident_id", "resident_name", "apartment_no",
+        ]
+        select_related = ["visitor__resident"]
+        only = [
+            "id", "entry_time", "guard_name", "visitor__name", "visitor__phone_number",
+            "visitor__vehicle_number", "visitor__resident__username", "visitor__resident__apartment_no",
+        ]
+
+class ReportJobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Serializer for background report jobs.
+    Exposes the job state the client polls, not the on-disk location.
+    """
+    class Meta:
+        model = ReportJob
+        fields = ["id", "report_type", "params", "status", "cached", "error", "created_at", "finished_at"]
@@ -0,0 +1,222 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import SIGNED_TOKEN_FIELDS, revoke_signed_tokens, token_cache
+from .bookings import invalidate_interval_index
+from .checkin import PREMISES_NAMESPACE, invalidate_resident_directory
+from .cache import RESIDENTS_NAMESPACE, invalidate_namespace, invalidate_user
+from .events import BROADCAST, publish_event, role_channel, user_channel
+from .metrics import instrument_connection
+from .search import schedule_index_update
+from .models import Resident, Complaint, Payment, Facility, FacilityBooking, Notice, SecurityLog
+
+# Sent after a queryset `.update()` changes the status of many rows at once, since
+# such updates bypass `post_save`. Arguments: ids, field, status, rows (pre-update instances).
+bulk_status_updated = Signal()
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    """
+    Count every connection's queries for `/api/metrics/`, in whichever thread it is opened.
+    """
+    instrument_connection(connection)
+
+
+@receiver([post_save, post_delete], sender=FacilityBooking)
+def refresh_booking_index(sender, instance, **kwargs):
+    """
+    Drop the cached interval index of the facility a booking belongs to.
+    """
+    invalidate_interval_index(instance.facility_name)
+
+
+@receiver(bulk_status_updated, sender=FacilityBooking)
+def refresh_booking_index_after_bulk_update(sender, rows, **kwargs):
+    """
+    Drop the cached interval indexes of every facility touched by a bulk update.
+    """
+    for facility_name in {row.facility_name for row in rows}:
+        invalidate_interval_index(facility_name)
+
+
+@receiver([post_save, post_delete], sender=Notice)
+def invalidate_notice_cache(sender, **kwargs):
+    """
+    Clear cached notice lists and details once the write commits.
+
+    - Bumping earlier would let a concurrent reader cache the pre-commit rows
+      under the new version until the entry expires.
+    """
+    def invalidate():
+        invalidate_namespace("notices")
+        invalidate_namespace("dashboard")
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Complaint)
+@receiver(post_save, sender=Notice)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the full-text index current; status-only saves leave the indexed text alone.
+    """
+    if update_fields is None or not set(update_fields) <= {"status", "updated_at"}:
+        schedule_index_update(instance)
+
+
+@receiver(post_delete, sender=Complaint)
+@receiver(post_delete, sender=Notice)
+def remove_from_search_index(sender, instance, **kwargs):
+    schedule_index_update(instance, deleted=True)
+
+
+@receiver([post_save, post_delete], sender=Facility)
+def invalidate_facility_cache(sender, **kwargs):
+    """
+    Clear cached facility lists and details once the write commits.
+    """
+    transaction.on_commit(lambda: invalidate_namespace("facilities"))
+
+
+@receiver([post_save, post_delete], sender=Resident)
+def invalidate_resident_cache(sender, instance, **kwargs):
+    """
+    Clear the resident's personal cache entries once the write commits; notices
+    embed admin usernames.
+    """
+    user_id, is_admin = instance.pk, instance.role == Resident.ADMIN
+
+    def invalidate():
+        invalidate_user(user_id)
+        if is_admin:
+            invalidate_namespace("notices")
+    transaction.on_commit(invalidate)
+
+
+@receiver([post_save, post_delete], sender=Resident)
+def bump_resident_version(sender, update_fields=None, **kwargs):
+    """
+    Change the ETags of lists showing resident columns once the write commits, except
+    on the `last_login` and password writes, which no payload shows.
+    """
+    if update_fields is None or not set(update_fields) <= {"last_login", "password"}:
+        transaction.on_commit(lambda: invalidate_namespace(RESIDENTS_NAMESPACE))
+
+
+@receiver([post_save, post_delete], sender=Resident)
+def invalidate_resident_tokens(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Drop cached token lookups so password, status and role changes apply immediately,
+    and revoke the user's signed tokens when a field they carry (or the password or
+    status) may have changed; profile edits and `last_login` writes keep them.
+    """
+    token_cache.invalidate_user(instance.pk)
+    if created:
+        return
+    if update_fields is None or set(update_fields) & {*SIGNED_TOKEN_FIELDS, "password", "status"}:
+        revoke_signed_tokens(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Resident)
+def refresh_resident_directory(sender, update_fields=None, **kwargs):
+    """
+    Drop the gate check-in directory, except on the `last_login` write every login makes
+    and the password re-hash a changed hashing policy triggers.
+    """
+    if update_fields is None or not set(update_fields) <= {"last_login", "password"}:
+        invalidate_resident_directory()
+
+
+@receiver([post_save, post_delete], sender=SecurityLog)
+def invalidate_premises_cache(sender, **kwargs):
+    """
+    Clear the cached "currently inside" list and count on check-in and checkout,
+    once the write commits.
+    """
+    transaction.on_commit(lambda: invalidate_namespace(PREMISES_NAMESPACE))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Drop a token from the authentication cache once it is deleted (e.g. on logout).
+    """
+    token_cache.invalidate_key(instance.key)
+
+
+@receiver([post_save, post_delete], sender=Complaint)
+@receiver([post_save, post_delete], sender=Payment)
+@receiver([post_save, post_delete], sender=FacilityBooking)
+def invalidate_owner_dashboard(sender, instance, **kwargs):
+    """
+    Clear the owning resident's cached dashboard once a write to their rows commits.
+    """
+    resident_id = instance.resident_id
+    transaction.on_commit(lambda: invalidate_user(resident_id))
+
+
+@receiver(bulk_status_updated, sender=Complaint)
+@receiver(bulk_status_updated, sender=Payment)
+@receiver(bulk_status_updated, sender=FacilityBooking)
+def invalidate_owner_dashboards_after_bulk_update(sender, rows, **kwargs):
+    """
+    Clear the cached dashboards of every resident touched by a bulk update, once it commits.
+    """
+    resident_ids = {row.resident_id for row in rows}
+
+    def invalidate():
+        for resident_id in resident_ids:
+            invalidate_user(resident_id)
+    transaction.on_commit(invalidate)
+
+
+# Live events (served at /api/events/): residents hear about their own rows,
+# admins about new requests, everyone about new notices
+EVENT_NAMES = {Complaint: "complaint", FacilityBooking: "booking", Payment: "payment"}
+STATUS_FIELDS = {Complaint: "status", FacilityBooking: "status", Payment: "payment_status"}
+DECIDED_STATUSES = {
+    Complaint: {"open", "in_progress", "resolved"},
+    FacilityBooking: {"approved", "rejected"},
+    Payment: {"completed", "rejected"},
+}
+
+
+@receiver(post_save, sender=Notice)
+def publish_new_notice(sender, instance, created, **kwargs):
+    """
+    Tell every connected user about a new notice.
+    """
+    if created:
+        publish_event([BROADCAST], "notice.created", {"id": instance.pk, "title": instance.title})
+
+
+@receiver(post_save, sender=Complaint)
+@receiver(post_save, sender=Payment)
+@receiver(post_save, sender=FacilityBooking)
+def publish_status_event(sender, instance, created, **kwargs):
+    """
+    Tell admins about new requests, and the owner about status decisions.
+    """
+    name = EVENT_NAMES[sender]
+    status_value = getattr(instance, STATUS_FIELDS[sender])
+    if created:
+        publish_event([role_channel(Resident.ADMIN)], f"{name}.created", {"id": instance.pk, "status": status_value})
+    elif status_value in DECIDED_STATUSES[sender]:
+        publish_event([user_channel(instance.resident_id)], f"{name}.status", {"id": instance.pk, "status": status_value})
+
+
+@receiver(bulk_status_updated, sender=Complaint)
+@receiver(bulk_status_updated, sender=Payment)
+@receiver(bulk_status_updated, sender=FacilityBooking)
+def publish_bulk_status_events(sender, ids, status, rows, **kwargs):
+    """
+    Tell each owner about their rows changed by a bulk status update.
+    """
+    name = EVENT_NAMES[sender]
+    updated = set(ids)
+    for row in rows:
+        if row.pk in updated:
+            publish_event([user_channel(row.resident_id)], f"{name}.status", {"id": row.pk, "status": status})
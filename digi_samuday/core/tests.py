@@ -1,3 +1,1430 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import gzip
+import importlib
+import io
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, force_authenticate
+
+from . import metrics, urls as core_urls
+
+from .models import (
+    Resident, Visitor, Complaint, Payment,
+    Facility, FacilityBooking, Notice, PaymentLedger, ReportJob, SecurityLog
+)
+from .archive import ARCHIVES, archive_visits
+from .authentication import CachedTokenAuthentication, TokenCache, token_cache
+from .benchmark import compare_reports, run_benchmark, run_serializer_benchmark
+from .bulk import bulk_update_status
+from .checkin import invalidate_resident_directory
+from .events import get_broker, role_channel, user_channel
+from .fastpath import FastListMixin, RowPlan
+from .ledger import rebuild_ledger, reconcile_ledger
+from .passwords import hash_passwords
+from .seeding import seed_society as seed_synthetic_society
+from .serializers import ReportJobSerializer
+from .views import get_complaints, get_residents, get_visitor_logs, log_visitor_entry
+
+
+def create_admin():
+    return Resident.objects.create_user(
+        username="admin", password="pass", role="admin",
+        apartment_no="Office", phone_number="7777777777", is_staff=True,
+    )
+
+
+def create_guard():
+    return Resident.objects.create_user(
+        username="guard", password="pass", role="security",
+        apartment_no="Gate", phone_number="6666666666",
+    )
+
+
+def seed_society(admin, rows):
+    """
+    Create `rows` residents, each with one row in every core table.
+    """
+    for i in range(rows):
+        resident = Resident.objects.create_user(
+            username=f"resident{i}", password="pass", role="resident",
+            apartment_no=f"A-{i}", phone_number="9999999999",
+        )
+        visitor = Visitor.objects.create(name=f"Visitor {i}", phone_number="8888888888", resident=resident)
+        SecurityLog.objects.create(visitor=visitor, guard_name="guard")
+        Complaint.objects.create(title=f"Complaint {i}", description="Leaking tap", resident=resident)
+        Payment.objects.create(amount="1500.00", payment_method="upi", resident=resident)
+        Facility.objects.create(name=f"Facility {i}", description="Amenity")
+        FacilityBooking.objects.create(resident=resident, facility_name=f"Facility {i}")
+        Notice.objects.create(title=f"Notice {i}", content="Water cut", posted_by=admin)
+
+
+def use_temporary_path(test_case, setting, filename=""):
+    """
+    Point a file or directory setting at a temporary directory for one test.
+    """
+    directory = tempfile.TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+    settings_override = override_settings(**{setting: f"{directory.name}/{filename}".rstrip("/")})
+    settings_override.enable()
+    test_case.addCleanup(settings_override.disable)
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    Cursor pages walk the list both ways, stay stable under inserts and reject bad cursors.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 5)
+        Complaint.objects.update(created_at=timezone.now() - timedelta(days=1))  # Ties fall back to the id
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def ids(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_pages_walk_both_ways(self):
+        expected = list(Complaint.objects.order_by("-created_at", "-pk").values_list("pk", flat=True))
+        first = self.client.get("/api/complaints/?page_size=2")
+        self.assertIsNone(first.data["previous"])
+        Complaint.objects.create(title="New", description="Inserted mid-walk", resident=Resident.objects.get(username="resident0"))
+
+        second = self.client.get(first.data["next"])
+        third = self.client.get(second.data["next"])
+        self.assertEqual(self.ids(first) + self.ids(second) + self.ids(third), expected)
+        self.assertIsNone(third.data["next"])
+        self.assertEqual(self.ids(self.client.get(third.data["previous"])), expected[2:4])
+
+    def test_page_size_and_legacy_mode(self):
+        self.assertEqual(len(self.ids(self.client.get("/api/complaints/?page_size=0"))), 5)
+        self.assertEqual(len(self.ids(self.client.get("/api/complaints/?page_size=3"))), 3)
+        legacy = self.client.get("/api/complaints/?paginate=false")
+        self.assertEqual(len(legacy.data), 5)
+
+    def test_invalid_cursors_are_not_found(self):
+        for raw in (b"n|5|garbage", b"x|5|2024-01-01T00:00:00+00:00", b"n|five|2024-01-01T00:00:00+00:00", b"\xff"):
+            cursor = base64.urlsafe_b64encode(raw).decode()
+            with self.subTest(raw=raw):
+                self.assertEqual(self.client.get(f"/api/complaints/?cursor={cursor}").status_code, 404)
+        self.assertEqual(self.client.get("/api/complaints/?cursor=not-base64!").status_code, 404)
+
+
+class ListQueryCountTests(TestCase):
+    """
+    Pin the number of queries each list endpoint runs, independent of row count.
+    """
+    # One query for the page itself, plus one ETag aggregate where conditional GET
+    # is enabled; serializers must not touch the DB per row.
+    viewset_urls = {
+        "/api/residents/": 1,
+        "/api/complaints/": 2,
+        "/api/payments/": 2,
+        "/api/facilities/": 2,
+        "/api/facility-bookings/": 2,
+        "/api/notices/": 2,
+        "/api/security-logs/": 1,
+    }
+    function_views = [get_complaints, get_residents, get_visitor_logs]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        cls.guard = create_guard()
+        seed_society(cls.admin, 20)
+
+    def setUp(self):
+        cache.clear()  # Measure the uncached path
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.factory = RequestFactory()
+
+    def test_viewset_lists_run_one_query(self):
+        for url, queries in self.viewset_urls.items():
+            for query in ("", "?paginate=false"):
+                with self.subTest(url=url + query), self.assertNumQueries(queries):
+                    response = self.client.get(url + query)
+                    self.assertEqual(response.status_code, 200)
+
+    def test_visitor_list_runs_one_query(self):
+        self.client.force_authenticate(self.guard)
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/visitors/")
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_function_view_lists_run_one_query(self):
+        for view in self.function_views:
+            request = self.factory.get("/", {"paginate": "false"})
+            force_authenticate(request, user=self.admin)
+            with self.subTest(view=view.__name__), self.assertNumQueries(1):
+                response = view(request)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), 22 if view is get_residents else 20)
+
+    def test_csv_reports_run_one_query(self):
+        for report_type in ("complaints", "payments", "bookings"):
+            with self.subTest(report_type=report_type), self.assertNumQueries(1):
+                response = self.client.get(f"/api/reports/{report_type}/")
+                content = b"".join(response.streaming_content).decode()
+                self.assertEqual(len(content.splitlines()), 21)
+
+
+class ReportTests(TestCase):
+    """
+    CSV reports are admin-only, and export jobs reuse a finished file only while
+    every table it reads is unchanged.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 3)
+
+    def setUp(self):
+        use_temporary_path(self, "REPORT_EXPORT_DIR")
+        settings_override = override_settings(REPORT_JOBS_EAGER=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def submit(self, report_type):
+        response = self.client.post("/api/report-jobs/", {"report_type": report_type}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["status"], "done")
+        return response.data
+
+    def download(self, job):
+        response = self.client.get(f"/api/report-jobs/{job['id']}/download/")
+        return b"".join(response.streaming_content).decode()
+
+    def test_reports_require_an_admin(self):
+        resident = Resident.objects.get(username="resident0")
+        for report_type in ("visitors", "security_logs", "complaints"):
+            with self.subTest(report_type=report_type):
+                self.assertEqual(APIClient().get(f"/api/reports/{report_type}/").status_code, 401)
+                client = APIClient()
+                client.force_authenticate(resident)
+                self.assertEqual(client.get(f"/api/reports/{report_type}/").status_code, 403)
+                self.assertEqual(self.client.get(f"/api/reports/{report_type}/").status_code, 200)
+
+    def export(self, query=""):
+        response = self.client.get(f"/api/reports/complaints/{query}")
+        self.assertEqual(response.status_code, 200, query)
+        return b"".join(response.streaming_content)
+
+    def rows(self, query=""):
+        header, *rows = csv.reader(io.StringIO(self.export(query).decode()))
+        return [dict(zip(header, row)) for row in rows]
+
+    def test_compressed_report_matches_plain_csv(self):
+        plain = self.export()
+        for value in ("1", "gzip"):
+            with self.subTest(compress=value):
+                response = self.client.get(f"/api/reports/complaints/?compress={value}")
+                self.assertEqual(response["Content-Type"], "application/gzip")
+                self.assertTrue(response["Content-Disposition"].endswith('.csv.gz"'))
+                self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), plain)
+
+    def test_status_and_date_filters_narrow_the_rows(self):
+        complaints = list(Complaint.objects.order_by("pk"))
+        Complaint.objects.filter(pk=complaints[0].pk).update(status="resolved")
+        Complaint.objects.filter(pk=complaints[1].pk).update(created_at=timezone.make_aware(datetime(2020, 1, 15, 12)))
+        Complaint.objects.filter(pk=complaints[2].pk).update(created_at=timezone.make_aware(datetime(2020, 2, 1, 9)))
+        self.assertEqual(len(self.rows()), len(complaints))
+
+        resolved = self.rows("?status=resolved")
+        self.assertEqual([row["Complaint ID"] for row in resolved], [str(complaints[0].pk)])
+        january = self.rows("?from=2020-01-01&to=2020-01-31")  # A bare `to` date is inclusive
+        self.assertEqual([row["Complaint ID"] for row in january], [str(complaints[1].pk)])
+        self.assertEqual(len(self.rows("?to=2020-02-01")), 2)
+        self.assertEqual(len(self.rows("?from=2020-02-01T10:00:00")), len(complaints) - 2)
+
+        for query in ("?from=yesterday", "?to=2020-02-30", "?status=closed"):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"/api/reports/complaints/{query}").status_code, 400)
+        self.assertEqual(self.client.get("/api/reports/visitors/?status=open").status_code, 400)
+
+    def test_jobs_reuse_exports_until_the_data_changes(self):
+        first = self.submit("visitors")
+        self.assertFalse(first["cached"])
+        self.assertTrue(self.submit("visitors")["cached"])
+
+        visitor = Visitor.objects.get(name="Visitor 1")
+        visitor.name, visitor.check_out = "Renamed Visitor", timezone.now()
+        visitor.save()
+        edited = self.submit("visitors")
+        self.assertFalse(edited["cached"])
+        self.assertIn("Renamed Visitor", self.download(edited))
+        self.assertFalse(self.submit("security_logs")["cached"])
+
+    def test_joined_rows_invalidate_exports(self):
+        self.submit("complaints")
+        self.assertTrue(self.submit("complaints")["cached"])
+        resident = Resident.objects.get(username="resident2")
+        resident.username = "renamed"
+        resident.save()
+        job = self.submit("complaints")
+        self.assertFalse(job["cached"])
+        self.assertIn("renamed", self.download(job))
+
+    def test_failed_export_leaves_no_temporary_file(self):
+        def broken_rows(headers, rows):
+            yield b"partial,row\r\n"
+            raise RuntimeError("Database went away")
+
+        with mock.patch("core.jobs.stream_csv", broken_rows), self.assertLogs("core.jobs", level="ERROR"):
+            response = self.client.post("/api/report-jobs/", {"report_type": "visitors"}, format="json")
+        job = ReportJob.objects.get(pk=response.data["id"])
+        self.assertEqual((job.status, job.error), ("failed", "Database went away"))
+        self.assertEqual(list(Path(settings.REPORT_EXPORT_DIR).iterdir()), [])
+
+
+class BookingConflictTests(TestCase):
+    """
+    Approved bookings of a facility never overlap, whichever endpoint approves or moves them.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        cls.resident = Resident.objects.create_user(
+            username="resident", password="pass", role="resident", apartment_no="B-1", phone_number="9999999999",
+        )
+        cls.hall = Facility.objects.create(name="Hall", description="Community hall")
+        cls.day = (timezone.now() + timedelta(days=2)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def book(self, start_hour, end_hour, facility_name="Hall", status="pending"):
+        end_time = self.day + timedelta(hours=end_hour) if end_hour is not None else None
+        return FacilityBooking.objects.create(
+            resident=self.resident, facility_name=facility_name, status=status,
+            start_time=self.day + timedelta(hours=start_hour), end_time=end_time,
+        )
+
+    def approve(self, booking):
+        return self.client.patch(f"/api/facility-bookings/{booking.pk}/approve/")
+
+    def test_approve_refuses_overlaps_and_open_ended_bookings(self):
+        first, overlapping, adjacent = self.book(10, 12), self.book(11, 13), self.book(12, 14)
+        self.assertEqual(self.approve(first).status_code, 200)
+        response = self.approve(overlapping)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["conflicts"], [first.pk])
+        self.assertEqual(self.approve(adjacent).status_code, 200)
+        self.assertEqual(self.approve(self.book(20, 21, facility_name="Unlisted room")).status_code, 200)
+
+        open_ended = self.book(16, None)
+        self.assertEqual(self.approve(open_ended).status_code, 400)
+        open_ended.refresh_from_db()
+        self.assertEqual(open_ended.status, "pending")
+
+    def test_updates_cannot_approve_or_move_onto_an_approved_booking(self):
+        approved, pending = self.book(10, 12, status="approved"), self.book(11, 13)
+        url = f"/api/facility-bookings/{pending.pk}/"
+        self.assertEqual(self.client.patch(url, {"status": "approved"}, format="json").status_code, 400)
+        moved = (self.day + timedelta(hours=12)).isoformat()
+        self.assertEqual(self.client.patch(url, {"status": "approved", "start_time": moved}, format="json").status_code, 200)
+
+        earlier = (self.day + timedelta(hours=9)).isoformat()
+        response = self.client.patch(url, {"start_time": earlier}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["conflicts"], [approved.pk])
+        self.assertEqual(FacilityBooking.objects.filter(status="approved").count(), 2)
+
+    def test_create_bulk_and_conflicts_action(self):
+        approved = self.book(10, 12, status="approved")
+        resident = APIClient()
+        resident.force_authenticate(self.resident)
+        slot = {"facility_name": "Hall", "start_time": (self.day + timedelta(hours=11)).isoformat(), "end_time": (self.day + timedelta(hours=13)).isoformat()}
+        response = resident.post("/api/facility-bookings/", slot, format="json")
+        self.assertEqual((response.status_code, response.data["conflicts"]), (400, [approved.pk]))
+
+        clash, first, second, open_ended = self.book(9, 11), self.book(14, 16), self.book(15, 17), self.book(18, None)
+        self.assertEqual(self.client.get(f"/api/facility-bookings/{clash.pk}/conflicts/").data["conflicts"], [approved.pk])
+        response = self.client.patch("/api/facility-bookings/bulk-status/", {"ids": [clash.pk, first.pk, second.pk, open_ended.pk], "status": "approved"}, format="json")
+        self.assertEqual(response.data["updated"], [first.pk])
+        self.assertEqual(set(response.data["errors"]), {str(clash.pk), str(second.pk), str(open_ended.pk)})
+
+    def test_availability_lists_booked_and_free_slots(self):
+        approved = self.book(10, 12, status="approved")
+        self.book(13, 14)  # Pending bookings leave the slot free
+        params = {"from": self.day.isoformat(), "to": (self.day + timedelta(hours=24)).isoformat()}
+        response = self.client.get(f"/api/facilities/{self.hall.pk}/availability/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([slot["id"] for slot in response.data["booked"]], [approved.pk])
+        self.assertEqual(
+            [(slot["start_time"], slot["end_time"]) for slot in response.data["free"]],
+            [(self.day, approved.start_time), (approved.end_time, self.day + timedelta(hours=24))],
+        )
+
+
+class BulkStatusTests(TestCase):
+    """
+    Bulk status endpoints update the valid ids together and report the rest per id.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 3)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def patch(self, url, ids, **data):
+        return self.client.patch(url, {"ids": ids, **data}, format="json")
+
+    def test_payments_bulk_approve(self):
+        first, second, third = Payment.objects.order_by("pk").values_list("pk", flat=True)
+        response = self.patch("/api/payments/bulk-approve/", [first, second, 99999, "x"], payment_status="completed")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], [first, second])
+        self.assertEqual(response.data["errors"], {"99999": "Not found.", "x": "Invalid id."})
+        self.assertEqual(
+            dict(Payment.objects.values_list("pk", "payment_status")),
+            {first: "completed", second: "completed", third: "pending"},
+        )
+        self.assertEqual(self.patch("/api/payments/bulk-approve/", [third], payment_status="paid").status_code, 400)
+        self.assertEqual(self.patch("/api/payments/bulk-approve/", [], payment_status="completed").status_code, 400)
+
+    def test_complaints_bulk_update_status(self):
+        complaint = Complaint.objects.order_by("pk").first()
+        response = self.patch("/api/complaints/bulk-update-status/", [complaint.pk, complaint.pk, -1], status="resolved")
+        self.assertEqual(response.data["updated"], [complaint.pk])
+        self.assertEqual(response.data["errors"], {"-1": "Not found."})
+        refreshed = Complaint.objects.get(pk=complaint.pk)
+        self.assertEqual(refreshed.status, "resolved")
+        self.assertGreater(refreshed.updated_at, complaint.updated_at)  # `.update()` still stamps auto_now columns
+        self.assertEqual(self.patch("/api/complaints/bulk-update-status/", [complaint.pk], status="closed").status_code, 400)
+
+        resident = APIClient()
+        resident.force_authenticate(Resident.objects.get(username="resident0"))
+        self.assertEqual(resident.patch("/api/complaints/bulk-update-status/", {"ids": [complaint.pk], "status": "open"}, format="json").status_code, 403)
+
+    def test_bookings_bulk_status(self):
+        ids = list(FacilityBooking.objects.order_by("pk").values_list("pk", flat=True))
+        response = self.patch("/api/facility-bookings/bulk-status/", ids + [0], status="rejected")
+        self.assertEqual(response.data["updated"], ids)
+        self.assertEqual(response.data["errors"], {"0": "Not found."})
+        self.assertFalse(FacilityBooking.objects.exclude(status="rejected").exists())
+        self.assertEqual(self.patch("/api/facility-bookings/bulk-status/", ids, status="pending").status_code, 400)
+
+
+class ResponseCacheTests(TestCase):
+    """
+    Cached lists and profiles are served until a write commits, then recomputed.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 2)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def names(self, url, field):
+        return [row[field] for row in self.client.get(url).data["results"]]
+
+    def test_writes_invalidate_after_commit(self):
+        self.assertEqual(len(self.names("/api/notices/", "title")), 2)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Notice.objects.create(title="Lift maintenance", content="Sunday", posted_by=self.admin)
+            self.assertEqual(len(self.names("/api/notices/", "title")), 2)  # Not invalidated before the commit
+        for callback in callbacks:
+            callback()
+        self.assertIn("Lift maintenance", self.names("/api/notices/", "title"))
+
+        self.names("/api/facilities/", "name")
+        with self.captureOnCommitCallbacks(execute=True):
+            Facility.objects.filter(name="Facility 0").get().delete()
+        self.assertEqual(self.names("/api/facilities/", "name"), ["Facility 1"])
+
+    def test_profile_and_admin_renames(self):
+        self.assertEqual(self.client.get("/api/user-profile/").data["username"], "admin")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.username = "manager"
+            self.admin.save()
+        self.assertEqual(self.client.get("/api/user-profile/").data["username"], "manager")
+        self.assertEqual(set(self.names("/api/notices/", "posted_by")), {"manager"})
+
+
+class ConditionalGetTests(TestCase):
+    """
+    List and detail ETags answer 304 until the rows, or the residents they show, change.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 3)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code
+
+    def test_list_and_detail_etags_follow_edits(self):
+        complaint = Complaint.objects.order_by("pk").first()
+        for url in ("/api/complaints/", f"/api/complaints/{complaint.pk}/"):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(self.revalidate(url, first), 304)
+                self.assertNotIn("Last-Modified", first)  # Embeds residents; revalidated by ETag only
+
+                complaint.refresh_from_db()
+                complaint.status = "in_progress"
+                complaint.save()
+                self.assertEqual(self.revalidate(url, first), 200)
+
+        listed = self.client.get("/api/complaints/")
+        Complaint.objects.create(title="New", description="Broken light", resident=complaint.resident)
+        self.assertEqual(self.revalidate("/api/complaints/", listed), 200)
+
+    def test_last_modified_only_on_plain_details(self):
+        facility = Facility.objects.order_by("pk").first()
+        url = f"/api/facilities/{facility.pk}/"
+        detail = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=detail["Last-Modified"]).status_code, 304)
+
+        # A delete leaves MAX(updated_at) alone, so a list date would answer 304 with a stale page
+        listed = self.client.get("/api/facilities/")
+        self.assertNotIn("Last-Modified", listed)
+        with self.captureOnCommitCallbacks(execute=True):
+            Facility.objects.order_by("pk").last().delete()
+        self.assertEqual(self.revalidate("/api/facilities/", listed), 200)
+
+    def test_resident_renames_change_etags(self):
+        complaint = Complaint.objects.order_by("pk").first()
+        urls = ["/api/complaints/", f"/api/complaints/{complaint.pk}/", "/api/facility-bookings/", "/api/notices/"]
+        before = {url: self.client.get(url) for url in urls}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            complaint.resident.save(update_fields=["last_login"])  # Logins leave the ETags alone
+        self.assertEqual(self.revalidate("/api/complaints/", before["/api/complaints/"]), 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            complaint.resident.username = "renamed"
+            complaint.resident.save()
+            self.admin.username = "manager"
+            self.admin.save()
+        for url, response in before.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.revalidate(url, response), 200)
+        self.assertEqual(self.client.get(f"/api/complaints/{complaint.pk}/").data["resident_name"], "renamed")
+
+
+class TokenAuthenticationTests(TestCase):
+    """
+    Cached and signed tokens authenticate without the token lookup and stop working
+    once logged out, deactivated or changed.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Resident.objects.create_user(
+            username="resident", password="secret-pass", role="resident", apartment_no="T-1", phone_number="9999999999",
+        )
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+
+    def login(self, **data):
+        response = self.client.post("/api/login/", {"username": "resident", "password": "secret-pass", **data}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return response.data["token"]
+
+    def get(self, key, url="/api/user-profile/"):
+        return self.client.get(url, HTTP_AUTHORIZATION=f"Token {key}")
+
+    def test_database_tokens_are_cached_and_evicted(self):
+        key = self.login()
+        authentication = CachedTokenAuthentication()
+        with self.assertNumQueries(1):
+            authentication.authenticate_credentials(key)
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate_credentials(key)
+        self.assertEqual((user.pk, token.key), (self.user.pk, key))
+
+        self.user.is_active = False
+        self.user.save()  # Resident signals evict the user's tokens
+        self.assertEqual(self.get(key).status_code, 401)
+        self.user.is_active = True
+        self.user.save()
+        self.assertEqual(self.get(key).status_code, 200)
+
+        self.assertEqual(self.client.post("/api/logout/", HTTP_AUTHORIZATION=f"Token {key}").status_code, 200)
+        self.assertEqual(self.get(key).status_code, 401)
+
+    def test_token_cache_ttl_and_lru(self):
+        tokens = TokenCache(maxsize=2, ttl=60)
+        for key in ("a", "b", "c"):
+            tokens.set(key, self.user, None)
+        self.assertEqual((tokens.get("a"), len(tokens)), (None, 2))  # Least recently used goes first
+        with mock.patch("core.authentication.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertIsNone(tokens.get("b"))
+        tokens.invalidate_user(self.user.pk)
+        self.assertIsNone(tokens.get("c"))
+
+    def test_signed_tokens(self):
+        key = self.login(token_type="signed")
+        with self.assertNumQueries(0):
+            CachedTokenAuthentication().authenticate_credentials(key)
+        self.assertEqual(self.get(key).data["username"], "resident")
+
+        payload, signature = key.rsplit(":", 1)
+        self.assertEqual(self.get(f"{payload}:{signature[::-1]}").status_code, 401)
+        with override_settings(SIGNED_TOKEN_MAX_AGE=-1):
+            self.assertEqual(self.get(key).data["detail"], "Token has expired.")
+
+        self.client.patch("/api/update-profile/", {"first_name": "Rhea"}, content_type="application/json", HTTP_AUTHORIZATION=f"Token {key}")
+        self.assertEqual(self.get(key).status_code, 200)  # Profile edits keep the token
+        self.assertEqual(self.client.post("/api/logout/", HTTP_AUTHORIZATION=f"Token {key}").status_code, 200)
+        self.assertEqual(self.get(key).data["detail"], "Token has been revoked.")
+
+    def test_role_changes_revoke_signed_tokens(self):
+        key = self.login(token_type="signed")
+        self.user.role = "security"
+        self.user.save()
+        self.assertEqual(self.get(key).status_code, 401)
+        self.assertEqual(self.get(self.login(token_type="signed")).status_code, 200)
+
+
+class DashboardTests(TestCase):
+    """
+    The dashboard answers in one cached response: society-wide figures for admins,
+    a resident's own figures otherwise.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 3)
+        rebuild_ledger()  # The seeded payments bypass the API
+        cls.resident = Resident.objects.get(username="resident0")
+        Complaint.objects.filter(resident__username="resident1").update(status="resolved")
+        cls.booking = FacilityBooking.objects.create(
+            resident=cls.resident, facility_name="Facility 0", start_time=timezone.now() + timedelta(days=1),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def dashboard(self, user, url="/api/dashboard/"):
+        self.client.force_authenticate(user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_admin_sees_the_whole_society(self):
+        data = self.dashboard(self.admin)
+        self.assertEqual(set(data), {"profile", "notices", "complaints", "payments", "upcoming_bookings"})
+        self.assertEqual(data["profile"]["username"], "admin")
+        self.assertEqual(data["complaints"]["counts"], {"open": 2, "in_progress": 0, "resolved": 1})
+        self.assertEqual(len(data["complaints"]["recent"]), 3)
+        self.assertEqual(data["payments"], {"pending_count": 3, "pending_total": "4500.00"})
+        self.assertEqual(len(self.dashboard(self.admin, "/api/dashboard/?limit=1")["notices"]), 1)
+
+    def test_residents_see_their_own_figures(self):
+        data = self.dashboard(self.resident)
+        self.assertEqual(data["complaints"]["counts"], {"open": 1, "in_progress": 0, "resolved": 0})
+        self.assertEqual({row["resident_name"] for row in data["complaints"]["recent"]}, {"resident0"})
+        self.assertEqual(data["payments"], {"pending_count": 1, "pending_total": "1500.00"})
+        self.assertEqual([row["id"] for row in data["upcoming_bookings"]], [self.booking.pk])
+        self.assertEqual(len(data["notices"]), 3)  # Notices are shared
+
+    def test_cached_per_user_until_their_rows_change(self):
+        self.dashboard(self.resident)
+        with self.assertNumQueries(0):
+            self.dashboard(self.resident)
+        self.assertEqual(self.dashboard(self.admin)["profile"]["username"], "admin")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Complaint.objects.create(title="Noise", description="Late party", resident=self.resident)
+            # Dropped only once the write commits, so no reader re-caches the old figures
+            self.assertEqual(self.dashboard(self.resident)["complaints"]["counts"]["open"], 1)
+        self.assertEqual(self.dashboard(self.resident)["complaints"]["counts"]["open"], 2)
+
+
+class SeedAndBenchmarkTests(TestCase):
+    """
+    Smoke-test the synthetic data generator and the benchmark harness.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.counts = seed_synthetic_society(
+            residents=4, years=1, guards=1, facilities=2, visitors_per_year=3,
+            complaints_per_year=2, bookings_per_year=2, batch_size=5, seed=1,
+        )
+
+    def test_seed_creates_backdated_rows(self):
+        self.assertEqual(self.counts["residents"], 6)
+        self.assertEqual(Visitor.objects.count(), 12)
+        self.assertEqual(SecurityLog.objects.count(), 12)
+        self.assertEqual(Payment.objects.count(), 48)
+        self.assertEqual(Complaint.objects.count(), 8)
+        oldest = Payment.objects.order_by("payment_date").first().payment_date
+        self.assertLess(oldest, Payment.objects.order_by("-payment_date").first().payment_date)
+        self.assertEqual(Resident.objects.filter(is_staff=True, role="admin").count(), 1)
+
+    def test_benchmark_reports_every_scenario(self):
+        only = ["dashboard", "notices_list", "security_logs_list", "visitor_entry"]
+        report = run_benchmark(requests=8, only=only, host="testserver", memory=False)
+        self.assertEqual(set(report["endpoints"]), set(only))
+        self.assertEqual(report["endpoints"]["dashboard"]["statuses"], {"200": report["endpoints"]["dashboard"]["count"]})
+        self.assertEqual(Visitor.objects.count(), 12)  # Writes were rolled back
+
+        logs = report["endpoints"]["security_logs_list"]
+        self.assertEqual(compare_reports(report, report), [])
+        fewer_queries = {"endpoints": {"security_logs_list": dict(logs, max_queries=logs["max_queries"] - 1)}}
+        self.assertEqual(len(compare_reports(fewer_queries, report)), 1)
+
+
+class RequestMetricsTests(TestCase):
+    """
+    Check the instrumentation middleware feeds `/api/metrics/` and the slow-request log.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 3)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_metrics_and_slow_request_log(self):
+        client = APIClient()  # Loads the middleware under the overridden threshold
+        client.force_authenticate(self.admin)
+        with self.assertLogs("core.slow_requests", level="WARNING") as logs:
+            client.get("/api/security-logs/")
+            response = client.get("/api/metrics/")
+        self.assertIn("core_securitylog", logs.output[0])
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('digisamuday_request_db_queries_bucket{view="securitylog-list",method="GET",le="1"}', body)
+        self.assertIn('digisamuday_requests_total{view="securitylog-list",method="GET",status="200"}', body)
+
+    async def test_queries_are_counted_under_asgi(self):
+        token = await sync_to_async(lambda: Token.objects.create(user=self.admin).key)()
+        for path, view in (("/api/complaints/", "async-complaint-list"), ("/api/payments/", "payment-list")):
+            with self.settings(ROOT_URLCONF=AsyncURLConf), mock.patch.object(metrics.db_queries, "observe") as observe:
+                response = await self.async_client.get(path, headers={"Authorization": f"Token {token}"})
+            with self.subTest(path=path):
+                self.assertEqual(response.status_code, 200)
+                (labels, queries), _ = observe.call_args
+                self.assertEqual(labels, (view, "GET"))
+                self.assertGreater(queries, 0)
+
+
+class LiveEventTests(TestCase):
+    """
+    Check model changes reach the right event subscribers.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 2)
+        cls.resident = Resident.objects.get(username="resident0")
+
+    def setUp(self):
+        use_temporary_path(self, "SEARCH_INDEX_PATH", "search.sqlite3")  # Complaint saves update the index
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def subscribe(self, channel):
+        subscription = get_broker().subscribe([channel], loop=self.loop)
+        self.addCleanup(subscription.close)
+        return subscription
+
+    def next_event(self, subscription):
+        return self.loop.run_until_complete(asyncio.wait_for(subscription.get(), timeout=1))
+
+    def test_status_changes_reach_the_owner_after_commit(self):
+        subscription = self.subscribe(user_channel(self.resident.pk))
+        complaint = Complaint.objects.get(resident=self.resident)
+        with self.captureOnCommitCallbacks(execute=True):
+            complaint.status = "resolved"
+            complaint.save()
+        self.assertEqual(self.next_event(subscription)["data"], {"id": complaint.pk, "status": "resolved"})
+
+        payments = Payment.objects.filter(resident=self.resident)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_update_status(Payment.objects.all(), [payments[0].pk], "payment_status", "completed")
+        event = self.next_event(subscription)
+        self.assertEqual((event["type"], event["data"]["status"]), ("payment.status", "completed"))
+
+    def test_new_requests_reach_admins_only(self):
+        admins = self.subscribe(role_channel("admin"))
+        owner = self.subscribe(user_channel(self.resident.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            FacilityBooking.objects.create(resident=self.resident, facility_name="Facility 0")
+        self.assertEqual(self.next_event(admins)["type"], "booking.created")
+        self.assertTrue(owner.queue.empty())
+
+    async def test_stream_requires_authentication(self):
+        response = await self.async_client.get("/api/events/")
+        self.assertEqual(response.status_code, 401)
+
+
+class AsyncURLConf:
+    urlpatterns = core_urls.async_read_urlpatterns + core_urls.urlpatterns
+
+
+class AsyncReadViewTests(TestCase):
+    """
+    The async read views must answer exactly like the sync views they shadow.
+    """
+    paths = [
+        "/api/user-profile/", "/api/complaints/", "/api/notices/", "/api/facilities/",
+        "/api/security-logs/", "/api/complaints/?paginate=false", "/api/notices/?page_size=5",
+        "/api/complaints/?fields=id,title", "/api/security-logs/?exclude=guard_name",
+        "/api/complaints/?status=open&ordering=title&page_size=3", "/api/notices/?count_only=1",
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 8)
+        cls.token = Token.objects.create(user=cls.admin).key
+
+    def setUp(self):
+        cache.clear()
+
+    async def get_async(self, path, **headers):
+        with self.settings(ROOT_URLCONF=AsyncURLConf):
+            return await self.async_client.get(path, headers={"Authorization": f"Token {self.token}", **headers})
+
+    def get_sync(self, path):
+        return self.client.get(path, headers={"Authorization": f"Token {self.token}"})
+
+    async def test_async_views_match_sync_views(self):
+        for path in self.paths:
+            sync_response = await sync_to_async(self.get_sync)(path)
+            async_response = await self.get_async(path)
+            with self.subTest(path=path):
+                self.assertEqual(async_response.status_code, 200)
+                self.assertEqual(async_response.json(), sync_response.json())
+                self.assertEqual(async_response.get("ETag"), sync_response.get("ETag"))
+
+    async def test_conditional_get_and_authentication(self):
+        first = await self.get_async("/api/notices/")
+        second = await self.get_async("/api/notices/", **{"If-None-Match": first["ETag"]})
+        self.assertEqual(second.status_code, 304)
+
+        with self.settings(ROOT_URLCONF=AsyncURLConf):
+            anonymous = await self.async_client.get("/api/notices/")
+        self.assertEqual(anonymous.status_code, 401)
+
+    async def test_errors_match_sync_views(self):
+        for path, status_code in (("/api/complaints/?cursor=garbage", 404), ("/api/complaints/?fields=nope", 400)):
+            sync_response = await sync_to_async(self.get_sync)(path)
+            async_response = await self.get_async(path)
+            with self.subTest(path=path):
+                self.assertEqual((async_response.status_code, sync_response.status_code), (status_code, status_code))
+                self.assertEqual(async_response.json(), sync_response.json())
+
+
+class SparseFieldsetTests(TestCase):
+    """
+    `?fields=`/`?exclude=` narrow both the response and the columns the query reads.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 5)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_with_sql(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, queries[-1]["sql"]  # The page query runs after the ETag aggregate
+
+    def test_fields_project_rows_and_columns(self):
+        response, sql = self.get_with_sql("/api/residents/?fields=id,apartment_no")
+        self.assertEqual(set(response.data["results"][0]), {"id", "apartment_no"})
+        self.assertNotIn("email", sql)
+        self.assertIn("date_joined", sql)  # The pagination key is always loaded
+
+        response, sql = self.get_with_sql("/api/complaints/?fields=id,title")
+        self.assertEqual(set(response.data["results"][0]), {"id", "title"})
+        self.assertNotIn("description", sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_exclude_keeps_related_fields(self):
+        response, sql = self.get_with_sql("/api/complaints/?exclude=description")
+        row = response.data["results"][0]
+        self.assertNotIn("description", row)
+        self.assertEqual(row["resident_name"], "resident4")
+        self.assertNotIn("description", sql)
+
+        with self.assertNumQueries(2):  # Page plus ETag aggregate; no query per row
+            response = self.client.get("/api/notices/?fields=title,posted_by")
+        self.assertEqual(response.data["results"][0]["posted_by"], "admin")
+
+    def get_residents(self, url):
+        request = RequestFactory().get(url)
+        force_authenticate(request, user=self.admin)
+        return get_residents(request)
+
+    def test_function_views_and_pagination(self):
+        first = self.get_residents("/?fields=username&page_size=2")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([set(row) for row in first.data["results"]], [{"username"}] * 2)
+        second = self.get_residents(first.data["next"])
+        self.assertEqual(len(second.data["results"]), 2)
+        self.assertNotEqual(first.data["results"], second.data["results"])
+
+    def test_unknown_fields_and_writes(self):
+        response = self.client.get("/api/complaints/?fields=id,secret")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("secret", response.data["fields"])
+
+        response = self.client.post("/api/facilities/?fields=id", {"name": "Gym", "description": "Weights"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["name"], "Gym")  # Writes keep the full shape
+
+
+class ListFilterTests(TestCase):
+    """
+    `?status=`, `?from=`/`?to=`, `?ordering=` and `?count_only=` are applied in SQL.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 6)
+        Complaint.objects.filter(resident__username__in=["resident0", "resident1"]).update(status="resolved")
+        Complaint.objects.filter(resident__username="resident2").update(created_at=timezone.now() - timedelta(days=40))
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def count(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data["count"]
+
+    def test_filters(self):
+        self.assertEqual(self.count("/api/complaints/?count_only=1"), 6)
+        self.assertEqual(self.count("/api/complaints/?status=resolved&count_only=1"), 2)
+        self.assertEqual(self.count("/api/complaints/?status=open,resolved&count_only=1"), 6)
+        self.assertEqual(self.count("/api/complaints/?apartment=A-3&count_only=1"), 1)
+        self.assertEqual(self.count("/api/security-logs/?apartment=A-3&count_only=1"), 1)
+        since = (timezone.now() - timedelta(days=7)).date().isoformat()
+        self.assertEqual(self.count(f"/api/complaints/?from={since}&count_only=1"), 5)
+        self.assertEqual(self.count(f"/api/complaints/?to={since}&count_only=1"), 1)
+        self.assertEqual(self.count("/api/facility-bookings/?facility=Facility 1&status=pending&count_only=1"), 1)
+
+        response = self.client.get("/api/complaints/?status=resolved")
+        self.assertEqual({row["resident_name"] for row in response.data["results"]}, {"resident0", "resident1"})
+
+    def test_count_only_runs_one_count_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.count("/api/residents/?role=resident&count_only=1"), 6)
+        with self.assertNumQueries(2):  # Plus the ETag aggregate
+            self.assertEqual(self.count("/api/payments/?status=pending&count_only=1"), 6)
+
+    def test_ordering_pages_both_ways(self):
+        first = self.client.get("/api/complaints/?ordering=title&page_size=4&fields=title")
+        titles = [row["title"] for row in first.data["results"]]
+        self.assertEqual(titles, sorted(titles))
+        second = self.client.get(first.data["next"])
+        self.assertEqual([row["title"] for row in second.data["results"]], ["Complaint 4", "Complaint 5"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual([row["title"] for row in back.data["results"]], titles)
+
+        descending = self.client.get("/api/complaints/?ordering=-title&paginate=false&fields=title")
+        self.assertEqual([row["title"] for row in descending.data], sorted(titles + ["Complaint 4", "Complaint 5"], reverse=True))
+
+    def test_invalid_parameters(self):
+        for url, param in (
+            ("/api/complaints/?status=closed", "status"),
+            ("/api/complaints/?resident=abc", "resident"),
+            ("/api/complaints/?from=yesterday", "from"),
+            ("/api/complaints/?ordering=description", "ordering"),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(param, response.data)
+
+
+class FastListParityTests(TestCase):
+    """
+    The fast list path must write the same bytes as the DRF serializers.
+    """
+    urls = [
+        "/api/residents/", "/api/complaints/", "/api/payments/", "/api/facilities/",
+        "/api/facility-bookings/", "/api/notices/", "/api/security-logs/",
+        "/api/complaints/?paginate=false", "/api/payments/?page_size=2",
+        "/api/complaints/?fields=id,resident_name", "/api/security-logs/?exclude=guard_name",
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        cls.guard = create_guard()
+        seed_society(cls.admin, 4)
+        resident = Resident.objects.get(username="resident0")
+        Complaint.objects.create(title='Tap "leak" \\ é 漏水 😀\u2028', description="Line\n\tbreak\x01", resident=resident)
+        Payment.objects.create(amount="1234.5", payment_method="upi", resident=resident)
+        Visitor.objects.create(name="Late visitor", phone_number="8888888888", resident=resident, check_out=timezone.now())
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_both(self, url):
+        fast = self.client.get(url)
+        cache.clear()
+        FastListMixin.fast_list = False
+        try:
+            slow = self.client.get(url)
+        finally:
+            FastListMixin.fast_list = True
+        cache.clear()
+        return fast, slow
+
+    def test_fast_list_matches_serializers(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                fast, slow = self.get_both(url)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+
+        self.client.force_authenticate(self.guard)
+        fast, slow = self.get_both("/api/visitors/")
+        self.assertEqual(len(fast.json()["results"]), 5)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_plans_compile_or_fall_back(self):
+        for prefix, viewset, _ in core_urls.router.registry:
+            with self.subTest(prefix=prefix):
+                self.assertIsNotNone(RowPlan.build(viewset.serializer_class()))
+        self.assertIsNone(RowPlan.build(ReportJobSerializer()))  # JSONField and UUID pk
+
+        response = self.client.get("/api/complaints/?format=api")  # The browsable API takes the DRF path
+        self.assertEqual(response.status_code, 200)
+
+    def test_serializer_benchmark(self):
+        report = run_serializer_benchmark(rows=5, iterations=1)
+        self.assertEqual(set(report["targets"]), {"complaints", "payments", "security_logs"})
+        for name, results in report["targets"].items():
+            with self.subTest(name=name):
+                self.assertTrue(results["identical"])
+                self.assertEqual(results["fast"]["rows"], results["drf"]["rows"])
+
+
+class GateCheckInTests(TestCase):
+    """
+    Check-ins write a visitor and its security log together, or nothing.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.guard = create_guard()
+        cls.resident = Resident.objects.create_user(
+            username="resident", password="pass", role="resident",
+            apartment_no="B-204", phone_number="9999999999",
+        )
+
+    def setUp(self):
+        invalidate_resident_directory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.guard)
+
+    def test_single_check_in_logs_visitor_and_entry(self):
+        response = self.client.post("/api/visitors/check-in/", {"name": "Courier", "phone_number": "8000000000", "apartment_no": "b-204"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        log = SecurityLog.objects.select_related("visitor").get()
+        self.assertEqual((log.visitor.pk, log.visitor.resident_id, log.guard_name), (response.data["visitor_id"], self.resident.pk, "guard"))
+
+        # The resident lookup is cached: only the two inserts and their savepoint remain
+        with self.assertNumQueries(4):
+            self.client.post("/api/visitors/check-in/", {"name": "Cab", "phone_number": "8000000001", "resident_id": self.resident.pk}, format="json")
+
+        response = self.client.post("/api/visitors/check-in/", {"name": "Nobody", "phone_number": "1", "apartment_no": "Z-9"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Visitor.objects.count(), SecurityLog.objects.count())
+
+        request = RequestFactory().post("/", {"name": "Maid", "phone_number": "8000000002", "resident_id": self.resident.pk}, content_type="application/json")
+        force_authenticate(request, user=self.guard)
+        self.assertEqual(log_visitor_entry(request).status_code, 201)
+        self.assertEqual(SecurityLog.objects.count(), 3)
+
+    def test_batch_writes_valid_entries_and_reports_the_rest(self):
+        entries = [
+            {"name": "Guest 1", "phone_number": "8000000000", "apartment_no": "B-204"},
+            {"name": "Guest 2", "apartment_no": "B-204"},
+            {"name": "Guest 3", "phone_number": "8000000000", "resident_id": 10 ** 6},
+            {"name": "Guest 4", "phone_number": "8000000000", "resident": self.resident.pk, "vehicle_number": "KA01"},
+        ]
+        response = self.client.post("/api/visitors/check-in/batch/", {"entries": entries}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row["index"] for row in response.data["logged"]], [0, 3])
+        self.assertEqual(set(response.data["errors"]), {"1", "2"})
+        self.assertEqual(SecurityLog.objects.filter(visitor__resident=self.resident, exit_time__isnull=True).count(), 2)
+
+        self.client.force_authenticate(self.resident)
+        response = self.client.post("/api/visitors/check-in/batch/", {"entries": entries}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_entries_are_validated_like_the_visitor_api(self):
+        entries = [
+            {"name": {"x": 1}, "phone_number": "8000000000", "apartment_no": "B-204"},
+            {"name": "Guest", "phone_number": "8" * 16, "apartment_no": "B-204"},
+            {"name": "Guest", "phone_number": "8000000000", "apartment_no": "B-204", "vehicle_number": "K" * 21},
+            {"name": "x" * 101, "phone_number": "8000000000", "apartment_no": "B-204"},
+            {"name": "Guest", "phone_number": "8000000000", "apartment_no": "B-204", "vehicle_number": ""},
+        ]
+        response = self.client.post("/api/visitors/check-in/batch/", {"entries": entries}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row["index"] for row in response.data["logged"]], [4])
+        errors = response.data["errors"]
+        self.assertEqual((set(errors["0"]), set(errors["1"]), set(errors["2"]), set(errors["3"])), ({"name"}, {"phone_number"}, {"vehicle_number"}, {"name"}))
+        self.assertIsNone(Visitor.objects.get().vehicle_number)
+
+        response = self.client.post("/api/visitors/check-in/", entries[1], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Visitor.objects.count(), 1)
+
+    def test_inside_lists_open_logs_and_tracks_check_in_and_checkout(self):
+        cache.clear()
+        for i in range(30):  # Visitors who have already left
+            visitor = Visitor.objects.create(name=f"Past {i}", phone_number="1", resident=self.resident)
+            SecurityLog.objects.create(visitor=visitor, guard_name="guard", exit_time="2024-01-01T00:00:00Z")
+        self.client.post("/api/visitors/check-in/", {"name": "Plumber", "phone_number": "8000000000", "apartment_no": "B-204", "vehicle_number": "KA01"}, format="json")
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/security-logs/inside/")
+        self.assertEqual(response.data["count"], 1)
+        visitor = response.data["visitors"][0]
+        self.assertEqual((visitor["visitor_name"], visitor["vehicle_number"], visitor["apartment_no"]), ("Plumber", "KA01", "B-204"))
+        self.assertEqual(self.client.get("/api/security-logs/inside/count/").data["count"], 1)
+        with self.assertNumQueries(0):  # Served from the premises cache
+            self.assertEqual(self.client.get("/api/security-logs/inside/count/").data["count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/visitors/check-in/batch/", {"entries": [{"name": "Cab", "phone_number": "1", "apartment_no": "B-204"}]}, format="json")
+        self.assertEqual(self.client.get("/api/security-logs/inside/count/").data["count"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/security-logs/{visitor['id']}/checkout/")
+            # The cache is dropped only once the checkout commits, so no reader re-caches the old list
+            self.assertEqual(self.client.get("/api/security-logs/inside/count/").data["count"], 2)
+        self.assertEqual(self.client.get("/api/security-logs/inside/count/").data["count"], 1)
+
+        self.client.force_authenticate(self.resident)
+        self.assertEqual(self.client.get("/api/security-logs/inside/").status_code, 403)
+
+
+class VisitArchiveTests(TestCase):
+    """
+    Archiving moves old visits out of the live tables; exports still see them.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        seed_society(cls.admin, 3)
+        old = timezone.now() - timedelta(days=400)
+        Visitor.objects.filter(name__in=["Visitor 0", "Visitor 1"]).update(check_in=old)
+        SecurityLog.objects.filter(visitor__name__in=["Visitor 0", "Visitor 1"]).update(entry_time=old, exit_time=old + timedelta(hours=1))
+        SecurityLog.objects.filter(visitor__name="Visitor 1").update(exit_time=None)  # Still inside: stays live
+        cls.old = old
+
+    def setUp(self):
+        use_temporary_path(self, "ARCHIVE_DIR")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, report, query=""):
+        response = self.client.get(f"/api/reports/{report}/{query}")
+        return b"".join(response.streaming_content).decode().splitlines()[1:]
+
+    def test_archive_moves_closed_old_visits_and_exports_read_them_back(self):
+        before = {report: self.export(report) for report in ("visitors", "security_logs")}
+        counts = archive_visits(retention_days=180)
+        self.assertEqual((counts["visitors"], counts["security_logs"]), (1, 1))
+        self.assertFalse(Visitor.objects.filter(name="Visitor 0").exists())
+        self.assertFalse(SecurityLog.objects.filter(visitor__name="Visitor 0").exists())
+        self.assertTrue(Visitor.objects.filter(name="Visitor 1").exists())
+
+        for report, rows in before.items():
+            with self.subTest(report=report):
+                self.assertEqual(self.export(report), rows)
+
+        # A range after the archived month opens no partition and returns only live rows
+        since = (self.old + timedelta(days=40)).date().isoformat()
+        self.assertEqual(ARCHIVES["visitors"].partitions(timezone.now() - timedelta(days=30)), [])
+        self.assertEqual(len(self.export("visitors", f"?from={since}")), 1)
+        self.assertEqual(archive_visits(retention_days=180)["visitors"], 0)
+
+    def test_archived_history_is_admin_only(self):
+        archive_visits(retention_days=180)
+        guard = APIClient()
+        guard.force_authenticate(create_guard())
+        for report in ("visitors", "security_logs"):
+            with self.subTest(report=report):
+                self.assertEqual(APIClient().get(f"/api/reports/{report}/").status_code, 401)
+                self.assertEqual(guard.get(f"/api/reports/{report}/").status_code, 403)
+
+
+class SearchTests(TestCase):
+    """
+    The search index follows saves and deletes and applies role visibility.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        cls.alice, cls.bob = [
+            Resident.objects.create_user(
+                username=name, password="pass", role="resident", apartment_no=f"C-{i}", phone_number="9999999999",
+            )
+            for i, name in enumerate(["alice", "bob"])
+        ]
+
+    def setUp(self):
+        use_temporary_path(self, "SEARCH_INDEX_PATH", "search.sqlite3")
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.leak = Complaint.objects.create(title="Water leaking", description="Ceiling drips near the lift lobby", resident=self.alice)
+            Complaint.objects.create(title="Noise", description="Loud music after midnight", resident=self.bob)
+            self.notice = Notice.objects.create(title="Lift maintenance", content="Lift B is down on Sunday", posted_by=self.admin)
+
+    def search(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/search/", params)
+        self.assertEqual(response.status_code, 200)
+        return [(result["type"], result["id"]) for result in response.data["results"]]
+
+    def test_ranked_results_respect_visibility(self):
+        # Title matches rank above body matches
+        self.assertEqual(self.search(self.admin, q="lift"), [("notice", self.notice.pk), ("complaint", self.leak.pk)])
+        self.assertEqual(self.search(self.alice, q="lif"), [("notice", self.notice.pk), ("complaint", self.leak.pk)])
+        self.assertEqual(self.search(self.bob, q="lift"), [("notice", self.notice.pk)])
+        self.assertEqual(self.search(self.bob, q="leaking", type="complaint"), [])
+        self.assertEqual(self.search(self.admin, q='"leak*" ('), [("complaint", self.leak.pk)])
+
+    def test_index_follows_edits_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.leak.title = "Pipe burst"
+            self.leak.save()
+            self.notice.delete()
+        self.assertEqual(self.search(self.admin, q="pipe"), [("complaint", self.leak.pk)])
+        self.assertEqual(self.search(self.admin, q="sunday"), [])
+        self.assertEqual(self.client.get("/api/search/").status_code, 400)
+
+
+class PaymentLedgerTests(TestCase):
+    """
+    The payment ledger follows API writes, and reconciliation finds and repairs drift.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        cls.resident = Resident.objects.create_user(
+            username="resident", password="pass", role="resident", apartment_no="D-1", phone_number="9999999999",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def pay(self, amount):
+        self.client.force_authenticate(self.resident)
+        response = self.client.post("/api/payments/", {"amount": amount, "payment_method": "upi"})
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def summary(self, user, url="/api/payments/summary/"):
+        self.client.force_authenticate(user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_api_writes_keep_ledger_current(self):
+        first, second, third = self.pay("1500.00"), self.pay("2000.00"), self.pay("250.50")
+        self.client.force_authenticate(self.admin)
+        self.client.patch(f"/api/payments/{first}/approve_payment/", {"payment_status": "completed"})
+        self.client.patch("/api/payments/bulk-approve/", {"ids": [second], "payment_status": "rejected"}, format="json")
+
+        totals = self.summary(self.resident)["totals"]
+        self.assertEqual(totals["collected"], {"count": 1, "total": "1500.00"})
+        self.assertEqual(totals["rejected"], {"count": 1, "total": "2000.00"})
+        self.assertEqual(totals["pending"], {"count": 1, "total": "250.50"})
+
+        self.client.delete(f"/api/payments/{third}/")
+        with self.assertNumQueries(2):
+            data = self.summary(self.admin)
+        self.assertEqual(data["totals"]["pending"], {"count": 0, "total": "0.00"})
+        self.assertEqual(data["months"][0]["month"], timezone.localtime().strftime("%Y-%m"))
+        self.assertEqual(self.summary(self.admin, "/api/payments/summary/residents/")[0]["collected"]["total"], "1500.00")
+        self.assertEqual(self.summary(self.resident, "/api/dashboard/")["payments"]["pending_count"], 0)
+        self.assertEqual(reconcile_ledger(), [])
+
+    def test_reconcile_repairs_drift(self):
+        self.pay("1500.00")
+        Payment.objects.create(amount="700.00", payment_method="cash", resident=self.resident)  # Bypasses the API
+
+        mismatches = reconcile_ledger(fix=True)
+        self.assertEqual({item["field"] for item in mismatches}, {"pending_count", "pending_total"})
+        self.assertEqual(reconcile_ledger(), [])
+        self.assertEqual(self.summary(self.resident)["totals"]["pending"], {"count": 2, "total": "2200.00"})
+
+    def test_migration_backfills_existing_payments(self):
+        last_month = timezone.now() - timedelta(days=40)
+        Payment.objects.bulk_create([  # Payments made before the ledger existed
+            Payment(amount="1500.00", payment_method="upi", payment_status="completed", resident=self.resident),
+            Payment(amount="500.00", payment_method="upi", payment_status="pending", resident=self.resident),
+            Payment(amount="900.00", payment_method="cash", payment_status="rejected", resident=self.admin),
+        ])
+        Payment.objects.filter(payment_status="rejected").update(payment_date=last_month)
+        self.assertEqual(len(reconcile_ledger()), 6)
+
+        migration = importlib.import_module("core.migrations.0010_payment_ledger")
+        migration.backfill_ledger(apps, None)
+        self.assertEqual(reconcile_ledger(), [])
+        self.assertEqual(PaymentLedger.objects.count(), 2)
+
+
+class ResidentImportTests(TestCase):
+    """
+    Bulk resident import validates the whole upload and reports errors per row.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        Resident.objects.create_user(
+            username="existing", password="pass", role="resident", apartment_no="E-101", phone_number="9999999999",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_csv_import_reports_errors_per_row(self):
+        upload = SimpleUploadedFile("tower.csv", (
+            "Username,Password,Email,Phone Number,Apartment No\n"
+            "new1,secret-1,new1@example.com,9000000001,E-102\n"
+            "EXISTING,secret-2,,9000000002,E-103\n"
+            "new3,secret-3,,9000000003,e-101\n"
+            "new1,secret-4,,9000000004,E-104\n"
+            "new5,,not-an-email,9000000005,E-105\n"
+            "new6,secret-6,,9000000006,E-106\n"
+        ).encode())
+        response = self.client.post("/api/residents/import/", {"file": upload})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], [{"index": 0, "username": "new1"}, {"index": 5, "username": "new6"}])
+        self.assertEqual(set(response.data["errors"]), {"1", "2", "3", "4"})
+        self.assertEqual(response.data["errors"]["3"], {"username": "Duplicate of row 0."})
+        self.assertEqual(set(response.data["errors"]["4"]), {"password", "email"})
+        self.assertIn("apartment_no", response.data["errors"]["2"])
+        self.assertTrue(check_password("secret-6", Resident.objects.get(username="new6").password))
+
+        export = b"".join(self.client.get("/api/residents/export/").streaming_content).decode().splitlines()
+        self.assertEqual(len(export), 5)
+        self.assertTrue(export[0].startswith("id,username,"))
+
+    def test_json_dry_run_and_process_pool_hashing(self):
+        rows = [{"username": "shared", "password": "x", "phone_number": "9", "apartment_no": "E-101"}]
+        response = self.client.post("/api/residents/import/?dry_run=1&allow_shared_apartments=1", rows, format="json")
+        self.assertEqual((response.status_code, response.data["errors"]), (200, {}))
+        self.assertFalse(Resident.objects.filter(username="shared").exists())
+
+        with override_settings(RESIDENT_IMPORT_LIMIT=1):  # Larger files belong to the management command
+            response = self.client.post("/api/residents/import/", rows * 2, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("manage.py import_residents", response.data["error"])
+
+        hashes = hash_passwords([f"password-{i}" for i in range(8)], workers=2)
+        self.assertTrue(all(check_password(f"password-{i}", hashed) for i, hashed in enumerate(hashes)))
+
+
+@override_settings(PASSWORD_HASHERS=["core.hashers.PBKDF2PasswordHasher"], PASSWORD_PBKDF2_ITERATIONS=1000)
+class LoginTests(TestCase):
+    """
+    Login skips the session for token clients, rate-limits before hashing and upgrades hashes.
+    """
+    def setUp(self):
+        cache.clear()  # Rate-limit buckets
+        self.user = Resident.objects.create_user(
+            username="resident", password="secret-pass", role="resident", apartment_no="L-1", phone_number="9999999999",
+        )
+
+    def login(self, ip="127.0.0.1", **data):
+        return self.client.post(
+            "/api/login/", dict({"username": "resident", "password": "secret-pass"}, **data),
+            content_type="application/json", REMOTE_ADDR=ip,
+        )
+
+    def test_session_only_on_request(self):
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(Session.objects.count(), 0)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+        self.assertEqual(self.login(session=True).status_code, 200)
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_failed_attempts_are_limited_per_username_and_ip(self):
+        for _ in range(5):
+            self.assertEqual(self.login(password="wrong").status_code, 400)
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+        # Guessing from one address does not lock the owner out elsewhere
+        self.assertEqual(self.login(ip="10.0.0.2").status_code, 200)
+
+        # A success forgets earlier failures from that address
+        for _ in range(4):
+            self.login(ip="10.0.0.3", password="wrong")
+        self.assertEqual(self.login(ip="10.0.0.3").status_code, 200)
+        self.assertEqual(self.login(ip="10.0.0.3", password="wrong").status_code, 400)
+        self.assertEqual(self.login(ip="10.0.0.3").status_code, 200)
+
+    @override_settings(LOGIN_USERNAME_BUCKET=None, LOGIN_ACCOUNT_BUCKET=(3, 3600))
+    def test_failures_across_addresses_hit_the_account_limit(self):
+        for i in range(3):
+            self.assertEqual(self.login(ip=f"10.0.1.{i}", password="wrong").status_code, 400)
+        self.assertEqual(self.login(ip="10.0.2.1").status_code, 429)
+
+    def test_login_upgrades_hash_to_current_cost(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split("$")[1], "2000")
 
-# Create your tests here.
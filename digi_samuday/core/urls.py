@@ -1,13 +1,16 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     ResidentViewSet, VisitorViewSet, ComplaintViewSet, PaymentViewSet, FacilityViewSet, 
     FacilityBookingViewSet, NoticeViewSet, SecurityLogViewSet, login_view, logout_view, 
     user_profile, register_view, update_profile, get_visitor_logs, log_visitor_entry, 
-    get_complaints, update_complaint_status
+    get_complaints, update_complaint_status, cache_statistics, dashboard_summary, metrics_view,
+    search_view
 )
 
-from .views import generate_csv_report
+from . import async_views
+from .views import generate_csv_report, create_report_job, report_job_detail, download_report_job, event_stream
 
 # Initialize Django REST Framework's DefaultRouter for automatically generating URLs
 router = DefaultRouter()
@@ -32,6 +35,19 @@ urlpatterns = [
     # User profile management
     path("api/user-profile/", user_profile, name="user-profile"),  # Fetch user profile
     path("api/update-profile/", update_profile, name="update-profile"),  # Update user profile
+    path("api/dashboard/", dashboard_summary, name="dashboard"),  # Dashboard summary in one request
+
+    # Response cache hit/miss counters
+    path("api/cache-stats/", cache_statistics, name="cache-stats"),
+
+    # Full-text search over complaints and notices
+    path("api/search/", search_view, name="search"),
+
+    # Prometheus metrics (request timing, queries, response sizes)
+    path("api/metrics/", metrics_view, name="metrics"),
+
+    # Live events for the signed-in user (Server-Sent Events, ASGI only)
+    path("api/events/", event_stream, name="events"),
 
     # Security log management
     path("api/security-logs/<int:pk>/checkout/", SecurityLogViewSet.as_view({'patch': 'checkout'})),  # Visitor checkout
@@ -43,4 +59,22 @@ urlpatterns = [
     path("api/complaints/<int:pk>/update-status/", update_complaint_status, name="update-complaint-status"),  # Update complaint status
 
     path("api/reports/<str:report_type>/", generate_csv_report, name="generate_csv_report"),
-]
\ No newline at end of file
+
+    # Background report jobs
+    path("api/report-jobs/", create_report_job, name="create-report-job"),  # Queue an export
+    path("api/report-jobs/<uuid:pk>/", report_job_detail, name="report-job-detail"),  # Poll job status
+    path("api/report-jobs/<uuid:pk>/download/", download_report_job, name="download-report-job"),  # Download finished file
+]
+
+# Async read path (ASGI deployments): the busiest GET endpoints as async views. When
+# enabled they are listed first; other methods fall through to the sync views.
+async_read_urlpatterns = [
+    path("api/user-profile/", async_views.user_profile, name="async-user-profile"),
+    path("api/complaints/", async_views.complaint_list, name="async-complaint-list"),
+    path("api/notices/", async_views.notice_list, name="async-notice-list"),
+    path("api/facilities/", async_views.facility_list, name="async-facility-list"),
+    path("api/security-logs/", async_views.security_log_list, name="async-securitylog-list"),
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = async_read_urlpatterns + urlpatterns
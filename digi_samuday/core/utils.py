@@ -0,0 +1,33 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def split_names(value):
+    """
+    Split a comma-separated query value (`?fields=id,title`) into stripped, non-empty names.
+    """
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def parse_datetime_bound(value, name, end_of_range=False):
+    """
+    Parse a `from`/`to` query value into an aware datetime.
+
+    - Accepts `YYYY-MM-DD` or a full ISO datetime.
+    - A bare `to` date is inclusive, so it becomes midnight of the following day.
+    - Raises ValueError with a client-facing message on bad input.
+    """
+    day = parse_date(value)
+    if day is not None:
+        if end_of_range:
+            day += timedelta(days=1)
+        parsed = datetime.combine(day, time.min)
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f"Invalid '{name}' date: {value}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
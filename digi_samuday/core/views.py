@@ -1,57 +1,188 @@
 # importing the required libraries
+import asyncio
+import csv
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth.signals import user_logged_in
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.http import FileResponse, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
+from datetime import datetime, timedelta
 
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authtoken.models import Token
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import APIException, AuthenticationFailed, PermissionDenied, ValidationError
 
 from .models import (
     Resident, Visitor, Complaint, Payment, 
-    Facility, FacilityBooking, Notice, SecurityLog
+    Facility, FacilityBooking, Notice, SecurityLog, ReportJob, PaymentLedger
 )
 from .serializers import (
     RegisterSerializer, ResidentSerializer, VisitorSerializer, 
     ComplaintSerializer, PaymentSerializer, FacilitySerializer, 
-    FacilityBookingSerializer, NoticeSerializer, SecurityLogSerializer
+    FacilityBookingSerializer, NoticeSerializer, SecurityLogSerializer, ReportJobSerializer,
+    OnPremisesSerializer
 )
-from .permissions import IsAdmin, IsResident, IsSecurity
-
-class ResidentViewSet(viewsets.ModelViewSet):
+from .permissions import IsAdmin, IsAdminOrSecurity, IsResident, IsSecurity
+from .pagination import paginated_response
+from .bookings import approve_booking, check_approval, find_conflicts, get_interval_index, validate_bulk_approval
+from .bulk import bulk_update_status
+from .checkin import PREMISES_NAMESPACE, check_in_visitors, open_logs
+from .ledger import FIELDS as LEDGER_FIELDS, format_totals, ledger_totals, snapshot, update_ledger
+from .onboarding import EXPORT_FIELDS, UploadError, export_rows, import_residents, parse_upload, rows_from_json
+from .ratelimit import check_login_attempt, record_failed_login, record_successful_login
+from .utils import parse_datetime_bound
+from .cache import RESIDENTS_NAMESPACE, CachedResponseMixin, cache_response, cached_call, stats as cache_stats
+from .conditional import ConditionalGetMixin
+from .fastpath import FastListMixin
+from .filters import CountOnlyMixin
+from .fieldsets import ProjectedQuerysetMixin
+from .authentication import CachedTokenAuthentication, make_signed_token, revoke_signed_tokens
+from .events import BROADCAST, format_sse, get_broker, role_channel, user_channel
+from .metrics import render_metrics
+from .search import KINDS as SEARCH_KINDS, get_search_index
+from .reports import REPORTS, gzip_stream, parse_report_filters, stream_csv
+from .jobs import get_export_path, submit_report_job
+
+class ResidentViewSet(CountOnlyMixin, ProjectedQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing residents.
 
     - Only admins have permission to create, update, or delete residents.
     - Provides standard CRUD operations for Resident instances.
     """
-    queryset = Resident.objects.all()  # Retrieve all resident records
+    queryset = ResidentSerializer.setup_queryset(Resident.objects.all())  # Retrieve all resident records
     serializer_class = ResidentSerializer  # Use ResidentSerializer for serialization
+    keyset_field = "date_joined"  # Cursor pagination key, newest first
+    list_filters = {"role": "role", "status": "status", "apartment": "apartment_no"}  # Query parameter -> filtered column
+    date_filter = "date_joined"  # Column bounded by ?from= / ?to=
+    ordering_fields = ["date_joined", "username", "apartment_no"]  # Allowed ?ordering= values
     permission_classes = [IsAuthenticated, IsAdmin]  # Only authenticated admins can access
 
-class VisitorViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=["POST"], url_path="import")
+    def bulk_import(self, request):
+        """
+        Register many residents at once, e.g. when a new tower is onboarded.
+
+        - Body: a JSON list of residents (or `{"residents": [...]}`), or a CSV/JSON
+          upload in the `file` field; columns as in `onboarding.FIELDS`.
+        - Returns `{"created": [{"index", "username"}], "errors": {index: {...}}}`;
+          invalid rows are skipped, valid ones are created together.
+        - `?dry_run=1` only validates; `?allow_shared_apartments=1` accepts several
+          residents per flat.
+        - Passwords are hashed within the request, so uploads are capped at
+          `RESIDENT_IMPORT_LIMIT` rows; larger files go through `manage.py import_residents`.
+        """
+        try:
+            if "file" in request.FILES:
+                upload = request.FILES["file"]
+                rows = parse_upload(upload.read(), upload.name)
+            else:
+                rows = rows_from_json(request.data)
+        except UploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if not rows:
+            return Response({"error": "No residents to import."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.RESIDENT_IMPORT_LIMIT:
+            return Response(
+                {"error": (
+                    f"At most {settings.RESIDENT_IMPORT_LIMIT} residents per upload; "
+                    "import larger files with `manage.py import_residents`."
+                )},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        dry_run = request.query_params.get("dry_run") in ("1", "true")
+        created, errors = import_residents(
+            rows, dry_run=dry_run, allow_shared_apartments=request.query_params.get("allow_shared_apartments") in ("1", "true"),
+        )
+        if dry_run:
+            response_status = status.HTTP_200_OK
+        else:
+            response_status = status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        return Response(
+            {"created": [{"index": index, "username": username} for index, username in created], "errors": errors},
+            status=response_status,
+        )
+
+    @action(detail=False, methods=["GET"])
+    def export(self, request):
+        """
+        Stream every user as CSV with the import columns (less passwords), in id order.
+        """
+        response = StreamingHttpResponse(stream_csv(EXPORT_FIELDS, export_rows()), content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="residents.csv"'
+        return response
+
+class VisitorViewSet(CountOnlyMixin, ProjectedQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for logging and managing visitor records.
 
     - Only security personnel have permission to create, update, or delete visitor logs.
     - Provides standard CRUD operations for Visitor instances.
     """
-    queryset = Visitor.objects.all()  # Retrieve all visitor records
+    queryset = VisitorSerializer.setup_queryset(Visitor.objects.all())  # Retrieve all visitor records
     serializer_class = VisitorSerializer  # Use VisitorSerializer for serialization
+    keyset_field = "check_in"  # Cursor pagination key, newest first
+    list_filters = {"resident": "resident", "apartment": "resident__apartment_no"}  # Query parameter -> filtered column
+    date_filter = "check_in"  # Column bounded by ?from= / ?to=
+    ordering_fields = ["check_in", "name"]  # Allowed ?ordering= values
     permission_classes = [IsAuthenticated, IsSecurity]  # Only authenticated security personnel can access
 
-class PaymentViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=["POST"], url_path="check-in")
+    def check_in(self, request):
+        """
+        Log one visitor entry: the visitor and their security log, written together.
+
+        - Body: `name`, `phone_number`, optional `vehicle_number`, and the resident as
+          `resident_id` or `apartment_no`.
+        """
+        return log_check_in(request)
+
+    @action(detail=False, methods=["POST"], url_path="check-in/batch")
+    def check_in_batch(self, request):
+        """
+        Log many visitor entries at once, e.g. when a gate tablet syncs after being offline.
+
+        - Body: `{"entries": [...]}` with entries shaped like `check-in`'s body.
+        - Valid entries are written in one transaction; invalid ones are listed under
+          `errors` by their position and not written.
+        """
+        entries = request.data.get("entries")
+        limit = getattr(settings, "CHECKIN_BATCH_LIMIT", 500)
+        if not isinstance(entries, list) or not entries:
+            return Response({"error": "Provide a non-empty list of entries."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > limit:
+            return Response({"error": f"At most {limit} entries per batch."}, status=status.HTTP_400_BAD_REQUEST)
+
+        logged, errors = check_in_visitors(entries, request.user)
+        return Response(
+            {"logged": [{"index": index, "visitor_id": visitor.pk} for index, visitor in logged], "errors": errors},
+            status=status.HTTP_201_CREATED if logged else status.HTTP_400_BAD_REQUEST,
+        )
+
+class PaymentViewSet(ConditionalGetMixin, CountOnlyMixin, ProjectedQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing payments.
 
     - Residents can create payments, which are initially marked as 'pending'.
     - Admins can approve or reject payments.
     - Provides standard CRUD operations for Payment instances.
+    - Every write also updates the payment ledger in the same transaction, so the
+      `summary` endpoints read pre-aggregated totals instead of payment rows.
     """
-    queryset = Payment.objects.all()  # Retrieve all payment records
+    queryset = PaymentSerializer.setup_queryset(Payment.objects.all())  # Retrieve all payment records
     serializer_class = PaymentSerializer  # Use PaymentSerializer for serialization
+    keyset_field = "payment_date"  # Cursor pagination key, newest first
+    list_filters = {"status": "payment_status", "resident": "resident", "apartment": "resident__apartment_no"}  # Query parameter -> filtered column
+    date_filter = "payment_date"  # Column bounded by ?from= / ?to=
+    ordering_fields = ["payment_date", "amount", "payment_status"]  # Allowed ?ordering= values
     permission_classes = [permissions.IsAuthenticated]  # Only authenticated users can access payment records
 
     def perform_create(self, serializer):
@@ -60,7 +191,21 @@ class PaymentViewSet(viewsets.ModelViewSet):
         - Automatically link the payment to the logged-in resident.
         - Set the initial payment status to 'pending'.
         """
-        serializer.save(resident=self.request.user, payment_status="pending")
+        with transaction.atomic():
+            payment = serializer.save(resident=self.request.user, payment_status="pending")
+            update_ledger(after=[snapshot(payment)])
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            before = snapshot(Payment.objects.select_for_update().get(pk=serializer.instance.pk))
+            payment = serializer.save()
+            update_ledger([before], [snapshot(payment)])
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            before = snapshot(Payment.objects.select_for_update().get(pk=instance.pk))
+            instance.delete()
+            update_ledger(before=[before])
 
     @action(detail=True, methods=["PATCH"], permission_classes=[permissions.IsAdminUser])
     def approve_payment(self, request, pk=None):
@@ -78,13 +223,106 @@ class PaymentViewSet(viewsets.ModelViewSet):
         if new_status not in ["completed", "rejected"]:
             return Response({"error": "Invalid status. Use 'completed' or 'rejected'."}, status=400)
 
-        # Update and save the payment status
-        payment.payment_status = new_status
-        payment.save()
+        # Update and save the payment status, moving its amount to the matching ledger column
+        with transaction.atomic():
+            payment = Payment.objects.select_for_update().get(pk=payment.pk)
+            before = snapshot(payment)
+            payment.payment_status = new_status
+            payment.save()
+            update_ledger([before], [snapshot(payment)])
 
         return Response({"message": f"Payment status updated to {new_status}", "status": new_status})
 
-class FacilityViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=["PATCH"], url_path="bulk-approve", permission_classes=[permissions.IsAdminUser])
+    def bulk_approve_payment(self, request):
+        """
+        Bulk version of `approve_payment` for month-end clearing.
+
+        - Body: `{"ids": [...], "payment_status": "completed" | "rejected"}`.
+        - Applies one UPDATE in one transaction; unknown ids are listed under `errors`.
+        """
+        new_status = request.data.get("payment_status")
+        if new_status not in ["completed", "rejected"]:
+            return Response({"error": "Invalid status. Use 'completed' or 'rejected'."}, status=400)
+
+        def move_in_ledger(rows):
+            before = [snapshot(row) for row in rows]
+            update_ledger(before, [state._replace(status=new_status) for state in before])
+
+        updated, errors = bulk_update_status(
+            self.get_queryset(), request.data.get("ids"), "payment_status", new_status, on_update=move_in_ledger,
+        )
+        return Response({"status": new_status, "updated": updated, "errors": errors})
+
+    @action(detail=False, methods=["GET"])
+    def summary(self, request):
+        """
+        Collected, pending and rejected totals, overall and for the latest `?months=` months (default 12).
+
+        - Admins get society-wide figures, or one resident's with `?resident=<id>`;
+          everyone else gets their own.
+        - Read from the payment ledger: the cost follows the number of residents and
+          months, not the number of payments.
+        """
+        rows = PaymentLedger.objects.all()
+        resident = request.query_params.get("resident")
+        if request.user.role != "admin":
+            rows = rows.filter(resident=request.user)
+        elif resident:
+            try:
+                rows = rows.filter(resident_id=int(resident))
+            except ValueError:
+                return Response({"error": "resident must be an id."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            months = min(max(int(request.query_params.get("months", 12)), 1), 120)
+        except ValueError:
+            months = 12
+
+        monthly = (
+            rows.order_by().values("month")
+            .annotate(**{field: Sum(field) for field in LEDGER_FIELDS})
+            .order_by("-month")[:months]
+        )
+        return Response({
+            "totals": ledger_totals(rows),
+            "months": [{"month": row["month"].strftime("%Y-%m"), **format_totals(row)} for row in monthly],
+        })
+
+    @action(detail=False, methods=["GET"], url_path="summary/residents", permission_classes=[IsAuthenticated, IsAdmin])
+    def summary_by_resident(self, request):
+        """
+        Per-resident totals for `?month=YYYY-MM` (default: all time), most pending first.
+
+        - `?limit=` caps the list (default 100, max 1000).
+        """
+        rows = PaymentLedger.objects.all()
+        month = request.query_params.get("month")
+        if month:
+            try:
+                rows = rows.filter(month=datetime.strptime(month, "%Y-%m").date())
+            except ValueError:
+                return Response({"error": "month must be YYYY-MM."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get("limit", 100)), 1), 1000)
+        except ValueError:
+            limit = 100
+
+        residents = (
+            rows.order_by().values("resident_id", "resident__username", "resident__apartment_no")
+            .annotate(**{field: Sum(field) for field in LEDGER_FIELDS})
+            .order_by("-pending_total", "resident_id")[:limit]
+        )
+        return Response([
+            {
+                "resident_id": row["resident_id"],
+                "resident": row["resident__username"],
+                "apartment_no": row["resident__apartment_no"],
+                **format_totals(row),
+            }
+            for row in residents
+        ])
+
+class FacilityViewSet(ConditionalGetMixin, CachedResponseMixin, CountOnlyMixin, ProjectedQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing facilities.
 
@@ -92,9 +330,12 @@ class FacilityViewSet(viewsets.ModelViewSet):
     - Only admins can create new facilities.
     - Provides standard CRUD operations for Facility instances.
     """
-    queryset = Facility.objects.all()  # Retrieve all facilities
+    queryset = FacilitySerializer.setup_queryset(Facility.objects.all())  # Retrieve all facilities
     serializer_class = FacilitySerializer  # Use FacilitySerializer for serialization
+    list_filters = {"status": "availability_status"}  # Query parameter -> filtered column
+    ordering_fields = ["name"]  # Allowed ?ordering= values
     permission_classes = [permissions.IsAuthenticated]  # Only authenticated users can access facilities
+    cache_namespace = "facilities"  # Shared cache, cleared by Facility signals
 
     def perform_create(self, serializer):
         """
@@ -107,7 +348,54 @@ class FacilityViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Only admins can create facilities.")
         serializer.save()
 
-class FacilityBookingViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["GET"])
+    def availability(self, request, pk=None):
+        """
+        Return the booked and free slots of a facility between `from` and `to`.
+
+        - `from` defaults to now and `to` to one day later.
+        - Answered from the facility's in-process interval index, not a booking scan.
+        """
+        facility = self.get_object()
+        params = request.query_params
+        try:
+            start = parse_datetime_bound(params["from"], "from") if params.get("from") else timezone.now()
+            end = parse_datetime_bound(params["to"], "to", end_of_range=True) if params.get("to") else start + timedelta(days=1)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if end <= start:
+            return Response({"error": "'to' must be after 'from'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        index = get_interval_index(facility.name)
+        return Response({
+            "facility": facility.name,
+            "from": start,
+            "to": end,
+            "booked": [
+                {"id": booking_id, "start_time": busy_start, "end_time": busy_end}
+                for busy_start, busy_end, booking_id in index.overlapping(start, end)
+            ],
+            "free": [
+                {"start_time": free_start, "end_time": free_end}
+                for free_start, free_end in index.free_slots(start, end)
+            ],
+        })
+
+class BookingConflict(APIException):
+    """
+    400 listing the approved bookings an edit or request overlaps.
+
+    - The ids stay integers, as in the `conflicts` action and the approve 409;
+      a `ValidationError` would turn them into strings.
+    """
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "booking_conflict"
+
+    def __init__(self, conflicts):
+        super().__init__()
+        self.detail = {"error": "The facility is already booked for this time.", "conflicts": list(conflicts)}
+
+class FacilityBookingViewSet(ConditionalGetMixin, CountOnlyMixin, ProjectedQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing facility bookings.
 
@@ -115,8 +403,13 @@ class FacilityBookingViewSet(viewsets.ModelViewSet):
     - Admins can approve or reject bookings.
     - Provides standard CRUD operations for FacilityBooking instances.
     """
-    queryset = FacilityBooking.objects.all()  # Retrieve all facility bookings
+    queryset = FacilityBookingSerializer.setup_queryset(FacilityBooking.objects.all())  # Retrieve all facility bookings
     serializer_class = FacilityBookingSerializer  # Use FacilityBookingSerializer for serialization
+    keyset_field = "created_at"  # Cursor pagination key, newest first
+    list_filters = {"status": "status", "resident": "resident", "apartment": "resident__apartment_no", "facility": "facility_name"}  # Query parameter -> filtered column
+    date_filter = "start_time"  # Column bounded by ?from= / ?to=
+    ordering_fields = ["created_at", "start_time", "status", "facility_name"]  # Allowed ?ordering= values
+    etag_namespaces = [RESIDENTS_NAMESPACE]  # The payload embeds usernames; renames change the ETag
     permission_classes = [permissions.IsAuthenticated]  # Only authenticated users can access booking records
 
     @action(detail=True, methods=["PATCH"], permission_classes=[permissions.IsAdminUser])
@@ -125,11 +418,17 @@ class FacilityBookingViewSet(viewsets.ModelViewSet):
         Custom action to allow admins to approve a booking.
 
         - Updates the booking status to 'approved'.
+        - Returns 409 with the conflicting booking ids if the slot overlaps another approved booking.
+        - Returns 400 if the booking has no end time.
         - Only accessible by admins.
         """
         booking = self.get_object()  # Retrieve the booking instance
-        booking.status = "approved"
-        booking.save()  # Save the updated status
+        try:
+            conflicts = approve_booking(booking)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if conflicts:
+            return Response({"error": "Booking overlaps an approved booking", "conflicts": conflicts}, status=status.HTTP_409_CONFLICT)
         return Response({"message": "Booking approved", "status": "approved"}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["PATCH"], permission_classes=[permissions.IsAdminUser])
@@ -145,15 +444,82 @@ class FacilityBookingViewSet(viewsets.ModelViewSet):
         booking.save()  # Save the updated status
         return Response({"message": "Booking rejected", "status": "rejected"}, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=["GET"], permission_classes=[permissions.IsAdminUser])
+    def conflicts(self, request, pk=None):
+        """
+        List approved bookings that overlap this booking, for the approval screen.
+
+        - Answered from the facility's in-process interval index.
+        """
+        booking = self.get_object()
+        if booking.end_time is None:
+            return Response({"conflicts": []})
+        index = get_interval_index(booking.facility_name)
+        overlapping = index.overlapping(booking.start_time, booking.end_time)
+        return Response({"conflicts": [booking_id for _, _, booking_id in overlapping if booking_id != booking.pk]})
+
+    @action(detail=False, methods=["PATCH"], url_path="bulk-status", permission_classes=[permissions.IsAdminUser])
+    def bulk_status(self, request):
+        """
+        Approve or reject many bookings at once.
+
+        - Body: `{"ids": [...], "status": "approved" | "rejected"}`.
+        - Approvals that would overlap an approved booking (or each other) are
+          listed under `errors` and left unchanged; the rest are updated together.
+        """
+        new_status = request.data.get("status")
+        if new_status not in ["approved", "rejected"]:
+            return Response({"error": "Invalid status. Use 'approved' or 'rejected'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        validate = validate_bulk_approval if new_status == "approved" else None
+        updated, errors = bulk_update_status(self.get_queryset(), request.data.get("ids"), "status", new_status, validate=validate)
+        return Response({"status": new_status, "updated": updated, "errors": errors}, status=status.HTTP_200_OK)
+
     def perform_create(self, serializer):
         """
         Automatically assigns the logged-in resident to the booking.
 
         - The booking status is set to 'pending' by default.
+        - Requests overlapping an already approved booking are rejected.
         """
+        data = serializer.validated_data
+        if data.get("end_time") is not None:
+            facility_name = data.get("facility_name", FacilityBooking._meta.get_field("facility_name").get_default())
+            start_time = data.get("start_time") or timezone.now()
+            conflicts = find_conflicts(facility_name, start_time, data["end_time"])
+            if conflicts:
+                raise BookingConflict(conflicts)
         serializer.save(resident=self.request.user, status="pending")
-    
-class NoticeViewSet(viewsets.ModelViewSet):
+
+    def perform_update(self, serializer):
+        """
+        Save an edited booking, checking conflicts when it is (or stays) approved.
+
+        - The edited slot goes through the same locked check as the approve action,
+          so a PATCH cannot approve or move a booking onto an approved one.
+        """
+        booking = serializer.instance
+        data = serializer.validated_data
+        if data.get("status", booking.status) != "approved":
+            serializer.save()
+            return
+
+        edited = FacilityBooking(
+            pk=booking.pk,
+            facility_name=data.get("facility_name", booking.facility_name),
+            start_time=data.get("start_time", booking.start_time),
+            end_time=data.get("end_time", booking.end_time),
+        )
+        with transaction.atomic():
+            try:
+                conflicts = check_approval(edited)
+            except ValueError as e:
+                raise ValidationError({"end_time": str(e)})
+            if conflicts:
+                raise BookingConflict(conflicts)
+            serializer.save()
+
+class NoticeViewSet(ConditionalGetMixin, CachedResponseMixin, CountOnlyMixin, ProjectedQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing notices.
 
@@ -161,9 +527,14 @@ class NoticeViewSet(viewsets.ModelViewSet):
     - Only admins can create and manage notices.
     - Notices are ordered by creation date (latest first).
     """
-    queryset = Notice.objects.all().order_by("-created_at")  # Fetch all notices, ordered by newest first
+    queryset = NoticeSerializer.setup_queryset(Notice.objects.all()).order_by("-created_at")  # Fetch all notices, ordered by newest first
     serializer_class = NoticeSerializer  # Use NoticeSerializer for serialization
+    keyset_field = "created_at"  # Cursor pagination key, newest first
+    date_filter = "created_at"  # Column bounded by ?from= / ?to=
+    ordering_fields = ["created_at", "title"]  # Allowed ?ordering= values
+    etag_namespaces = [RESIDENTS_NAMESPACE]  # The payload embeds usernames; renames change the ETag
     permission_classes = [permissions.IsAuthenticated]  # Only authenticated users can access notices
+    cache_namespace = "notices"  # Shared cache, cleared by Notice signals
 
     def perform_create(self, serializer):
         """
@@ -175,7 +546,7 @@ class NoticeViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Only admins can post notices.")
         serializer.save(posted_by=self.request.user)
 
-class ComplaintViewSet(viewsets.ModelViewSet):
+class ComplaintViewSet(ConditionalGetMixin, CountOnlyMixin, ProjectedQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing resident complaints.
 
@@ -183,8 +554,13 @@ class ComplaintViewSet(viewsets.ModelViewSet):
     - Admins can update, delete, and change complaint statuses.
     - All authenticated users can view complaints.
     """
-    queryset = Complaint.objects.all()  # Fetch all complaints
+    queryset = ComplaintSerializer.setup_queryset(Complaint.objects.all())  # Fetch all complaints
     serializer_class = ComplaintSerializer  # Use ComplaintSerializer for serialization
+    keyset_field = "created_at"  # Cursor pagination key, newest first
+    list_filters = {"status": "status", "resident": "resident", "apartment": "resident__apartment_no"}  # Query parameter -> filtered column
+    date_filter = "created_at"  # Column bounded by ?from= / ?to=
+    ordering_fields = ["created_at", "updated_at", "status", "title"]  # Allowed ?ordering= values
+    etag_namespaces = [RESIDENTS_NAMESPACE]  # The payload embeds usernames; renames change the ETag
     permission_classes = [permissions.IsAuthenticated]  # Default permission for authenticated users
 
     def get_permissions(self):
@@ -195,8 +571,8 @@ class ComplaintViewSet(viewsets.ModelViewSet):
         - Admins can update, delete, or change complaint statuses.
         - All authenticated users can view complaints.
         """
-        if self.action in ["update", "partial_update", "destroy"]:
-            return [IsAdmin()]  # Only admins can modify or delete complaints
+        if self.action in ["update", "partial_update", "destroy", "update_status", "bulk_status"]:
+            return [IsAdmin()]  # Only admins can modify or delete complaints (this overrides the actions' permission_classes)
         elif self.action == "create":
             return [IsResident()]  # Only residents can file complaints
         return [permissions.IsAuthenticated()]  # Default: any authenticated user can view complaints
@@ -219,21 +595,40 @@ class ComplaintViewSet(viewsets.ModelViewSet):
         complaint.save()
         return Response({"message": "Complaint status updated", "status": new_status})
 
+    @action(detail=False, methods=["PATCH"], url_path="bulk-update-status", permission_classes=[IsAdmin])
+    def bulk_status(self, request):
+        """
+        Admin action to update the status of many complaints at once.
+
+        - Body: `{"ids": [...], "status": "open" | "in_progress" | "resolved"}`.
+        - Unknown ids are listed under `errors`.
+        """
+        new_status = request.data.get("status")
+        if new_status not in ["open", "in_progress", "resolved"]:
+            return Response({"error": "Invalid status"}, status=400)
+
+        updated, errors = bulk_update_status(self.get_queryset(), request.data.get("ids"), "status", new_status)
+        return Response({"status": new_status, "updated": updated, "errors": errors})
+
     def perform_create(self, serializer):
         """
         Ensure that the complaint is linked to the logged-in resident.
         """
         serializer.save(resident=self.request.user)
 
-class SecurityLogViewSet(viewsets.ModelViewSet):
+class SecurityLogViewSet(CountOnlyMixin, ProjectedQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing security logs.
 
     - Security personnel can log visitor check-ins and check-outs.
     - Residents and admins can view logs.
     """
-    queryset = SecurityLog.objects.all()  # Fetch all security logs
+    queryset = SecurityLogSerializer.setup_queryset(SecurityLog.objects.all())  # Fetch all security logs
     serializer_class = SecurityLogSerializer  # Use SecurityLogSerializer for serialization
+    keyset_field = "entry_time"  # Cursor pagination key, newest first
+    list_filters = {"visitor": "visitor", "resident": "visitor__resident", "apartment": "visitor__resident__apartment_no"}  # Query parameter -> filtered column
+    date_filter = "entry_time"  # Column bounded by ?from= / ?to=
+    ordering_fields = ["entry_time", "guard_name"]  # Allowed ?ordering= values
     permission_classes = [permissions.IsAuthenticated]  # Only authenticated users can access logs
 
     @action(detail=True, methods=["PATCH"], permission_classes=[permissions.IsAuthenticated])
@@ -255,12 +650,46 @@ class SecurityLogViewSet(viewsets.ModelViewSet):
         except SecurityLog.DoesNotExist:
             return Response({"error": "Visitor log not found"}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=False, methods=["GET"], permission_classes=[IsAdminOrSecurity])
+    def inside(self, request):
+        """
+        List the visitors currently on the premises with their vehicle and host resident.
+
+        - Reads only the open logs (see `checkin.open_logs`); cached until the next
+          check-in or checkout, or `PREMISES_CACHE_TIMEOUT` seconds.
+        """
+        def compute():
+            logs = OnPremisesSerializer.setup_queryset(open_logs())
+            visitors = OnPremisesSerializer(logs, many=True).data
+            return Response({"count": len(visitors), "visitors": visitors})
+
+        return cached_call(request, PREMISES_NAMESPACE, compute, timeout=getattr(settings, "PREMISES_CACHE_TIMEOUT", 10))
+
+    @action(detail=False, methods=["GET"], url_path="inside/count", permission_classes=[IsAdminOrSecurity])
+    def inside_count(self, request):
+        """
+        Number of visitors on the premises, for the gate display that polls every few seconds.
+        """
+        compute = lambda: Response({"count": open_logs().count()})
+        return cached_call(request, PREMISES_NAMESPACE, compute, timeout=getattr(settings, "PREMISES_CACHE_TIMEOUT", 10))
+
 # Login API
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login_view(request):
     """
     Authenticate user and return token along with user role.
+
+    - Send `"token_type": "signed"` to receive a stateless signed token that
+      authenticates without a database lookup. It expires after `SIGNED_TOKEN_MAX_AGE`
+      and is revoked earlier by logout, deactivation or a role or password change
+      (a cache entry; see `revoke_signed_tokens`).
+    - Token clients get no session; send `"session": true` to also get a session
+      cookie (the session row is written only then).
+    - Attempts pass the per-IP and per-username token buckets before any password
+      hashing; over the limit the answer is 429 with `Retry-After`. Failures count
+      per username and client IP (and, far more leniently, per username alone), so
+      nobody can lock another user out from their own address.
     """
     username = request.data.get('username')
     password = request.data.get('password')
@@ -268,16 +697,31 @@ def login_view(request):
     if not username or not password:
         return Response({"error": "Username and password are required"}, status=status.HTTP_400_BAD_REQUEST)
 
+    retry_after = check_login_attempt(request, str(username))
+    if retry_after:
+        return Response(
+            {"error": f"Too many login attempts. Try again in {retry_after} seconds."},
+            status=status.HTTP_429_TOO_MANY_REQUESTS, headers={"Retry-After": str(retry_after)},
+        )
+
     user = authenticate(username=username, password=password)
     if user:
-        token, _ = Token.objects.get_or_create(user=user)
-        login(request, user)
+        record_successful_login(request, str(username))
+        if request.data.get("token_type") == "signed":
+            key = make_signed_token(user)
+        else:
+            key = Token.objects.get_or_create(user=user)[0].key
+        if request.data.get("session") in (True, "true", "1"):
+            login(request, user)
+        else:
+            user_logged_in.send(sender=user.__class__, request=request, user=user)  # Updates last_login, no session
         return Response({
             "message": "Login successful",
             "role": user.role,
-            "token": token.key
+            "token": key
         }, status=status.HTTP_200_OK)
 
+    record_failed_login(request, str(username))
     return Response({"error": "Invalid credentials"}, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -287,8 +731,11 @@ def login_view(request):
 def logout_view(request):
     """
     Logout user by deleting their authentication token.
+
+    - Also revokes every signed token issued to the user, on every device.
     """
-    request.user.auth_token.delete()  # Ensure token is deleted
+    Token.objects.filter(user=request.user).delete()  # Delete the token; signals evict it from the auth cache
+    revoke_signed_tokens(request.user.pk)
     logout(request)
     return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
 
@@ -296,12 +743,19 @@ def logout_view(request):
 # User Profile API
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response("profile", per_user=True)
 def user_profile(request):
     """
     Retrieve the authenticated user's profile details.
     """
-    user = request.user
-    return Response({
+    return Response(profile_data(request.user), status=status.HTTP_200_OK)
+
+
+def profile_data(user):
+    """
+    Build the profile payload shared by `user_profile` and `dashboard_summary`.
+    """
+    return {
         'id': user.id,
         'username': user.username,
         'first_name': user.first_name,
@@ -310,6 +764,58 @@ def user_profile(request):
         'role': user.role,
         'apartment_no': user.apartment_no,
         'phone_number': user.phone_number,
+    }
+
+
+# Dashboard Summary API
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cache_response("dashboard", per_user=True, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+def dashboard_summary(request):
+    """
+    Return everything `Dashboard.js` needs in one response.
+
+    - Profile, the latest `?limit=` notices (default 5), complaint counts by status
+      with the most recent complaints, pending payment totals (from the payment ledger)
+      and upcoming bookings.
+    - Admins see society-wide complaint and payment figures; everyone else sees their own.
+    - Built from aggregate and LIMIT queries, and cached per user for a short TTL.
+    """
+    user = request.user
+    try:
+        limit = min(max(int(request.query_params.get("limit", 5)), 1), 50)
+    except ValueError:
+        limit = 5
+
+    complaints = Complaint.objects.all()
+    ledger = PaymentLedger.objects.all()
+    if user.role != "admin":
+        complaints = complaints.filter(resident=user)
+        ledger = ledger.filter(resident=user)
+
+    complaint_counts = {value: 0 for value, _ in Complaint._meta.get_field("status").choices}
+    for row in complaints.order_by().values("status").annotate(total=Count("id")):
+        complaint_counts[row["status"]] = row["total"]
+
+    recent_complaints = ComplaintSerializer.setup_queryset(complaints).order_by("-created_at")[:limit]
+    latest_notices = NoticeSerializer.setup_queryset(Notice.objects.all()).order_by("-created_at")[:limit]
+    pending_payments = ledger_totals(ledger)["pending"]
+    upcoming_bookings = FacilityBookingSerializer.setup_queryset(
+        FacilityBooking.objects.filter(resident=user, status__in=["pending", "approved"], start_time__gte=timezone.now())
+    ).order_by("start_time")[:limit]
+
+    return Response({
+        "profile": profile_data(user),
+        "notices": NoticeSerializer(latest_notices, many=True).data,
+        "complaints": {
+            "counts": complaint_counts,
+            "recent": ComplaintSerializer(recent_complaints, many=True).data,
+        },
+        "payments": {
+            "pending_count": pending_payments["count"],
+            "pending_total": pending_payments["total"],
+        },
+        "upcoming_bookings": FacilityBookingSerializer(upcoming_bookings, many=True).data,
     }, status=status.HTTP_200_OK)
 
 
@@ -329,12 +835,83 @@ def update_profile(request):
     user.phone_number = data.get("phone_number", user.phone_number)
 
     try:
-        user.save()
+        user.save(update_fields=["first_name", "last_name", "email", "phone_number", "updated_at"])
         return Response({"success": True, "message": "Profile updated successfully"}, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"success": False, "error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+# Cache Statistics API (Admin only)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def cache_statistics(request):
+    """
+    Return this worker's response-cache hit/miss counters per namespace.
+    """
+    return Response(cache_stats.snapshot(), status=status.HTTP_200_OK)
+
+
+# Search API (Authenticated users)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def search_view(request):
+    """
+    Search complaint and notice text, best matches first.
+
+    - `q` is required; every word must match, the last one as a prefix.
+    - `type=complaint|notice` narrows the search; `page`/`page_size` page through results.
+    - Admins search every complaint; other users only their own. Notices are visible to all.
+    """
+    text = request.query_params.get("q", "").strip()
+    if not text:
+        return Response({"error": "The 'q' parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+    kinds = [request.query_params["type"]] if request.query_params.get("type") else list(SEARCH_KINDS)
+    if any(kind not in SEARCH_KINDS for kind in kinds):
+        return Response({"error": f"Invalid type. Use one of: {', '.join(SEARCH_KINDS)}."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        page = max(int(request.query_params.get("page", 1)), 1)
+        page_size = min(max(int(request.query_params.get("page_size", 20)), 1), 100)
+    except ValueError:
+        return Response({"error": "page and page_size must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+    owner_id = None if request.user.role == "admin" else request.user.pk
+    total, hits = get_search_index().search(text, kinds, owner_id=owner_id, limit=page_size, offset=(page - 1) * page_size)
+
+    # Hydrate from the database, one query per type, so results show the current status
+    # and rows deleted since they were indexed drop out
+    rows = {
+        "complaint": Complaint.objects.only("id", "title", "status", "created_at").in_bulk(
+            [pk for kind, pk, _ in hits if kind == "complaint"]
+        ),
+        "notice": Notice.objects.only("id", "title", "created_at").in_bulk(
+            [pk for kind, pk, _ in hits if kind == "notice"]
+        ),
+    }
+    results = []
+    for kind, pk, snippet in hits:
+        row = rows[kind].get(pk)
+        if row is None:
+            continue
+        result = {"type": kind, "id": pk, "title": row.title, "snippet": snippet, "created_at": row.created_at}
+        if kind == "complaint":
+            result["status"] = row.status
+        results.append(result)
+    return Response({"count": total, "page": page, "page_size": page_size, "results": results})
+
+
+# Metrics API (Admin only)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def metrics_view(request):
+    """
+    Return this worker's request metrics in the Prometheus text format.
+
+    - Scrape it with an admin token (`authorization: {type: Token, credentials: ...}`);
+      each worker process keeps its own histograms.
+    """
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Registration API
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -359,9 +936,8 @@ def get_residents(request):
     if request.user.role != "admin":
         return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
 
-    residents = Resident.objects.all()
-    serializer = ResidentSerializer(residents, many=True)
-    return Response(serializer.data)
+    residents = ResidentSerializer.setup_queryset(Resident.objects.all())
+    return paginated_response(request, residents, ResidentSerializer, keyset_field="date_joined")
 
 
 # Get Visitor Logs API (Admin & Security Only)
@@ -374,9 +950,8 @@ def get_visitor_logs(request):
     if request.user.role not in ["admin", "security"]:
         return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
 
-    logs = SecurityLog.objects.all().order_by('-entry_time')
-    serializer = SecurityLogSerializer(logs, many=True)
-    return Response(serializer.data)
+    logs = SecurityLogSerializer.setup_queryset(SecurityLog.objects.all()).order_by('-entry_time')
+    return paginated_response(request, logs, SecurityLogSerializer, keyset_field="entry_time")
 
 
 # Log Visitor Entry API (Security Only)
@@ -388,36 +963,17 @@ def log_visitor_entry(request):
     """
     if request.user.role != "security":
         return Response({"error": "Only security can log visitors."}, status=status.HTTP_403_FORBIDDEN)
+    return log_check_in(request)
 
-    data = request.data
-    required_fields = ["name", "phone_number", "resident_id"]
 
-    # Check for missing fields
-    missing_fields = [field for field in required_fields if not data.get(field)]
-    if missing_fields:
-        return Response({field: "This field is required." for field in missing_fields}, status=status.HTTP_400_BAD_REQUEST)
-
-    try:
-        # Ensure the resident exists
-        resident = Resident.objects.get(id=data["resident_id"])
-
-        visitor = Visitor.objects.create(
-            name=data["name"],
-            phone_number=data["phone_number"],
-            vehicle_number=data.get("vehicle_number", None),
-            resident=resident,
-        )
-
-        # Log visitor entry
-        SecurityLog.objects.create(visitor=visitor, guard_name=request.user.username)
-
-        return Response({"message": "Visitor entry logged successfully."}, status=status.HTTP_201_CREATED)
-
-    except Resident.DoesNotExist:
-        return Response({"error": "Resident not found."}, status=status.HTTP_400_BAD_REQUEST)
-
-    except Exception as e:
-        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+def log_check_in(request):
+    """
+    Shared body of `log_visitor_entry` and `VisitorViewSet.check_in`.
+    """
+    logged, errors = check_in_visitors([request.data], request.user)
+    if errors:
+        return Response(errors["0"], status=status.HTTP_400_BAD_REQUEST)
+    return Response({"message": "Visitor entry logged successfully.", "visitor_id": logged[0][1].pk}, status=status.HTTP_201_CREATED)
 
 
 
@@ -434,9 +990,9 @@ def get_complaints(request):
         complaints = Complaint.objects.all()  # Admins can see all complaints
     else:
         complaints = Complaint.objects.filter(resident=request.user)  # Residents see their own complaints
+    complaints = ComplaintSerializer.setup_queryset(complaints)
     
-    serializer = ComplaintSerializer(complaints, many=True)
-    return Response(serializer.data)
+    return paginated_response(request, complaints, ComplaintSerializer, keyset_field="created_at")
 
 
 @api_view(["PATCH"])
@@ -467,33 +1023,144 @@ def update_complaint_status(request, pk):
     
 
 
-import csv
-from django.http import HttpResponse
-
+# CSV Reports API (Admin only)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
 def generate_csv_report(request, report_type):
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="{report_type}_report.csv"'
-    writer = csv.writer(response)
-
-    if report_type == "complaints":
-        writer.writerow(["Complaint ID", "Title", "Description", "Status", "Resident", "Created At"])
-        complaints = Complaint.objects.all()
-        for complaint in complaints:
-            writer.writerow([complaint.id, complaint.title, complaint.description, complaint.status, complaint.resident.username, complaint.created_at])
-
-    elif report_type == "payments":
-        writer.writerow(["Payment ID", "Amount", "Status", "Resident", "Date"])
-        payments = Payment.objects.all()
-        for payment in payments:
-            writer.writerow([payment.id, payment.amount, payment.payment_status, payment.resident.username, payment.payment_date])
-
-    elif report_type == "bookings":
-        writer.writerow(["Booking ID", "Facility", "Start Time", "End Time", "Resident", "Status"])
-        bookings = FacilityBooking.objects.all()
-        for booking in bookings:
-            writer.writerow([booking.id, booking.facility_name, booking.start_time, booking.end_time, booking.user.username, booking.status])
+    """
+    Stream a CSV export of complaints, payments, bookings, visitors or security logs.
+
+    - Optional filters: `from`/`to` (YYYY-MM-DD or ISO datetime) and `status`.
+    - `?compress=gzip` (or `1`) streams a `.csv.gz` file instead of plain CSV.
+    - Rows are read in chunks with `.iterator()`, so memory stays flat however large the export is.
+    - Visitor and security-log exports include archived rows from the months the range covers.
+    """
+    report = REPORTS.get(report_type)
+    if report is None:
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{report_type}_report.csv"'
+        csv.writer(response).writerow(["Error", "Invalid Report Type"])
+        return response
 
+    try:
+        filters = parse_report_filters(request.query_params, report)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    content = stream_csv(report.headers, report.rows(**filters))
+    filename = f"{report_type}_report.csv"
+    if request.query_params.get("compress") in ("1", "true", "gzip"):
+        response = StreamingHttpResponse(gzip_stream(content), content_type="application/gzip")
+        filename += ".gz"
     else:
-        writer.writerow(["Error", "Invalid Report Type"])
-    
-    return response
\ No newline at end of file
+        response = StreamingHttpResponse(content, content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# Report Jobs API (Admin only)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def create_report_job(request):
+    """
+    Queue a CSV export and return its job id.
+
+    - Body: `report_type` plus optional `from`, `to`, `status` and `compress` ("gzip").
+    - Identical requests over unchanged data are answered from the finished-file cache.
+    """
+    try:
+        job = submit_report_job(request.data.get("report_type"), request.data, request.user)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    code = status.HTTP_200_OK if job.status == "done" else status.HTTP_202_ACCEPTED
+    return Response(ReportJobSerializer(job).data, status=code)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def report_job_detail(request, pk):
+    """
+    Return the current state of a report job for polling.
+    """
+    try:
+        job = ReportJob.objects.get(pk=pk)
+    except ReportJob.DoesNotExist:
+        return Response({"error": "Report job not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(ReportJobSerializer(job).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def download_report_job(request, pk):
+    """
+    Download the finished file of a report job.
+
+    - Returns 409 while the job is still queued or running.
+    """
+    try:
+        job = ReportJob.objects.get(pk=pk)
+    except ReportJob.DoesNotExist:
+        return Response({"error": "Report job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    if job.status != "done":
+        return Response({"error": f"Report job is {job.status}", "status": job.status}, status=status.HTTP_409_CONFLICT)
+
+    path = get_export_path(job)
+    if not path.exists():
+        return Response({"error": "Report file is no longer available"}, status=status.HTTP_410_GONE)
+
+    filename = f"{job.report_type}_report{''.join(path.suffixes)}"
+    content_type = "application/gzip" if job.params.get("compress") else "text/csv"
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=filename, content_type=content_type)
+
+
+# Live Events API (Server-Sent Events)
+async def event_stream(request):
+    """
+    Stream the signed-in user's live events as Server-Sent Events.
+
+    - `EventSource` cannot send headers, so the token may be passed as `?token=`;
+      an `Authorization: Token ...` header or a session also work.
+    - Events: `notice.created` for everyone, `complaint|booking|payment.status` for the
+      owner and `complaint|booking|payment.created` for admins. A `resync` event means
+      events were dropped and the client should re-fetch.
+    - Needs an ASGI server (e.g. `uvicorn digi_samuday.asgi:application`); an idle
+      connection costs a parked coroutine, not a worker thread or a polling query.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "Event streaming requires the ASGI server."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    header = request.headers.get("Authorization", "")
+    key = request.GET.get("token") or (header[6:] if header.startswith("Token ") else None)
+    if key:
+        try:
+            user, _ = await sync_to_async(CachedTokenAuthentication().authenticate_credentials)(key)
+        except AuthenticationFailed as e:
+            return JsonResponse({"error": str(e.detail)}, status=status.HTTP_401_UNAUTHORIZED)
+    else:
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse({"error": "Authentication credentials were not provided."}, status=status.HTTP_401_UNAUTHORIZED)
+
+    channels = [BROADCAST, user_channel(user.pk), role_channel(user.role)]
+    heartbeat = getattr(settings, "SSE_HEARTBEAT_SECONDS", 15)
+
+    async def stream():
+        subscription = get_broker().subscribe(channels)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"  # Keeps proxies from closing an idle connection
+                    continue
+                yield format_sse(event)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Disable proxy buffering (nginx)
+    return response
@@ -2,6 +2,8 @@
 ASGI config for digi_samuday project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn digi_samuday.asgi:application``) to
+enable the live event stream at /api/events/, which holds one connection per tab.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -12,5 +14,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'digi_samuday.settings')
+os.environ.setdefault('DIGISAMUDAY_ASYNC_READ_VIEWS', '1')  # Serve the async read views (see settings)
 
 application = get_asgi_application()
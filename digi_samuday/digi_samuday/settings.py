@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = "core.Resident"
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',  # First, so it times the whole stack
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -110,14 +112,36 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing policy: the first hasher hashes new passwords; the others only verify
+# older hashes, which are re-hashed with the first (at the current cost) on the next login
+PASSWORD_HASHERS = [
+    'core.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_PBKDF2_ITERATIONS = 870000  # PBKDF2 cost (Django 5.1's default); CPU per login grows linearly with it
+
+# Login rate limits (token buckets checked before any password hashing); None disables one
+LOGIN_IP_BUCKET = (30, 60)  # Attempts per client IP: burst size, seconds to refill it
+LOGIN_USERNAME_BUCKET = (5, 300)  # Failed attempts per username from one client IP: burst size, seconds to refill it
+LOGIN_ACCOUNT_BUCKET = (100, 3600)  # Failed attempts per username from any IP (slows distributed guessing)
+LOGIN_RATE_LIMIT_CACHE = 'default'  # Cache holding the buckets; use a shared one with several workers
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Keyset (cursor) pagination on every list; `?paginate=false` returns the full legacy list
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    # `?status=`, `?from=`/`?to=`, `?ordering=` etc. as declared by each ViewSet
+    'DEFAULT_FILTER_BACKENDS': ('core.filters.ListFilterBackend',),
+    'PAGE_SIZE': 50,
 }
 
 # Internationalization
@@ -137,12 +161,73 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Background CSV report jobs
+REPORT_EXPORT_DIR = BASE_DIR / 'exports'  # Finished exports, named by content hash
+REPORT_JOB_WORKERS = 2  # Worker threads per process
+REPORT_JOBS_EAGER = False  # Run jobs inline instead of in the worker pool
+
+# API response cache
+# Swap the backend without code changes, e.g.
+#   'django.core.cache.backends.filebased.FileBasedCache' with 'LOCATION': BASE_DIR / 'cache'
+#   'django.core.cache.backends.redis.RedisCache' with 'LOCATION': 'redis://127.0.0.1:6379'
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'digisamuday',
+    }
+}
+API_CACHE_ALIAS = 'default'  # Cache used for API responses
+API_CACHE_TIMEOUT = 300  # Seconds a cached response stays valid
+DASHBOARD_CACHE_TIMEOUT = 30  # Seconds a user's dashboard summary stays cached
+
+# Token authentication cache
+AUTH_TOKEN_CACHE_SIZE = 10000  # Tokens kept per worker process
+AUTH_TOKEN_CACHE_TTL = 60  # Seconds before a cached token is re-read from the DB
+SIGNED_TOKEN_MAX_AGE = 3600  # Lifetime of stateless signed tokens, in seconds
+
+# Facility booking engine
+BOOKING_INDEX_TTL = 30  # Seconds a facility's in-process interval index stays cached
+
+# Visitor history archive (see `manage.py archive_visits`)
+ARCHIVE_DIR = BASE_DIR / 'archive'  # Monthly gzip JSONL partitions of archived visitors and security logs
+ARCHIVE_RETENTION_DAYS = 180  # Visits older than this leave the live tables
+
+# Full-text search (SQLite FTS5 file kept current by signals; `manage.py rebuild_search_index` rebuilds it)
+SEARCH_INDEX_PATH = BASE_DIR / 'search_index.sqlite3'
+
+# Gate check-in
+CHECKIN_DIRECTORY_TTL = 300  # Seconds the in-process resident/apartment lookup stays cached
+CHECKIN_BATCH_LIMIT = 500  # Entries accepted per batched check-in
+PREMISES_CACHE_TIMEOUT = 10  # Seconds the "currently inside" list and count stay cached (bounds staleness across workers)
+
+# Bulk resident import (POST /api/residents/import/, `manage.py import_residents`)
+# Passwords are hashed inside the request (~0.5 s of CPU each at the PBKDF2 cost above),
+# so the HTTP limit stays small enough to finish within a proxy timeout; the command has none.
+RESIDENT_IMPORT_LIMIT = 200  # Rows accepted per HTTP upload
+RESIDENT_IMPORT_WORKERS = None  # Password-hashing processes; None uses every CPU
+
+# Request instrumentation (served at /api/metrics/)
+SLOW_REQUEST_THRESHOLD_MS = 500  # Requests slower than this are logged to `core.slow_requests` with their SQL
+SLOW_REQUEST_SQL_LIMIT = 100  # Statements kept per request for the slow-request log
+
+# Live events (Server-Sent Events at /api/events/, served by the ASGI app)
+# With several worker processes use the Redis broker so every worker sees every event:
+#   EVENT_BROKER = 'core.events.RedisBroker'
+#   EVENT_BROKER_OPTIONS = {'url': 'redis://127.0.0.1:6379/0'}
+EVENT_BROKER = 'core.events.InProcessBroker'
+EVENT_BROKER_OPTIONS = {'queue_size': 100}  # Events buffered per client before it is told to resync
+SSE_HEARTBEAT_SECONDS = 15  # Keep-alive comment interval on idle streams
+
+# Async read path: serve profile, complaint, notice, facility and security-log lists with
+# async views. asgi.py turns it on; WSGI deployments keep the sync views.
+ASYNC_READ_VIEWS = os.environ.get('DIGISAMUDAY_ASYNC_READ_VIEWS', '0') == '1'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-SESSION_ENGINE = "django.contrib.sessions.backends.db"  # Default session storage
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"  # Sessions read through the cache, written to the DB
 SESSION_COOKIE_NAME = "sessionid"  # Default session cookie name
 
 CORS_ALLOW_ALL_ORIGINS = True
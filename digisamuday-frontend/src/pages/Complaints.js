@@ -33,7 +33,7 @@ function Complaints() {
       .catch(() => setError("Error fetching user profile"));
 
     // Fetch complaints
-    fetch("http://localhost:8000/api/complaints/", {
+    fetch("http://localhost:8000/api/complaints/?paginate=false", {
       headers: { Authorization: `Token ${token}` },
     })
       .then((response) => response.json())
@@ -14,46 +14,29 @@ function Dashboard() {
       return;
     }
   
-    // Fetch user profile
-    fetch("http://localhost:8000/api/user-profile/", {
-      headers: { Authorization: `Token ${token}` },
-    })
-      .then((response) => response.json())
-      .then((data) => {
-        if (data.username) {
-          setUsername(data.username);
-          setRole(data.role);  // ✅ Fix: Ensure role is properly set
-        } else {
-          throw new Error("Invalid user data");
-        }
+    // Fetch profile, notices and complaints in one request
+    const loadDashboard = () =>
+      fetch("http://localhost:8000/api/dashboard/", {
+        headers: { Authorization: `Token ${token}` },
       })
-      .catch(() => setError("Failed to fetch user details"));
-  
-    // Fetch notices
-    fetch("http://localhost:8000/api/notices/", {
-      headers: { Authorization: `Token ${token}` },
-    })
-      .then((response) => response.json())
-      .then((data) => {
-        if (!Array.isArray(data)) {
-          throw new Error("Invalid API response");
-        }
-        setNotices(data.slice(0, 5));
-      })
-      .catch((err) => setError(`Error fetching notices: ${err.message}`));
-  
-    // Fetch complaints
-    fetch("http://localhost:8000/api/complaints/", {
-      headers: { Authorization: `Token ${token}` },
-    })
-      .then((response) => response.json())
-      .then((data) => {
-        if (!Array.isArray(data)) {
-          throw new Error("Invalid API response");
-        }
-        setComplaints(data.slice(0, 5));
-      })
-      .catch((err) => setError(`Error fetching complaints: ${err.message}`));
+        .then((response) => response.json())
+        .then((data) => {
+          if (!data.profile || !data.profile.username) {
+            throw new Error("Invalid API response");
+          }
+          setUsername(data.profile.username);
+          setRole(data.profile.role);
+          setNotices(data.notices);
+          setComplaints(data.complaints.recent);
+        })
+        .catch((err) => setError(`Error fetching dashboard: ${err.message}`));
+
+    loadDashboard();
+
+    // Reload when the server pushes a new notice or a status change
+    const events = new EventSource(`http://localhost:8000/api/events/?token=${token}`);
+    events.onmessage = () => loadDashboard();
+    return () => events.close();
   }, []);  
 
   return (
@@ -20,14 +20,14 @@ function FacilityBooking() {
       return;
     }
 
-    fetch("http://localhost:8000/api/facilities/", {
+    fetch("http://localhost:8000/api/facilities/?paginate=false", {
       headers: { Authorization: `Token ${token}` },
     })
       .then((response) => response.json())
       .then((data) => setFacilities(data))
       .catch(() => setError("Failed to load facilities."));
 
-    fetch("http://localhost:8000/api/facility-bookings/", {
+    fetch("http://localhost:8000/api/facility-bookings/?paginate=false", {
       headers: { Authorization: `Token ${token}` },
     })
       .then((response) => response.json())
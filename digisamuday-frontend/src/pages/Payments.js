@@ -16,7 +16,7 @@ function Payments() {
       return;
     }
 
-    fetch("http://localhost:8000/api/payments/", {
+    fetch("http://localhost:8000/api/payments/?paginate=false", {
       method: "GET",
       headers: {
         "Content-Type": "application/json",
@@ -16,14 +16,15 @@ function ManageFacilities() {
       return;
     }
 
-    fetch("http://localhost:8000/api/facilities/", {
+    fetch("http://localhost:8000/api/facilities/?paginate=false", {
       headers: { Authorization: `Token ${token}` },
     })
       .then((response) => response.json())
       .then((data) => setFacilities(data))
       .catch(() => setError("Failed to load facilities."));
 
-    fetch("http://localhost:8000/api/facility-bookings/", {
+    // Only pending bookings are listed; the API filters them in SQL
+    fetch("http://localhost:8000/api/facility-bookings/?paginate=false&status=pending&ordering=start_time", {
       headers: { Authorization: `Token ${token}` },
     })
       .then((response) => response.json())
@@ -2,7 +2,22 @@ import { useState, useEffect } from "react";
 
 function ManagePayments() {
   const [payments, setPayments] = useState([]);
+  const [summary, setSummary] = useState(null); // Pre-aggregated totals from /api/payments/summary/
   const [error, setError] = useState(null);
+  const [statusFilter, setStatusFilter] = useState(""); // Sent as ?status=, filtered by the API
+
+  const fetchSummary = () => {
+    const token = localStorage.getItem("token");
+
+    fetch("http://localhost:8000/api/payments/summary/?months=6", {
+      headers: {
+        Authorization: `Token ${token}`,
+      },
+    })
+      .then((response) => response.json())
+      .then((data) => setSummary(data))
+      .catch(() => setError("Failed to load payment summary."));
+  };
 
   useEffect(() => {
     const token = localStorage.getItem("token");
@@ -12,7 +27,12 @@ function ManagePayments() {
       return;
     }
 
-    fetch("http://localhost:8000/api/payments/", {
+    fetchSummary();
+    const params = new URLSearchParams({ paginate: "false" });
+    if (statusFilter) {
+      params.set("status", statusFilter);
+    }
+    fetch(`http://localhost:8000/api/payments/?${params}`, {
       headers: {
         Authorization: `Token ${token}`,
       },
@@ -20,7 +40,7 @@ function ManagePayments() {
       .then((response) => response.json())
       .then((data) => setPayments(data))
       .catch(() => setError("Failed to load payments."));
-  }, []);
+  }, [statusFilter]);
 
   const handleStatusUpdate = (id, newStatus) => {
     const token = localStorage.getItem("token");
@@ -40,6 +60,7 @@ function ManagePayments() {
             payment.id === id ? { ...payment, payment_status: data.status } : payment
           )
         );
+        fetchSummary();
       })
       .catch(() => alert("Error updating payment status."));
   };
@@ -50,6 +71,56 @@ function ManagePayments() {
 
       {error && <p className="text-red-500">{error}</p>}
 
+      {summary && (
+        <>
+          <div className="grid grid-cols-3 gap-4 mb-4">
+            <div className="p-4 bg-green-100 rounded">
+              <p className="text-sm">Collected</p>
+              <p className="text-xl font-bold">${summary.totals.collected.total}</p>
+              <p className="text-sm">{summary.totals.collected.count} payments</p>
+            </div>
+            <div className="p-4 bg-yellow-100 rounded">
+              <p className="text-sm">Pending</p>
+              <p className="text-xl font-bold">${summary.totals.pending.total}</p>
+              <p className="text-sm">{summary.totals.pending.count} payments</p>
+            </div>
+            <div className="p-4 bg-red-100 rounded">
+              <p className="text-sm">Rejected</p>
+              <p className="text-xl font-bold">${summary.totals.rejected.total}</p>
+              <p className="text-sm">{summary.totals.rejected.count} payments</p>
+            </div>
+          </div>
+
+          <table className="min-w-full bg-white border border-gray-200 mb-6">
+            <thead>
+              <tr className="bg-gray-100 border-b">
+                <th className="p-3 border">Month</th>
+                <th className="p-3 border">Collected</th>
+                <th className="p-3 border">Pending</th>
+                <th className="p-3 border">Rejected</th>
+              </tr>
+            </thead>
+            <tbody>
+              {summary.months.map((month) => (
+                <tr key={month.month} className="border-b">
+                  <td className="p-3 border">{month.month}</td>
+                  <td className="p-3 border">${month.collected.total}</td>
+                  <td className="p-3 border">${month.pending.total}</td>
+                  <td className="p-3 border">${month.rejected.total}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </>
+      )}
+
+      <select className="mb-4 p-2 border rounded" value={statusFilter} onChange={(e) => setStatusFilter(e.target.value)}>
+        <option value="">All payments</option>
+        <option value="pending">Pending</option>
+        <option value="completed">Completed</option>
+        <option value="rejected">Rejected</option>
+      </select>
+
       <table className="min-w-full bg-white border border-gray-200">
         <thead>
           <tr className="bg-gray-100 border-b">
@@ -6,11 +6,13 @@ function ManageResidents() {
   const [error, setError] = useState(null);
   const [editingResident, setEditingResident] = useState(null);
   const [updatedData, setUpdatedData] = useState({});
+  const [importFile, setImportFile] = useState(null);
+  const [importReport, setImportReport] = useState(null); // { created, errors } from /api/residents/import/
 
   useEffect(() => {
     const token = localStorage.getItem("token");
     
-    fetch("http://localhost:8000/api/residents/", {
+    fetch("http://localhost:8000/api/residents/?paginate=false", {
       method: "GET",
       headers: {
         "Content-Type": "application/json",
@@ -54,6 +56,46 @@ function ManageResidents() {
     }
   };
 
+  const handleImport = (e) => {
+    e.preventDefault();
+    if (!importFile) return;
+    const formData = new FormData();
+    formData.append("file", importFile);
+
+    fetch("http://localhost:8000/api/residents/import/", {
+      method: "POST",
+      headers: { Authorization: `Token ${localStorage.getItem("token")}` },
+      body: formData,
+    })
+      .then((response) => response.json())
+      .then((data) => {
+        if (data.error) {
+          alert(data.error);
+          return;
+        }
+        setImportReport(data);
+        if (data.created.length > 0) {
+          window.location.reload(); // Show the new residents
+        }
+      })
+      .catch(() => alert("Error importing residents."));
+  };
+
+  const handleExport = () => {
+    fetch("http://localhost:8000/api/residents/export/", {
+      headers: { Authorization: `Token ${localStorage.getItem("token")}` },
+    })
+      .then((response) => response.blob())
+      .then((blob) => {
+        const link = document.createElement("a");
+        link.href = URL.createObjectURL(blob);
+        link.download = "residents.csv";
+        link.click();
+        URL.revokeObjectURL(link.href);
+      })
+      .catch(() => alert("Error exporting residents."));
+  };
+
   const handleEdit = (resident) => {
     setEditingResident(resident);
     setUpdatedData({
@@ -86,6 +128,30 @@ function ManageResidents() {
       <h1 className="text-3xl font-bold mb-4">Manage Residents</h1>
       {loading && <p>Loading residents...</p>}
       {error && <p className="text-red-500">{error}</p>}
+
+      <form onSubmit={handleImport} className="mb-4 flex items-center gap-2">
+        <input type="file" accept=".csv,.json" onChange={(e) => setImportFile(e.target.files[0])} />
+        <button type="submit" className="bg-blue-500 text-white px-3 py-1 rounded">
+          Import Residents
+        </button>
+        <button type="button" onClick={handleExport} className="bg-gray-500 text-white px-3 py-1 rounded">
+          Export CSV
+        </button>
+      </form>
+
+      {importReport && Object.keys(importReport.errors).length > 0 && (
+        <div className="mb-4 text-red-500">
+          <p>{importReport.created.length} imported; these rows were skipped:</p>
+          <ul>
+            {Object.entries(importReport.errors).map(([row, errors]) => (
+              <li key={row}>
+                Row {row}: {Object.values(errors).join(" ")}
+              </li>
+            ))}
+          </ul>
+        </div>
+      )}
+
       <table className="min-w-full bg-white border border-gray-200">
         <thead>
           <tr className="bg-gray-100 border-b">
@@ -17,7 +17,7 @@ function Notices() {
       return;
     }
 
-    fetch("http://localhost:8000/api/notices/", {
+    fetch("http://localhost:8000/api/notices/?paginate=false", {
       headers: { Authorization: `Token ${token}` },
     })
       .then((response) => response.json())
@@ -6,6 +6,9 @@ function ViewComplaints() {
   const [error, setError] = useState(null);
   const [updateMessage, setUpdateMessage] = useState("");
   const [loading, setLoading] = useState(true);
+  const [query, setQuery] = useState("");
+  const [matches, setMatches] = useState(null); // Ranked complaint ids from /api/search/, or null when not searching
+  const [statusFilter, setStatusFilter] = useState(""); // Sent as ?status=, filtered by the API
 
   useEffect(() => {
     const token = localStorage.getItem("token");
@@ -18,7 +21,11 @@ function ViewComplaints() {
     }
 
     console.log("Stored Token:", token);
-    fetch("http://localhost:8000/api/complaints/", {
+    const params = new URLSearchParams({ paginate: "false" });
+    if (statusFilter) {
+      params.set("status", statusFilter);
+    }
+    fetch(`http://localhost:8000/api/complaints/?${params}`, {
       method: "GET",
       headers: {
         "Content-Type": "application/json",
@@ -40,7 +47,38 @@ function ViewComplaints() {
         setError("Failed to fetch complaints.");
         setLoading(false);
       });
-  }, []);
+  }, [statusFilter]);
+
+  const handleSearch = (e) => {
+    e.preventDefault();
+    if (!query.trim()) {
+      setMatches(null);
+      return;
+    }
+    const token = localStorage.getItem("token");
+    const params = new URLSearchParams({ q: query, type: "complaint", page_size: 100 });
+
+    fetch(`http://localhost:8000/api/search/?${params}`, {
+      headers: { Authorization: `Token ${token}` },
+    })
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`HTTP Error ${response.status}: ${response.statusText}`);
+        }
+        return response.json();
+      })
+      .then((data) => setMatches(data.results.map((result) => result.id)))
+      .catch((error) => {
+        console.error("Search error:", error);
+        setError("Search failed.");
+      });
+  };
+
+  // Best matches first while searching, otherwise every complaint
+  const visibleComplaints =
+    matches === null
+      ? complaints
+      : matches.map((id) => complaints.find((complaint) => complaint.id === id)).filter(Boolean);
 
   const handleStatusUpdate = (id, newStatus) => {
     const token = localStorage.getItem("token");
@@ -82,6 +120,25 @@ function ViewComplaints() {
       {error && <p className="text-red-500">{error}</p>}
       {loading && <p>Loading complaints...</p>}
 
+      <form onSubmit={handleSearch} className="mb-4 flex gap-2">
+        <input
+          type="text"
+          className="flex-1 p-2 border rounded"
+          placeholder="Search complaints"
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+        />
+        <button type="submit" className="bg-blue-500 text-white px-4 py-2 rounded hover:bg-blue-700">
+          Search
+        </button>
+        <select className="p-2 border rounded" value={statusFilter} onChange={(e) => setStatusFilter(e.target.value)}>
+          <option value="">All statuses</option>
+          <option value="open">Open</option>
+          <option value="in_progress">In Progress</option>
+          <option value="resolved">Resolved</option>
+        </select>
+      </form>
+
       <table className="min-w-full bg-white border border-gray-200">
         <thead>
           <tr className="bg-gray-100 border-b">
@@ -93,8 +150,8 @@ function ViewComplaints() {
           </tr>
         </thead>
         <tbody>
-          {complaints.length > 0 ? (
-            complaints.map((complaint) => (
+          {visibleComplaints.length > 0 ? (
+            visibleComplaints.map((complaint) => (
               <tr key={complaint.id} className="border-b">
                 <td className="p-3 border">{complaint.id}</td>
                 <td className="p-3 border">{complaint.resident_name || "Unknown"}</td>
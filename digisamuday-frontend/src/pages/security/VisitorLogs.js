@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 
 function VisitorLogs() {
   const [visitorLogs, setVisitorLogs] = useState([]);
@@ -8,10 +8,30 @@ function VisitorLogs() {
   const [vehicleNumber, setVehicleNumber] = useState("");
   const [residentId, setResidentId] = useState("");
 
+  const [insideCount, setInsideCount] = useState(0);
+  const lastCount = useRef(null);
+
   useEffect(() => {
     fetchVisitorLogs();
+    // Cheap count-only poll; reload the list when someone enters or leaves elsewhere
+    const timer = setInterval(fetchInsideCount, 5000);
+    return () => clearInterval(timer);
   }, []);
 
+  const fetchInsideCount = () => {
+    const token = localStorage.getItem("token");
+    if (!token) return;
+
+    fetch("http://localhost:8000/api/security-logs/inside/count/", {
+      headers: { Authorization: `Token ${token}` },
+    })
+      .then((response) => response.json())
+      .then((data) => {
+        if (data.count !== lastCount.current) fetchVisitorLogs();
+      })
+      .catch(() => {});
+  };
+
   const fetchVisitorLogs = () => {
     const token = localStorage.getItem("token");
     if (!token) {
@@ -19,15 +39,18 @@ function VisitorLogs() {
       return;
     }
 
-    fetch("http://localhost:8000/api/security-logs/", {
+    // Only the visitors still inside, with their host resident and vehicle
+    fetch("http://localhost:8000/api/security-logs/inside/", {
       headers: { Authorization: `Token ${token}` },
     })
       .then((response) => response.json())
       .then((data) => {
-        if (!Array.isArray(data)) {
+        if (!Array.isArray(data.visitors)) {
           throw new Error("Invalid API response");
         }
-        setVisitorLogs(data);
+        setVisitorLogs(data.visitors);
+        setInsideCount(data.count);
+        lastCount.current = data.count;
       })
       .catch(() => setError("Failed to load visitor logs."));
   };
@@ -36,7 +59,7 @@ function VisitorLogs() {
     e.preventDefault();
     const token = localStorage.getItem("token");
   
-    fetch("http://localhost:8000/api/visitors/", {
+    fetch("http://localhost:8000/api/visitors/check-in/", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -53,7 +76,7 @@ function VisitorLogs() {
         const data = await response.json();
         if (!response.ok) {
           console.error("Backend Error Response:", data);
-          throw new Error(data.detail || "Failed to log visitor entry");
+          throw new Error(data.error || data.detail || "Failed to log visitor entry");
         }
         return data;
       })
@@ -132,13 +155,15 @@ function VisitorLogs() {
         </button>
       </form>
       
+      <h2 className="text-xl font-semibold mb-2">Currently Inside ({insideCount})</h2>
       <table className="table-auto w-full border-collapse border border-gray-300">
         <thead>
           <tr className="bg-gray-200">
             <th className="border px-4 py-2">Visitor Name</th>
             <th className="border px-4 py-2">Phone</th>
+            <th className="border px-4 py-2">Vehicle</th>
+            <th className="border px-4 py-2">Visiting</th>
             <th className="border px-4 py-2">Check-In</th>
-            <th className="border px-4 py-2">Check-Out</th>
             <th className="border px-4 py-2">Action</th>
           </tr>
         </thead>
@@ -146,27 +171,24 @@ function VisitorLogs() {
           {visitorLogs.length > 0 ? (
             visitorLogs.map((log) => (
               <tr key={log.id} className="border">
-                <td className="border px-4 py-2">{log.visitor.name}</td>
-                <td className="border px-4 py-2">{log.visitor.phone_number}</td>
+                <td className="border px-4 py-2">{log.visitor_name}</td>
+                <td className="border px-4 py-2">{log.phone_number}</td>
+                <td className="border px-4 py-2">{log.vehicle_number || "-"}</td>
+                <td className="border px-4 py-2">{log.apartment_no} ({log.resident_name})</td>
                 <td className="border px-4 py-2">{new Date(log.entry_time).toLocaleString()}</td>
                 <td className="border px-4 py-2">
-                  {log.exit_time ? new Date(log.exit_time).toLocaleString() : "Still Inside"}
-                </td>
-                <td className="border px-4 py-2">
-                  {!log.exit_time && (
-                    <button
-                      onClick={() => handleCheckout(log.id)}
-                      className="bg-red-500 text-white px-2 py-1 rounded hover:bg-red-700"
-                    >
-                      Check-Out
-                    </button>
-                  )}
+                  <button
+                    onClick={() => handleCheckout(log.id)}
+                    className="bg-red-500 text-white px-2 py-1 rounded hover:bg-red-700"
+                  >
+                    Check-Out
+                  </button>
                 </td>
               </tr>
             ))
           ) : (
             <tr>
-              <td colSpan="5" className="text-center py-4">No visitor logs available.</td>
+              <td colSpan="6" className="text-center py-4">No visitors inside.</td>
             </tr>
           )}
         </tbody>